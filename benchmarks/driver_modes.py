@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Compare python-oracledb thin and thick mode on the monitor's own workload.
+
+Thick mode is process-wide, so each mode is measured in a fresh subprocess with
+DB_DRIVER_MODE set. Every run reports startup time (importing the core and
+initializing the driver), standalone connect latency, the latency of each
+monitor probe over a pooled session, and resident memory. Runs against the
+first database of the inventory (DB_INVENTORY, DATABASES or DB_*) unless
+--database names another.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def rss_mb():
+    """Current resident set size, or the peak where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20, 1)
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return round(peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+def summarize(values):
+    values = sorted(values)
+    return {
+        "median_ms": round(statistics.median(values), 2),
+        "p99_ms": round(values[min(len(values) - 1, int(len(values) * 0.99))], 2),
+        "max_ms": round(values[-1], 2),
+    }
+
+def timed(function, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return summarize(latencies)
+
+def measure(database, iterations):
+    """Run in the child process: measure the mode selected by DB_DRIVER_MODE"""
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    
+    sys.path.insert(0, REPO_ROOT)
+    from oracle_db_monitor_core import Monitor, load_inventory, probes
+    from oracle_db_monitor_core.driver import driver_info, load_driver, oracledb
+    # The core defers the driver to first use; startup includes initializing it
+    load_driver()
+    
+    startup_ms = round((time.perf_counter() - start) * 1000, 2)
+    rss_after_import = rss_mb()
+    
+    configs = load_inventory()
+    database = database or next(iter(configs))
+    config = configs[database]
+    dsn = oracledb.makedsn(host=config['host'], port=config['port'], service_name=config['service_name'])
+    
+    def connect():
+        connection = oracledb.connect(user=config['user'], password=config['password'], dsn=dsn,
+                                      tcp_connect_timeout=config['connect_timeout'])
+        connection.close()
+    
+    result = {
+        "driver": driver_info(),
+        "database": database,
+        "startup_ms": startup_ms,
+        "connect": timed(connect, iterations),
+        "probes": {},
+    }
+    
+    # The probes the apps run, each over a pooled session
+    monitor = Monitor(configs)
+    for name, probe in [('health', probes.probe_health), ('metrics', probes.probe_metrics),
+                        ('tablespace', probes.probe_tablespaces), ('sessions', probes.probe_sessions)]:
+        def run_probe():
+            with monitor.connections.connection(database) as connection:
+                probe(connection)
+        run_probe()
+        result["probes"][name] = timed(run_probe, iterations)
+    monitor.connections.close()
+    
+    result["memory_mb"] = {
+        "baseline": rss_before,
+        "after_import": rss_after_import,
+        "after_workload": rss_mb(),
+    }
+    return result
+
+def run_mode(mode, args):
+    """Measure one mode in a fresh interpreter"""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", "-n", str(args.iterations)]
+    if args.database:
+        command += ["--database", args.database]
+    completed = subprocess.run(command, env=dict(os.environ, DB_DRIVER_MODE=mode),
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"driver": {"mode": mode}, "error": completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout)
+
+def print_report(results):
+    """One column per mode, one row per measurement"""
+    rows = [("driver", lambda r: f"{r['driver']['mode']} {r['driver'].get('client_version', '')}".strip()),
+            ("startup ms", lambda r: r['startup_ms']),
+            ("connect ms (median/p99)", lambda r: f"{r['connect']['median_ms']}/{r['connect']['p99_ms']}")]
+    for probe in ('health', 'metrics', 'tablespace', 'sessions'):
+        rows.append((f"{probe} ms (median/p99)",
+                     lambda r, probe=probe: f"{r['probes'][probe]['median_ms']}/{r['probes'][probe]['p99_ms']}"))
+    rows += [("RSS after import MB", lambda r: r['memory_mb']['after_import']),
+             ("RSS after workload MB", lambda r: r['memory_mb']['after_workload'])]
+    
+    print(f"{'':<26}" + "".join(f"{r['driver']['mode']:>20}" for r in results))
+    for label, value in rows:
+        cells = []
+        for result in results:
+            cells.append('error' if 'error' in result else str(value(result)))
+        print(f"{label:<26}" + "".join(f"{cell:>20}" for cell in cells))
+    
+    for result in results:
+        if 'error' in result:
+            print(f"\n{result['driver']['mode']} mode failed: {' '.join(result['error'])}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["thin", "thick"], choices=["thin", "thick"],
+                        help="driver modes to compare")
+    parser.add_argument("--database", help="inventory name of the database to use (default: the first)")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="measurements per operation")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(measure(args.database, args.iterations)))
+        sys.exit(0)
+    
+    results = [run_mode(mode, args) for mode in args.modes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
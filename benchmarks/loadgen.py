@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP load generator for the monitor apps.
+
+Each client thread keeps one keep-alive connection open and issues requests
+back to back, so the measured latency is the server's, not connection setup.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+import urllib.parse
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run_load(url, concurrency=16, duration=10.0, requests=None, headers=None, timeout=30.0):
+    """Drive url with concurrent clients and return throughput and latency statistics"""
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path or '/'
+    if parsed.query:
+        path += '?' + parsed.query
+    
+    latencies = []
+    status_counts = {}
+    errors = []
+    lock = threading.Lock()
+    remaining = [requests]
+    stop_at = time.monotonic() + duration
+    
+    def take_ticket():
+        """Return True while the run has requests (or time) left"""
+        if remaining[0] is None:
+            return time.monotonic() < stop_at
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+    
+    def client():
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=timeout)
+        local_latencies = []
+        local_statuses = {}
+        try:
+            while take_ticket():
+                start = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers=headers or {})
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    with lock:
+                        errors.append(str(e))
+                    # Reconnect on the next request
+                    connection.close()
+                    continue
+                local_latencies.append((time.perf_counter() - start) * 1000)
+                local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+        finally:
+            connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                for status, count in local_statuses.items():
+                    status_counts[status] = status_counts.get(status, 0) + count
+    
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "status_counts": {str(status): count for status, count in sorted(status_counts.items())},
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.mean(latencies), 2) if latencies else None,
+        "p50_ms": round(percentile(latencies, 0.50), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99), 2) if latencies else None,
+        "max_ms": round(latencies[-1], 2) if latencies else None,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("url", help="URL to request, e.g. http://127.0.0.1:5000/health")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("-n", "--requests", type=int, help="stop after this many requests instead")
+    parser.add_argument("-H", "--header", action="append", default=[], help="extra header, 'Name: value'")
+    args = parser.parse_args()
+    
+    headers = dict(header.split(":", 1) for header in args.header)
+    headers = {name.strip(): value.strip() for name, value in headers.items()}
+    print(json.dumps(run_load(args.url, args.concurrency, args.duration, args.requests, headers), indent=2))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of serving the HTML health page versus the JSON health response.
+
+Measures the simplified Flask app. The database probe is replaced by a fixed
+sample so that only template rendering, serialization and Flask request
+handling are measured. No database is needed.
+"""
+import argparse
+import datetime
+import os
+import sys
+import timeit
+
+from flask import jsonify, render_template_string
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+
+# A request log line per iteration would be measured along with the page
+os.environ.setdefault('LOG_REQUESTS', 'false')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'oracle_db_monitor_flask_simplified'))
+import app as health_app
+
+def make_sample():
+    """Return a health sample shaped like the ones produced by Monitor.check_health()"""
+    return {
+        "status": "UP",
+        "database": f"{health_app.DB_CONFIG['host']}:{health_app.DB_CONFIG['port']}/{health_app.DB_CONFIG['service_name']}",
+        "error": None,
+        "response_time_ms": 25,
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+
+def report(name, seconds, iterations):
+    """Print the mean cost per call in microseconds"""
+    print(f"{name:<40} {seconds / iterations * 1e6:10.1f} us/request")
+
+def run_benchmark(iterations):
+    """Time each way of producing the health response"""
+    sample = make_sample()
+    
+    # Serve the HTML page from the fixed sample without starting the sampler thread
+    health_app.health_sampler._latest[health_app.DEFAULT_DATABASE] = sample
+    health_app.health_sampler._sampled[health_app.DEFAULT_DATABASE].set()
+    health_app.health_sampler._thread = object()
+    health_app.monitor.check_health = lambda db_name=health_app.DEFAULT_DATABASE: dict(sample)
+    
+    render_args = dict(
+        status=sample["status"],
+        database=sample["database"],
+        response_time_ms=sample["response_time_ms"],
+        error=sample["error"],
+        timestamp=sample["timestamp"],
+        refresh_interval=300,
+        sample_interval_min=health_app.SAMPLE_INTERVAL_MIN,
+        sample_interval_max=health_app.SAMPLE_INTERVAL_MAX
+    )
+    
+    with health_app.app.test_request_context('/health'):
+        html_size = len(health_app.render_health_page(sample, 300))
+        
+        # Rendering only, inside a request context
+        report("render_template_string (per request)",
+               timeit.timeit(lambda: render_template_string(health_app.HEALTH_PAGE_TEMPLATE, **render_args), number=iterations),
+               iterations)
+        report("precompiled template",
+               timeit.timeit(lambda: health_app.health_page_template.render(**render_args), number=iterations),
+               iterations)
+        report("rendered page cache",
+               timeit.timeit(lambda: health_app.render_health_page(sample, 300), number=iterations),
+               iterations)
+        report("jsonify",
+               timeit.timeit(lambda: jsonify(sample), number=iterations),
+               iterations)
+    
+    # Full request handling through the Flask test client
+    client = health_app.app.test_client()
+    report("GET /health (HTML)",
+           timeit.timeit(lambda: client.get('/health?refresh=300'), number=iterations),
+           iterations)
+    report("GET /health?format=json",
+           timeit.timeit(lambda: client.get('/health?format=json'), number=iterations),
+           iterations)
+    
+    print(f"\nHTML page size: {html_size} bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=2000, help="calls per measurement")
+    args = parser.parse_args()
+    
+    run_benchmark(args.iterations)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark the monitor apps against the fake oracledb driver.
+
+Each app is started the way it is deployed (Flask under gunicorn, FastAPI under
+uvicorn) with DB_DRIVER=fake, so the core uses oracle_db_monitor_core.fake_oracledb
+instead of python-oracledb. The load generator then reports
+req/s, p50/p99 latency and database sessions opened per request. Results can be
+saved as a baseline and later runs compared against it to catch regressions.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from loadgen import run_load
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+
+# Server command lines mirror each app's deploy.sh; {port} is filled in. Worker class, processes
+# and threads come from the SERVER_PROFILE of the app's gunicorn.conf.py, so there is no -w here
+TARGETS = {
+    'flask': {
+        'directory': 'oracle_db_monitor',
+        'framework': 'flask',
+        'command': ['-m', 'gunicorn', '-b', '127.0.0.1:{port}', 'app:app'],
+        'paths': ['/health', '/metrics'],
+    },
+    'flask_simplified': {
+        'directory': 'oracle_db_monitor_flask_simplified',
+        'framework': 'flask',
+        # Always one process, from its gunicorn.conf.py
+        'command': ['-m', 'gunicorn', '-b', '127.0.0.1:{port}', 'app:app'],
+        'paths': ['/health?format=json'],
+    },
+    'fastapi': {
+        'directory': 'oracle_db_monitor_fastapi',
+        'framework': 'fastapi',
+        # uvicorn workers under gunicorn
+        'command': ['-m', 'gunicorn', '-b', '127.0.0.1:{port}', 'app:app'],
+        'paths': ['/health', '/metrics'],
+    },
+}
+
+def free_port():
+    """Ask the OS for an unused TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for_port(port, process, timeout=30.0):
+    """Wait until the server accepts connections; fail early if it exits"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start listening on port {port} within {timeout}s")
+
+def start_server(target, port, env):
+    """Start one app in its own directory"""
+    command = [sys.executable] + [arg.format(port=port) for arg in target['command']]
+    process = subprocess.Popen(
+        command,
+        cwd=os.path.join(REPO_ROOT, target['directory']),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    try:
+        wait_for_port(port, process)
+    except RuntimeError:
+        stop_server(process)
+        raise RuntimeError(f"{' '.join(command)} failed to start:\n{process.stderr.read().decode(errors='replace')}")
+    return process
+
+def stop_server(process):
+    """Terminate the server and its workers"""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+def benchmark_target(name, args):
+    """Run the load against every path of one app and return one result per path"""
+    target = TARGETS[name]
+    results = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        session_log = os.path.join(tmp, 'sessions.log')
+        env = dict(
+            os.environ,
+            DB_DRIVER='fake',
+            FAKE_DB_CONNECT_LATENCY_MS=args.connect_latency_ms,
+            FAKE_DB_QUERY_LATENCY_MS=args.query_latency_ms,
+            FAKE_DB_FAILURE_RATE=str(args.failure_rate),
+            FAKE_DB_CONNECT_FAULTS=args.connect_faults,
+            FAKE_DB_QUERY_FAULTS=args.query_faults,
+            FAKE_DB_SESSION_LOG=session_log,
+            # Request logs would fill the unread stderr pipe (and block a gevent worker outright)
+            LOG_REQUESTS='false',
+        )
+        # Override the profile through the settings gunicorn.conf.py reads
+        if args.profile and target['framework'] == 'flask':
+            env['SERVER_PROFILE'] = args.profile
+        if args.workers:
+            env['SERVER_WORKERS'] = str(args.workers)
+        port = free_port()
+        process = start_server(target, port, env)
+        
+        try:
+            for path in args.paths or target['paths']:
+                url = f"http://127.0.0.1:{port}{path}"
+                # Warm up pools and imports before measuring
+                run_load(url, concurrency=args.concurrency, duration=args.warmup)
+                
+                sessions_before = os.path.getsize(session_log) if os.path.exists(session_log) else 0
+                result = run_load(url, concurrency=args.concurrency, duration=args.duration)
+                sessions = (os.path.getsize(session_log) if os.path.exists(session_log) else 0) - sessions_before
+                
+                result['app'] = name
+                result['path'] = path
+                result['sessions_opened'] = sessions
+                result['sessions_per_request'] = round(sessions / result['requests'], 4) if result['requests'] else None
+                results.append(result)
+        finally:
+            stop_server(process)
+    
+    return results
+
+def print_table(results):
+    """Print one line per app and path"""
+    print(f"{'app':<18} {'path':<22} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'sess/req':>9}")
+    for result in results:
+        print(f"{result['app']:<18} {result['path']:<22} {result['requests_per_s']:>9} "
+              f"{result['p50_ms'] if result['p50_ms'] is not None else '-':>8} "
+              f"{result['p99_ms'] if result['p99_ms'] is not None else '-':>8} "
+              f"{result['errors']:>7} "
+              f"{result['sessions_per_request'] if result['sessions_per_request'] is not None else '-':>9}")
+
+def compare(results, baseline, tolerance):
+    """Return a description of every result that regressed beyond tolerance"""
+    previous = {(result['app'], result['path']): result for result in baseline}
+    regressions = []
+    
+    for result in results:
+        before = previous.get((result['app'], result['path']))
+        if before is None:
+            continue
+        label = f"{result['app']} {result['path']}"
+        if result['requests_per_s'] < before['requests_per_s'] * (1 - tolerance):
+            regressions.append(f"{label}: req/s {before['requests_per_s']} -> {result['requests_per_s']}")
+        if before['p99_ms'] and result['p99_ms'] and result['p99_ms'] > before['p99_ms'] * (1 + tolerance):
+            regressions.append(f"{label}: p99 {before['p99_ms']} ms -> {result['p99_ms']} ms")
+        if (before['sessions_per_request'] is not None and result['sessions_per_request'] is not None
+                and result['sessions_per_request'] > before['sessions_per_request'] + 0.01):
+            regressions.append(f"{label}: sessions/request {before['sessions_per_request']} -> {result['sessions_per_request']}")
+    
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("apps", nargs="*", help=f"apps to benchmark: {', '.join(sorted(TARGETS))} (default: all)")
+    parser.add_argument("--path", dest="paths", action="append", help="path to request (default: per app)")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds of measured load per path")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load per path")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="server worker processes (default: per profile)")
+    parser.add_argument("--profile", choices=['sync', 'gthread', 'gevent'],
+                        help="SERVER_PROFILE of the Flask apps (default: gthread)")
+    parser.add_argument("--connect-latency-ms", default="20", help="fake session setup time, e.g. 20 or uniform:10,50")
+    parser.add_argument("--query-latency-ms", default="2", help="fake time per statement, e.g. 2 or lognormal:2,0.5")
+    parser.add_argument("--failure-rate", type=float, default=0, help="fraction of statements failing with ORA-03113")
+    parser.add_argument("--connect-faults", default="", help="random connect faults, e.g. refuse:0.05")
+    parser.add_argument("--query-faults", default="", help="random statement faults, e.g. hang:0.01,ORA-00060:0.01")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved earlier with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+    
+    unknown = set(args.apps) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(sorted(unknown))}")
+    
+    results = []
+    for name in args.apps or sorted(TARGETS):
+        results.extend(benchmark_target(name, args))
+    
+    print_table(results)
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
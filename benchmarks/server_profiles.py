@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compare the production server profiles under a mix of fast and slow probes.
+
+Every profile of oracle_db_monitor_core/serving.py is started under gunicorn
+with the app's own gunicorn.conf.py and the fake driver, where a fraction of
+the statements is slow (a database that is busy or far away). The load
+generator then reports req/s and p50/p99 latency per profile: with sync
+workers the slow probes pin every process and the fast ones queue behind them.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from loadgen import run_load
+from run_benchmarks import free_port, start_server, stop_server
+
+# (app, profile); the profile's workers and threads come from its gunicorn.conf.py
+PROFILE_TARGETS = [
+    ('flask', 'sync'),
+    ('flask', 'gthread'),
+    ('flask', 'gevent'),
+    ('fastapi', 'uvicorn'),
+]
+
+DIRECTORIES = {
+    'flask': 'oracle_db_monitor',
+    'fastapi': 'oracle_db_monitor_fastapi',
+}
+
+def benchmark_profile(app, profile, args):
+    """Run the mixed load against one app under one profile"""
+    target = {
+        'directory': DIRECTORIES[app],
+        'command': ['-m', 'gunicorn', '-b', '127.0.0.1:{port}', 'app:app'],
+    }
+    env = dict(
+        os.environ,
+        DB_DRIVER='fake',
+        SERVER_PROFILE=profile,
+        SERVER_WORKERS=str(args.workers),
+        SERVER_DB_LATENCY_MS=str(args.slow_ms * args.slow_rate + args.query_latency_ms * (1 - args.slow_rate)),
+        FAKE_DB_QUERY_LATENCY_MS=str(args.query_latency_ms),
+        FAKE_DB_QUERY_FAULTS=f"{args.slow_ms}:{args.slow_rate}",
+        # Request logs would fill the unread stderr pipe
+        LOG_REQUESTS='false',
+    )
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env['FAKE_DB_SESSION_LOG'] = os.path.join(tmp, 'sessions.log')
+        port = free_port()
+        process = start_server(target, port, env)
+        try:
+            url = f"http://127.0.0.1:{port}{args.path}"
+            run_load(url, concurrency=args.concurrency, duration=args.warmup)
+            result = run_load(url, concurrency=args.concurrency, duration=args.duration)
+        finally:
+            stop_server(process)
+    
+    result['app'] = app
+    result['profile'] = profile
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("profiles", nargs="*",
+                        help=f"profiles to compare: {', '.join(p for _, p in PROFILE_TARGETS)} (default: all)")
+    parser.add_argument("--path", default="/health", help="path to request")
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="concurrent clients")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds of measured load per profile")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load per profile")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="server worker processes (default: per profile)")
+    parser.add_argument("--query-latency-ms", type=float, default=2, help="time of a fast statement")
+    parser.add_argument("--slow-ms", type=float, default=500, help="time of a slow statement")
+    parser.add_argument("--slow-rate", type=float, default=0.2, help="fraction of statements that are slow")
+    args = parser.parse_args()
+    
+    selected = [(app, profile) for app, profile in PROFILE_TARGETS if not args.profiles or profile in args.profiles]
+    if not selected:
+        parser.error(f"unknown profile(s): {', '.join(args.profiles)}")
+    
+    print(f"{'app':<8} {'profile':<9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for app, profile in selected:
+        try:
+            result = benchmark_profile(app, profile, args)
+        except RuntimeError as e:
+            # gevent and uvloop are optional; report the profile instead of aborting the run
+            print(f"{app:<8} {profile:<9} failed to start: {str(e).splitlines()[-1]}", file=sys.stderr)
+            continue
+        print(f"{app:<8} {profile:<9} {result['requests_per_s']:>9} "
+              f"{result['p50_ms'] if result['p50_ms'] is not None else '-':>8} "
+              f"{result['p99_ms'] if result['p99_ms'] is not None else '-':>8} "
+              f"{result['errors']:>7}")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Measure the cold start of the monitor apps: import time and first-probe latency.
+
+Each run imports one app in a fresh interpreter with DB_DRIVER=fake and times
+the import, then the first and second /health checks. With warm-up (the
+default in the apps) the first check waits until Monitor.start_warm_up() has
+opened the pool; --no-warm-up shows what the first request of a new replica
+costs without it. Results are medians over --runs interpreters.
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+
+# App -> (directory relative to the repository root, module)
+TARGETS = {
+    'flask': ('oracle_db_monitor', 'app'),
+    'flask_simplified': ('oracle_db_monitor_flask_simplified', 'app'),
+    'fastapi': ('oracle_db_monitor_fastapi', 'app'),
+    'modified': ('', 'modified_app'),
+    'dynamic': ('', 'dynamic_app'),
+}
+
+def measure(name, warm_up, timeout=30.0):
+    """Run in the child process: import one app and time its first health checks"""
+    directory, module_name = TARGETS[name]
+    os.chdir(os.path.join(REPO_ROOT, directory))
+    sys.path.insert(0, os.getcwd())
+    
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_ms = (time.perf_counter() - start) * 1000
+    
+    monitor = module.monitor
+    db_name = next(iter(monitor.configs))
+    result = {"app": name, "import_ms": round(import_ms, 2), "modules": len(sys.modules)}
+    
+    if warm_up:
+        # Idempotent; apps that warm up on a server startup hook have not started yet
+        monitor.start_warm_up()
+        deadline = time.monotonic() + timeout
+        while monitor.readiness().status_code != 200:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"warm-up did not finish within {timeout}s")
+            time.sleep(0.001)
+        result["ready_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    
+    for label in ('first_probe_ms', 'second_probe_ms'):
+        probe_start = time.perf_counter()
+        monitor.health(db_name)
+        result[label] = round((time.perf_counter() - probe_start) * 1000, 2)
+    return result
+
+def run_app(name, args):
+    """Measure one app in --runs fresh interpreters and return the medians"""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", name]
+    if not args.warm_up:
+        command.append("--no-warm-up")
+    env = dict(os.environ, DB_DRIVER='fake', LOG_REQUESTS='false', WARM_UP='true' if args.warm_up else 'false')
+    
+    runs = []
+    for _ in range(args.runs):
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {"app": name, "error": completed.stderr.strip().splitlines()[-1:]}
+        runs.append(json.loads(completed.stdout))
+    
+    return {
+        key: round(statistics.median(run[key] for run in runs), 2) if key != 'app' else name
+        for key in runs[0]
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("apps", nargs="*", help=f"apps to measure: {', '.join(TARGETS)} (default: all)")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="fresh interpreters per app")
+    parser.add_argument("--no-warm-up", dest="warm_up", action="store_false",
+                        help="send the first check without waiting for the warm-up")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(measure(args.apps[0], args.warm_up)))
+        sys.exit(0)
+    
+    unknown = set(args.apps) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(sorted(unknown))}")
+    
+    results = [run_app(name, args) for name in args.apps or TARGETS]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        sys.exit(0)
+    
+    print(f"{'app':<18} {'import ms':>10} {'modules':>8} {'ready ms':>9} {'1st probe ms':>13} {'2nd probe ms':>13}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['app']:<18} failed: {' '.join(result['error'])}")
+            continue
+        print(f"{result['app']:<18} {result['import_ms']:>10} {result['modules']:>8} "
+              f"{result.get('ready_ms', '-'):>9} {result['first_probe_ms']:>13} {result['second_probe_ms']:>13}")
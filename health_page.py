@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Static health page generator, replacing the sqlplus-based test.sh.
+
+Runs as a long-lived process that keeps a pooled session per database, checks
+every database on an adaptive schedule (HEALTH_SAMPLE_INTERVAL_MIN to _MAX
+seconds, more often while a database misbehaves) and rewrites the HTML page
+(atomically: temporary file + rename) only when a status changes. With --once
+it checks all databases a single time and writes the page, for cron.
+
+Databases come from DB_INVENTORY or DATABASES (see test_connection.py), or the
+DB_* variables for a single database.
+"""
+import argparse
+import concurrent.futures
+import html
+import os
+import queue
+import tempfile
+
+from oracle_db_monitor_core import HealthSampler, Monitor, load_inventory, load_settings
+
+# Output HTML file, adjust based on your HTTP server
+DEFAULT_HTML_FILE = "/var/www/html/health.html"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Oracle Database Health Check</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; text-align: center; margin-top: 50px; }}
+        table {{ margin: 0 auto; border-collapse: collapse; }}
+        th, td {{ padding: 6px 14px; border-bottom: 1px solid #ddd; }}
+        .status-up {{ color: green; font-weight: bold; }}
+        .status-down {{ color: red; font-weight: bold; }}
+        .status-degraded {{ color: darkorange; font-weight: bold; }}
+    </style>
+</head>
+<body>
+    <h1>Oracle Database Health Check</h1>
+    <table>
+        <tr><th>Database</th><th>Service Name</th><th>Status</th><th>Since</th><th>Response Time at Change</th><th>Error</th></tr>
+{rows}
+    </table>
+</body>
+</html>
+"""
+
+ROW_TEMPLATE = ("        <tr><td>{host}</td><td>{service_name}</td>"
+                "<td class=\"status-{status_class}\">{status}</td><td>{since}</td>"
+                "<td>{response_time_ms} ms</td><td>{error}</td></tr>")
+
+def render_page(configs, samples):
+    """Render the page for the latest sample of every database"""
+    rows = []
+    for db_name, config in configs.items():
+        sample = samples[db_name]
+        rows.append(ROW_TEMPLATE.format(
+            host=html.escape(config['host']),
+            service_name=html.escape(config['service_name']),
+            status_class=sample['status'].lower(),
+            status=sample['status'],
+            since=sample['timestamp'][:19].replace('T', ' '),
+            response_time_ms=sample['response_time_ms'],
+            error=html.escape(sample['error'] or '')
+        ))
+    return PAGE_TEMPLATE.format(rows="\n".join(rows))
+
+def write_atomically(path, content):
+    """Replace path with content so the web server never serves a partial page"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".health-", suffix=".html")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # Ensure the HTML file has proper permissions
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def check_all(monitor, db_names):
+    """Check every database concurrently and return {name: sample}"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(32, len(db_names)))) as executor:
+        return dict(zip(db_names, executor.map(monitor.check_health, db_names)))
+
+def page_key(sample):
+    """The status of a sample; the page keeps the sample that began it, so Since is when the status began"""
+    return sample['status'], sample['error']
+
+def run_forever(monitor, configs, output):
+    """Regenerate the page whenever a database changes status"""
+    db_names = list(configs)
+    sampler = HealthSampler.from_settings(monitor, db_names, max_workers=32)
+    subscription = sampler.subscribe()
+    sampler.start()
+    
+    samples = {db_name: sampler.wait_for_sample(db_name, timeout=None) for db_name in db_names}
+    write_atomically(output, render_page(configs, samples))
+    
+    while True:
+        try:
+            db_name, diff = subscription.get(timeout=monitor.settings['sample_interval'])
+        except queue.Empty:
+            db_name, diff = None, {}
+        
+        if not sampler.is_subscribed(subscription):
+            # Dropped after falling behind: resubscribe and catch up from the latest samples
+            subscription = sampler.subscribe()
+            latest = {name: sampler.latest(name) for name in db_names}
+            changed_names = [name for name in db_names if page_key(latest[name]) != page_key(samples[name])]
+            samples.update((name, latest[name]) for name in changed_names)
+            changed = bool(changed_names)
+        elif 'status' in diff or 'error' in diff:
+            # Updates carry only the fields that changed; compare with what the page shows
+            latest = sampler.latest(db_name)
+            changed = page_key(latest) != page_key(samples[db_name])
+            if changed:
+                samples[db_name] = latest
+        else:
+            changed = False
+        
+        if changed:
+            write_atomically(output, render_page(configs, samples))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", default=os.environ.get('HEALTH_PAGE_FILE', DEFAULT_HTML_FILE),
+                        help=f"HTML file to write (default: HEALTH_PAGE_FILE or {DEFAULT_HTML_FILE})")
+    parser.add_argument("--once", action="store_true", help="check once, write the page and exit")
+    args = parser.parse_args()
+    
+    # Defaults of the former test.sh, overridable through DB_* environment variables
+    configs = load_inventory(user="scott", password="tiger", host="localhost", port=1521, service_name="orclpdb")
+    # A one-off run has no use for a pool; the long-running generator keeps its sessions
+    monitor = Monitor(configs, load_settings(pool_enabled=not args.once))
+    
+    if args.once:
+        write_atomically(args.output, render_page(configs, check_all(monitor, list(configs))))
+    else:
+        run_forever(monitor, configs, args.output)
@@ -42,9 +42,10 @@ if [ $? -ne 0 ]; then
     exit 1
 fi
 
-# Start the API server with gunicorn
+# Start the API server with gunicorn; gunicorn.conf.py sizes the workers from
+# SERVER_PROFILE (gthread by default, see README)
 echo "Starting the API server with gunicorn..."
-gunicorn -w 4 -b 0.0.0.0:5000 app:app --daemon
+gunicorn -b 0.0.0.0:5000 app:app --daemon
 
 echo "API server started on port 5000"
 echo "To check if the server is running: ps aux | grep gunicorn"
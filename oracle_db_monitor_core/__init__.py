@@ -0,0 +1,52 @@
+"""
+Shared core of the Oracle Database Monitor apps.
+
+Configuration, pooled connection management, probes, caching and metrics live
+here once; the Flask and FastAPI apps and the standalone scripts only add
+routes or output on top (see flask_adapter and fastapi_adapter).
+"""
+import importlib
+
+# Name -> submodule; submodules are imported on first access, so an app only pays
+# for what it uses (e.g. the sampler and exporter are not loaded by the API apps)
+_EXPORTS = {
+    'DEFAULT_DATABASE': 'config',
+    'database_identifier': 'config',
+    'load_database_config': 'config',
+    'load_inventory': 'config',
+    'load_settings': 'config',
+    'ConnectionManager': 'connection',
+    'MonitorMetrics': 'metrics',
+    'Monitor': 'monitor',
+    'ProbeResult': 'monitor',
+    'HealthSampler': 'sampler',
+    'normalize_sql': 'sqlguard',
+    'tokenize_sql': 'sqlguard',
+    'validate_read_only_query': 'sqlguard',
+}
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+__all__ = [
+    'DEFAULT_DATABASE',
+    'ConnectionManager',
+    'HealthSampler',
+    'Monitor',
+    'MonitorMetrics',
+    'ProbeResult',
+    'database_identifier',
+    'load_database_config',
+    'load_inventory',
+    'load_settings',
+    'normalize_sql',
+    'tokenize_sql',
+    'validate_read_only_query',
+]
@@ -0,0 +1,154 @@
+"""
+In-process caches for probe results, /custom query results and the counter
+snapshots behind /sysstat.
+"""
+import collections
+import concurrent.futures
+import hashlib
+import json
+import threading
+import time
+
+from .sqlguard import normalize_sql
+
+class TTLCache:
+    """Thread-safe cache of probe results that expire after a per-call number of seconds"""
+    
+    def __init__(self):
+        self._entries = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key, ttl):
+        """Return the value stored for key if it is younger than ttl seconds, otherwise None"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > ttl:
+            return None
+        return entry[1]
+    
+    def get_or_compute(self, key, ttl, compute):
+        """Return (value, hit), calling compute() on a miss once for all concurrent callers of the same key.
+        
+        Callers arriving while a refresh is running wait for it and share its
+        value, or its exception, instead of querying the database themselves.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= ttl:
+                return entry[1], True
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = concurrent.futures.Future()
+        
+        if not leader:
+            return future.result(), True
+        
+        try:
+            value = compute()
+            self.put(key, value)
+            future.set_result(value)
+            return value, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class QueryResultCache:
+    """Thread-safe LRU cache of /custom query results, bounded by the total serialized size"""
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(database, query, binds=None):
+        """Build a cache key from the target database, normalized SQL text and bind values"""
+        return (database, normalize_sql(query), json.dumps(binds, sort_keys=True, default=str))
+    
+    def get(self, key, max_age):
+        """Return the cached entry for key if it is younger than max_age seconds"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry['stored_at'] > max_age:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key, results):
+        """Store query results and return the new entry, evicting least recently used entries as needed"""
+        body = json.dumps(results, sort_keys=True, default=str).encode('utf-8')
+        entry = {
+            'results': results,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'size': len(body),
+            'stored_at': time.monotonic(),
+        }
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous['size']
+            
+            # Results larger than the whole cache are returned but never stored
+            if entry['size'] <= self.max_bytes:
+                self._entries[key] = entry
+                self.total_bytes += entry['size']
+                while self.total_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted['size']
+        
+        return entry
+
+class CounterSnapshots:
+    """Thread-safe latest and previous snapshot of cumulative counters per key, for rate computation"""
+    
+    def __init__(self):
+        self._snapshots = {}
+        self._locks = collections.defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+    
+    def get(self, key, interval, take_snapshot):
+        """Return the (previous, latest) snapshots of key, calling take_snapshot() if latest is older than interval"""
+        with self._lock:
+            key_lock = self._locks[key]
+        
+        # Concurrent callers wait for the snapshot in progress instead of taking their own
+        with key_lock:
+            previous, latest = self._snapshots.get(key, (None, None))
+            if latest is None or time.monotonic() - latest['taken_at'] >= interval:
+                start = time.monotonic()
+                values = take_snapshot()
+                # The counters were read somewhere during the round trip; its midpoint is the best guess
+                taken_at = (start + time.monotonic()) / 2
+                previous, latest = latest, {'taken_at': taken_at, 'values': values}
+                self._snapshots[key] = (previous, latest)
+        return previous, latest
+    
+    @staticmethod
+    def rates(previous, latest):
+        """Per-second rate of every counter between two snapshots (None where a counter went back, e.g. a restart)"""
+        elapsed = latest['taken_at'] - previous['taken_at']
+        rates = {}
+        for name, value in latest['values'].items():
+            before = previous['values'].get(name)
+            if before is None or value < before or elapsed <= 0:
+                rates[name] = None
+            else:
+                rates[name] = round((value - before) / elapsed, 2)
+        return rates
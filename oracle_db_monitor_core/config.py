@@ -0,0 +1,176 @@
+"""
+Configuration loading for the Oracle Database Monitor.
+
+Database settings come from environment variables (optionally loaded from a .env
+file by the apps), using a per-database prefix such as PRIMARY_ or DEV_.
+"""
+import json
+import os
+
+# Name used for the database of single-database apps
+DEFAULT_DATABASE = 'default'
+
+def env_int(name, default):
+    """Read an integer environment variable"""
+    return int(os.environ.get(name, default))
+
+def env_float(name, default):
+    """Read a float environment variable"""
+    return float(os.environ.get(name, default))
+
+def env_list(name, default):
+    """Read a comma-separated list environment variable"""
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def env_bool(name, default):
+    """Read a boolean environment variable (1/true/yes/on)"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+# (setting, environment variable, reader, default)
+SETTINGS = [
+    # Connection pooling; disabled means one new connection per check
+    ('pool_enabled', 'DB_POOL_ENABLED', env_bool, True),
+    ('pool_min', 'DB_POOL_MIN', env_int, 1),
+    ('pool_max', 'DB_POOL_MAX', env_int, 4),
+    ('pool_increment', 'DB_POOL_INCREMENT', env_int, 1),
+    ('pool_wait_timeout_ms', 'DB_POOL_WAIT_TIMEOUT_MS', env_int, 5000),
+    ('pool_ping_interval', 'DB_POOL_PING_INTERVAL', env_int, 60),
+    # Open the pools and run a first check in the background as soon as an app starts
+    ('warm_up', 'WARM_UP', env_bool, True),
+    # Seconds between warm-up attempts while a database cannot be reached
+    ('warm_up_retry_interval', 'WARM_UP_RETRY_INTERVAL', env_float, 5),
+    # Upper bound for every database round trip made by a probe
+    ('call_timeout_ms', 'DB_CALL_TIMEOUT_MS', env_int, 10000),
+    # Seconds /metrics, /tablespace and /sessions results may be served from cache
+    ('probe_cache_ttl', 'PROBE_CACHE_TTL', env_float, 0),
+    # /performance samples the database at most once per interval (V$SYSMETRIC refreshes every 60 s)
+    ('performance_min_interval', 'PERFORMANCE_MIN_INTERVAL', env_float, 60),
+    ('performance_top_n', 'PERFORMANCE_TOP_N', env_int, 10),
+    ('performance_window_minutes', 'PERFORMANCE_WINDOW_MINUTES', env_int, 15),
+    # /sessions/summary: blocked sessions waiting longer than this are counted separately,
+    # and the busiest TOP_N groups and blocking chains are listed
+    ('session_blocked_threshold', 'SESSION_BLOCKED_THRESHOLD', env_float, 30),
+    ('session_summary_top_n', 'SESSION_SUMMARY_TOP_N', env_int, 5),
+    # Seconds the /locks tree is shared by all callers before the next database query
+    ('lock_tree_ttl', 'LOCK_TREE_TTL', env_float, 5),
+    # Data Guard transport or apply lag above which /replication reports DEGRADED
+    ('replication_max_lag', 'REPLICATION_MAX_LAG', env_float, 300),
+    # V$SYSSTAT counters behind /sysstat, snapshotted at most once per interval
+    ('sysstat_interval', 'SYSSTAT_INTERVAL', env_float, 60),
+    ('sysstat_counters', 'SYSSTAT_COUNTERS', env_list, [
+        'session logical reads', 'physical reads', 'redo size', 'execute count',
+        'parse count (total)', 'parse count (hard)', 'user commits', 'user rollbacks',
+    ]),
+    # Dedicated read-only pool and result cache for /custom
+    ('custom_pool_min', 'CUSTOM_POOL_MIN', env_int, 0),
+    ('custom_pool_max', 'CUSTOM_POOL_MAX', env_int, 4),
+    ('custom_result_cache_max_bytes', 'CUSTOM_RESULT_CACHE_MAX_BYTES', env_int, 16 * 1024 * 1024),
+    ('custom_call_timeout_ms', 'CUSTOM_CALL_TIMEOUT_MS', env_int, 30000),
+    ('custom_max_call_timeout_ms', 'CUSTOM_MAX_CALL_TIMEOUT_MS', env_int, 120000),
+    ('custom_disconnect_poll_interval', 'CUSTOM_DISCONNECT_POLL_INTERVAL', env_float, 0.25),
+    # Push export of background health samples: EXPORT_SINK is otlp, statsd, file or none,
+    # EXPORT_TARGET its URL, host:port or path (see export.py)
+    ('export_sink', 'EXPORT_SINK', os.environ.get, 'none'),
+    ('export_target', 'EXPORT_TARGET', os.environ.get, ''),
+    ('export_batch_size', 'EXPORT_BATCH_SIZE', env_int, 100),
+    ('export_flush_interval', 'EXPORT_FLUSH_INTERVAL', env_float, 5),
+    ('export_queue_size', 'EXPORT_QUEUE_SIZE', env_int, 1000),
+    ('export_file_max_bytes', 'EXPORT_FILE_MAX_BYTES', env_int, 10 * 1024 * 1024),
+    ('export_file_backups', 'EXPORT_FILE_BACKUPS', env_int, 5),
+    # Structured JSON request logs (see requestlog.py): successful requests are logged with
+    # probability LOG_SAMPLE_RATE, failures always; LOG_FILE defaults to stderr
+    ('log_requests', 'LOG_REQUESTS', env_bool, True),
+    ('log_sample_rate', 'LOG_SAMPLE_RATE', env_float, 1.0),
+    ('log_file', 'LOG_FILE', os.environ.get, ''),
+    ('log_queue_size', 'LOG_QUEUE_SIZE', env_int, 10000),
+    # Production server profile (see serving.py): sync, gthread or gevent for the Flask apps,
+    # uvicorn for FastAPI; 0 workers or threads are sized from the CPU count and the expected
+    # database latency and CPU time per request
+    ('server_profile', 'SERVER_PROFILE', os.environ.get, ''),
+    ('server_workers', 'SERVER_WORKERS', env_int, 0),
+    ('server_threads', 'SERVER_THREADS', env_int, 0),
+    ('server_db_latency_ms', 'SERVER_DB_LATENCY_MS', env_float, 100),
+    ('server_cpu_ms', 'SERVER_CPU_MS', env_float, 5),
+    ('server_max_threads', 'SERVER_MAX_THREADS', env_int, 32),
+    # HTTP responses smaller than this are sent uncompressed
+    ('compression_min_bytes', 'COMPRESSION_MIN_BYTES', env_int, 1024),
+    # Seconds between background health samples: the starting interval, adapted per
+    # database between the minimum and maximum (equal bounds keep it fixed)
+    ('sample_interval', 'HEALTH_SAMPLE_INTERVAL', env_int, 30),
+    ('sample_interval_min', 'HEALTH_SAMPLE_INTERVAL_MIN', env_int, 5),
+    ('sample_interval_max', 'HEALTH_SAMPLE_INTERVAL_MAX', env_int, 300),
+    ('sample_backoff', 'HEALTH_SAMPLE_BACKOFF', env_float, 2.0),
+    # A successful health check is DEGRADED when its latency is more than ZSCORE deviations
+    # and MIN_MS above the database's EWMA baseline (ALPHA is the weight of each new check)
+    ('anomaly_zscore', 'HEALTH_ANOMALY_ZSCORE', env_float, 3.0),
+    ('anomaly_min_ms', 'HEALTH_ANOMALY_MIN_MS', env_float, 50),
+    ('anomaly_alpha', 'HEALTH_ANOMALY_ALPHA', env_float, 0.05),
+]
+
+def load_settings(**defaults):
+    """Return the process-wide monitor settings; keyword arguments override the built-in defaults"""
+    return {
+        key: reader(variable, defaults.get(key, default))
+        for key, variable, reader, default in SETTINGS
+    }
+
+def load_database_config(prefix='', **defaults):
+    """Read the connection settings of one database from {prefix}DB_* environment variables"""
+    def get(name, fallback):
+        return os.environ.get(f"{prefix}DB_{name}", defaults.get(name.lower(), fallback))
+    
+    user = get('USER', 'system')
+    password = get('PASSWORD', 'oracle')
+    
+    return {
+        'host': get('HOST', 'localhost'),
+        'port': int(get('PORT', 1521)),
+        'service_name': get('SERVICE_NAME', 'ORCLPDB1'),
+        'user': user,
+        'password': password,
+        # Seconds allowed for establishing the TCP connection
+        'connect_timeout': float(get('CONNECT_TIMEOUT', 5)),
+        # Credentials for the read-only /custom pool (a read-only user is recommended)
+        'custom_user': os.environ.get(f"{prefix}CUSTOM_DB_USER", user),
+        'custom_password': os.environ.get(f"{prefix}CUSTOM_DB_PASSWORD", password),
+        # Database Resident Connection Pooling: share pooled server processes across monitor hosts
+        'drcp': str(get('DRCP', False)).strip().lower() in ('1', 'true', 'yes', 'on'),
+        'drcp_connection_class': get('DRCP_CLASS', 'ORACLE_DB_MONITOR'),
+        'drcp_purity': get('DRCP_PURITY', 'self').strip().lower(),
+    }
+
+def database_identifier(config):
+    """Return the host:port/service string reported in responses"""
+    return f"{config['host']}:{config['port']}/{config['service_name']}"
+
+def load_inventory(path=None, **defaults):
+    """Return {name: config} for every known database.
+    
+    The inventory is the JSON file named by path or DB_INVENTORY, mapping each
+    database name to its settings ({"dev": {"host": "...", "service_name": "..."}}),
+    or else the comma-separated names in DATABASES. Either way {NAME}_DB_*
+    variables override the listed settings, so passwords can stay out of the
+    file. Without an inventory the single DB_* database is returned. Keyword
+    arguments are defaults for settings that neither source provides.
+    """
+    path = path or os.environ.get('DB_INVENTORY')
+    if path:
+        with open(path) as f:
+            entries = json.load(f)
+    else:
+        names = [name.strip() for name in os.environ.get('DATABASES', '').split(',') if name.strip()]
+        entries = {name: {} for name in names}
+    
+    if not entries:
+        return {DEFAULT_DATABASE: load_database_config(**defaults)}
+    
+    return {
+        name: load_database_config(f"{name.upper()}_", **dict(defaults, **entry))
+        for name, entry in entries.items()
+    }
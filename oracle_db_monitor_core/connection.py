@@ -0,0 +1,133 @@
+"""
+Pooled connection management shared by every monitor entry point.
+
+Each configured database gets one session pool for probes and, on demand, a
+second read-only pool for ad-hoc /custom queries. Pools are created lazily on
+first use, so importing an app never touches the network.
+"""
+import contextlib
+import threading
+
+from .driver import oracledb
+
+# Appended to the DRCP connection class of the read-only /custom pool
+READ_ONLY_CLASS_SUFFIX = '_RO'
+
+class ConnectionManager:
+    """Owns the connection pools of all configured databases"""
+    
+    def __init__(self, configs, settings, metrics):
+        self.configs = configs
+        self.settings = settings
+        self.metrics = metrics
+        self._pools = {}
+        self._lock = threading.Lock()
+    
+    def _dsn(self, config):
+        return oracledb.makedsn(
+            host=config['host'],
+            port=config['port'],
+            service_name=config['service_name']
+        )
+    
+    def _config(self, db_name):
+        if db_name not in self.configs:
+            raise ValueError(f"Unknown database: {db_name}")
+        return self.configs[db_name]
+    
+    def _create_pool(self, db_name, read_only):
+        config = self._config(db_name)
+        settings = self.settings
+        
+        def init_session(connection, requested_tag):
+            """Session callback, called once for every new session in the pool"""
+            self.metrics.record_session_opened(db_name)
+            if read_only:
+                _init_read_only_session(connection)
+        
+        return oracledb.create_pool(
+            user=config['custom_user'] if read_only else config['user'],
+            password=config['custom_password'] if read_only else config['password'],
+            dsn=self._dsn(config),
+            min=settings['custom_pool_min'] if read_only else settings['pool_min'],
+            max=settings['custom_pool_max'] if read_only else settings['pool_max'],
+            increment=settings['pool_increment'],
+            ping_interval=settings['pool_ping_interval'],
+            tcp_connect_timeout=config['connect_timeout'],
+            # Fail fast instead of queueing forever when every session is busy
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=settings['pool_wait_timeout_ms'],
+            session_callback=init_session,
+            **drcp_params(config, read_only)
+        )
+    
+    def pool(self, db_name, read_only=False):
+        """Return the pool for a database, creating it on first use"""
+        key = (db_name, read_only)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = self._pools[key] = self._create_pool(db_name, read_only)
+        return pool
+    
+    @contextlib.contextmanager
+    def connection(self, db_name, read_only=False, call_timeout_ms=None):
+        """Yield a connection to the database, returning it to its pool afterwards"""
+        if self.settings['pool_enabled'] or read_only:
+            connection = self.pool(db_name, read_only).acquire()
+        else:
+            # Connect-per-check mode: no session outlives the probe
+            config = self._config(db_name)
+            connection = oracledb.connect(
+                user=config['user'],
+                password=config['password'],
+                dsn=self._dsn(config),
+                tcp_connect_timeout=config['connect_timeout'],
+                **drcp_params(config)
+            )
+            self.metrics.record_session_opened(db_name)
+        
+        self.metrics.record_connection_acquired(db_name)
+        
+        with connection:
+            # Bound every round trip so a hung database cannot pin a worker
+            connection.call_timeout = call_timeout_ms or self.settings['call_timeout_ms']
+            yield connection
+    
+    def close(self):
+        """Close all pools, e.g. on worker shutdown"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close(force=True)
+
+def drcp_params(config, read_only=False):
+    """Connect arguments routing sessions through DRCP, if enabled for the database.
+    
+    The read-only /custom pool gets its own connection class: the session callback
+    only runs for new sessions, so a /custom request must never be handed a pooled
+    server session that a probe pool created without READ_ONLY.
+    """
+    if not config['drcp']:
+        return {}
+    cclass = config['drcp_connection_class']
+    return {
+        'server_type': 'pooled',
+        'cclass': cclass + READ_ONLY_CLASS_SUFFIX if read_only else cclass,
+        # SELF lets a session reuse server state left by the same connection class
+        'purity': oracledb.PURITY_NEW if config['drcp_purity'] == 'new' else oracledb.PURITY_SELF,
+    }
+
+def _init_read_only_session(connection):
+    """Put a new /custom session into read-only mode"""
+    with connection.cursor() as cursor:
+        try:
+            # Oracle 23ai and later: blocks DML/DDL for the whole session,
+            # including autonomous transactions
+            cursor.execute("ALTER SESSION SET READ_ONLY = TRUE")
+        except oracledb.DatabaseError:
+            # Older releases fall back to SET TRANSACTION READ ONLY per query
+            pass
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Connectivity tester for the whole database inventory.
+
+Every target is tested concurrently, each attempt timing three phases separately:
+connect (TCP handshake with the listener), auth (driver logon, including its own
+network setup) and query (the version query). Attempts are repeated to report
+min/median/max latencies, so pre-deploy validation of many databases takes
+about as long as the slowest one.
+
+    python -m oracle_db_monitor_core.connectivity [NAME ...] [--repeat N] [--json]
+
+Exits with status 0 only if every attempt against every selected target succeeded.
+"""
+import argparse
+import concurrent.futures
+import json
+import socket
+import statistics
+import sys
+import time
+
+from .config import database_identifier, load_inventory
+from .connection import drcp_params
+from .driver import DRIVER, oracledb
+from .probes import VERSION_QUERY
+
+PHASES = ('connect_ms', 'auth_ms', 'query_ms')
+
+def elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+def test_once(config, call_timeout_ms):
+    """Run one attempt against a database and return its phase timings"""
+    attempt = {}
+    
+    # The fake driver has no listener to reach
+    if DRIVER != 'fake':
+        start = time.perf_counter()
+        with socket.create_connection((config['host'], config['port']), timeout=config['connect_timeout']):
+            attempt['connect_ms'] = elapsed_ms(start)
+    
+    start = time.perf_counter()
+    connection = oracledb.connect(
+        user=config['user'],
+        password=config['password'],
+        dsn=oracledb.makedsn(host=config['host'], port=config['port'], service_name=config['service_name']),
+        tcp_connect_timeout=config['connect_timeout'],
+        # Through DRCP when the apps use it, so the same connection path is tested
+        **drcp_params(config)
+    )
+    attempt['auth_ms'] = elapsed_ms(start)
+    
+    with connection:
+        connection.call_timeout = call_timeout_ms
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(VERSION_QUERY)
+            version = cursor.fetchone()
+        attempt['query_ms'] = elapsed_ms(start)
+    
+    attempt['version'] = version[0] if version else None
+    return attempt
+
+def summarize(values):
+    """min/median/max of a phase over the successful attempts"""
+    if not values:
+        return None
+    return {"min": min(values), "median": round(statistics.median(values), 2), "max": max(values)}
+
+def test_target(name, config, repeat, call_timeout_ms):
+    """Test one database repeat times and return its result"""
+    attempts = []
+    errors = []
+    
+    for _ in range(repeat):
+        try:
+            attempts.append(test_once(config, call_timeout_ms))
+        except Exception as e:
+            errors.append(str(e) or type(e).__name__)
+    
+    result = {
+        "database": name,
+        "dsn": database_identifier(config),
+        "ok": not errors,
+        "attempts": repeat,
+        "failures": len(errors),
+        "version": next((attempt['version'] for attempt in attempts if attempt.get('version')), None),
+    }
+    for phase in PHASES:
+        result[phase] = summarize([attempt[phase] for attempt in attempts if phase in attempt])
+    if errors:
+        result["error"] = errors[-1]
+    return result
+
+def test_inventory(configs, repeat=1, call_timeout_ms=5000, parallel=32):
+    """Test all databases concurrently; results come back in inventory order"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(parallel, len(configs)))) as executor:
+        futures = [
+            executor.submit(test_target, name, config, repeat, call_timeout_ms)
+            for name, config in configs.items()
+        ]
+        return [future.result() for future in futures]
+
+def format_phase(summary):
+    if summary is None:
+        return '-'
+    return f"{summary['min']:.0f}/{summary['median']:.0f}/{summary['max']:.0f}"
+
+def print_report(results, elapsed):
+    """Human-readable table, one line per database"""
+    print(f"{'database':<16} {'result':<7} {'connect ms':>16} {'auth ms':>16} {'query ms':>16}  details")
+    for result in results:
+        details = result.get('error') or result['version'] or ''
+        if result['failures'] and result['failures'] < result['attempts']:
+            details = f"{result['failures']}/{result['attempts']} failed: {details}"
+        print(f"{result['database']:<16} {'OK' if result['ok'] else 'FAILED':<7} "
+              f"{format_phase(result['connect_ms']):>16} {format_phase(result['auth_ms']):>16} "
+              f"{format_phase(result['query_ms']):>16}  {details}")
+    
+    failed = sum(1 for result in results if not result['ok'])
+    print(f"\n{len(results) - failed}/{len(results)} databases OK in {elapsed:.2f} seconds (latencies are min/median/max)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("databases", nargs="*", help="names from the inventory to test (default: all)")
+    parser.add_argument("--inventory", help="JSON inventory file (default: DB_INVENTORY, DATABASES or DB_*)")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="attempts per database")
+    parser.add_argument("-t", "--timeout", type=float,
+                        help="seconds allowed per phase (default: each database's connect timeout to connect, 5 to query)")
+    parser.add_argument("-p", "--parallel", type=int, default=32, help="databases tested at the same time")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+    
+    configs = load_inventory(args.inventory)
+    unknown = [name for name in args.databases if name not in configs]
+    if unknown:
+        parser.error(f"not in the inventory: {', '.join(unknown)}")
+    if args.databases:
+        configs = {name: configs[name] for name in args.databases}
+    if args.timeout:
+        configs = {name: dict(config, connect_timeout=args.timeout) for name, config in configs.items()}
+    call_timeout_ms = int((args.timeout or 5) * 1000)
+    
+    start = time.perf_counter()
+    results = test_inventory(configs, max(1, args.repeat), call_timeout_ms, args.parallel)
+    elapsed = time.perf_counter() - start
+    
+    if args.json:
+        print(json.dumps({
+            "ok": all(result['ok'] for result in results),
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "databases": results
+        }, indent=2))
+    else:
+        print_report(results, elapsed)
+    
+    return 0 if all(result['ok'] for result in results) else 1
+
+if __name__ == "__main__":
+    # Pick up a .env file in the current directory when python-dotenv is installed
+    try:
+        from dotenv import find_dotenv, load_dotenv
+        load_dotenv(find_dotenv(usecwd=True))
+    except ImportError:
+        pass
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Database driver used by the core: python-oracledb, or the in-process fake
+(fake_oracledb) when DB_DRIVER=fake, for benchmarks and tests without a database.
+
+python-oracledb runs in thin mode (pure Python) unless DB_DRIVER_MODE=thick, in
+which case the Oracle Client libraries (Instant Client) are loaded once, when
+the driver is first used. ORACLE_CLIENT_LIB_DIR and ORACLE_CLIENT_CONFIG_DIR
+locate the libraries and the network configuration (tnsnames.ora, sqlnet.ora);
+when unset the platform's library search path and TNS_ADMIN are used.
+
+DB_DRIVER and DB_DRIVER_MODE are read when this module is imported, so apps
+load their .env file before importing the core.
+"""
+import importlib
+import os
+import threading
+
+DRIVER = os.environ.get('DB_DRIVER', 'oracledb').strip().lower()
+
+MODE = os.environ.get('DB_DRIVER_MODE', 'thin').strip().lower()
+
+if DRIVER not in ('oracledb', 'fake'):
+    raise ImportError(f"Unknown DB_DRIVER {DRIVER!r}; expected 'oracledb' or 'fake'")
+if MODE not in ('thin', 'thick'):
+    raise ImportError(f"Unknown DB_DRIVER_MODE {MODE!r}; expected 'thin' or 'thick'")
+
+_module = None
+_lock = threading.Lock()
+
+def load_driver():
+    """Import the driver module (and load the Oracle Client libraries in thick mode) on first use"""
+    global _module
+    if _module is None:
+        with _lock:
+            if _module is None:
+                if DRIVER == 'fake':
+                    module = importlib.import_module('.fake_oracledb', __package__)
+                else:
+                    module = importlib.import_module('oracledb')
+                if MODE == 'thick':
+                    # Thick mode is process-wide and cannot be undone, so it is chosen per deployment
+                    module.init_oracle_client(
+                        lib_dir=os.environ.get('ORACLE_CLIENT_LIB_DIR') or None,
+                        config_dir=os.environ.get('ORACLE_CLIENT_CONFIG_DIR') or None
+                    )
+                _module = module
+    return _module
+
+class _LazyDriver:
+    """Stands in for the driver module until an attribute is first used"""
+    
+    def __getattr__(self, name):
+        return getattr(load_driver(), name)
+
+# Importing the core neither imports the driver nor loads the client libraries, so apps
+# start quickly and gunicorn's master never initializes thick mode before forking
+oracledb = _LazyDriver()
+
+def driver_info():
+    """Driver name, mode and versions, as reported on /stats"""
+    thin = oracledb.is_thin_mode()
+    info = {
+        'name': DRIVER,
+        'mode': 'thin' if thin else 'thick',
+        'version': oracledb.__version__,
+    }
+    if not thin:
+        info['client_version'] = '.'.join(str(part) for part in oracledb.clientversion())
+    return info
@@ -0,0 +1,201 @@
+"""
+Push export of health samples to a local collector, so results reach monitoring
+without anyone polling the HTTP endpoints.
+
+The sampler hands every sample to an Exporter, which only appends it to a
+bounded in-memory queue; a background thread sends the queue in batches to the
+sink chosen by EXPORT_SINK:
+
+    otlp    OTLP/HTTP JSON gauges, POSTed to EXPORT_TARGET (default http://localhost:4318/v1/metrics)
+    statsd  StatsD gauges over UDP to EXPORT_TARGET (default localhost:8125)
+    file    JSON lines appended to EXPORT_TARGET, rotated at EXPORT_FILE_MAX_BYTES
+
+When the sink is slower than the sampler the oldest queued samples are dropped,
+so probing never waits for delivery. Sent, dropped and failed samples are
+counted on /stats.
+"""
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+# OTLP resource and scope names of the exported metrics
+SERVICE_NAME = 'oracle-db-monitor'
+
+# Largest StatsD datagram that avoids IP fragmentation on a typical 1500-byte MTU
+STATSD_MAX_DATAGRAM = 1432
+
+def sample_gauges(sample):
+    """(name, unit, value) gauges of a health sample"""
+    gauges = [
+        ('up', '1', 0 if sample['status'] == 'DOWN' else 1),
+        ('degraded', '1', 1 if sample['status'] == 'DEGRADED' else 0),
+        ('response_time', 'ms', sample['response_time_ms']),
+    ]
+    if 'anomaly_score' in sample:
+        gauges.append(('anomaly_score', '1', sample['anomaly_score']))
+    return gauges
+
+class OtlpHttpSink:
+    """Sends gauges to an OpenTelemetry collector with OTLP/HTTP JSON encoding"""
+    
+    def __init__(self, target, timeout=5):
+        # Imported here: urllib.request (and http.client, email, ssl) is only needed by this sink
+        import urllib.request
+        self.urllib = urllib.request
+        self.url = target or 'http://localhost:4318/v1/metrics'
+        self.timeout = timeout
+    
+    def send(self, batch):
+        metrics = {}
+        for db_name, sample, timestamp in batch:
+            attributes = [
+                {'key': 'db.name', 'value': {'stringValue': db_name}},
+                {'key': 'db.instance', 'value': {'stringValue': sample['database']}},
+            ]
+            for name, unit, value in sample_gauges(sample):
+                metric = metrics.setdefault(name, {'name': f'oracle.db.{name}', 'unit': unit,
+                                                   'gauge': {'dataPoints': []}})
+                metric['gauge']['dataPoints'].append({
+                    'attributes': attributes,
+                    'timeUnixNano': str(int(timestamp * 1e9)),
+                    'asDouble': float(value),
+                })
+        
+        body = json.dumps({'resourceMetrics': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+            'scopeMetrics': [{'scope': {'name': SERVICE_NAME}, 'metrics': list(metrics.values())}],
+        }]}).encode('utf-8')
+        
+        request = self.urllib.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with self.urllib.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class StatsdSink:
+    """Sends gauges as StatsD lines, packed into as few UDP datagrams as possible"""
+    
+    def __init__(self, target, prefix='oracle_db_monitor'):
+        host, _, port = (target or 'localhost:8125').rpartition(':')
+        self.address = (host or 'localhost', int(port))
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    
+    def send(self, batch):
+        lines = [
+            f"{self.prefix}.{db_name}.{name}:{value}|g".encode('ascii')
+            for db_name, sample, _ in batch
+            for name, _, value in sample_gauges(sample)
+        ]
+        datagram = b''
+        for line in lines:
+            if datagram and len(datagram) + 1 + len(line) > STATSD_MAX_DATAGRAM:
+                self.socket.sendto(datagram, self.address)
+                datagram = b''
+            datagram = datagram + b'\n' + line if datagram else line
+        if datagram:
+            self.socket.sendto(datagram, self.address)
+
+class JsonLinesSink:
+    """Appends one JSON object per sample to a file, rotating it once it reaches max_bytes"""
+    
+    def __init__(self, target, max_bytes=10 * 1024 * 1024, backups=5):
+        self.path = target or 'health_samples.jsonl'
+        self.max_bytes = max_bytes
+        self.backups = backups
+    
+    def send(self, batch):
+        lines = ''.join(
+            json.dumps(dict(sample, database_name=db_name), default=str) + '\n'
+            for db_name, sample, _ in batch
+        )
+        with open(self.path, 'a') as f:
+            f.write(lines)
+            size = f.tell()
+        if self.max_bytes and size >= self.max_bytes:
+            self._rotate()
+    
+    def _rotate(self):
+        # path.N-1 -> path.N, ..., path -> path.1; the oldest copy is overwritten
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.unlink(self.path)
+
+SINKS = {
+    'otlp': OtlpHttpSink,
+    'statsd': StatsdSink,
+    'file': JsonLinesSink,
+}
+
+class Exporter:
+    """Buffers samples in a bounded queue and sends them to a sink in batches from a background thread"""
+    
+    def __init__(self, sink, metrics, batch_size=100, flush_interval=5, queue_size=1000):
+        self.sink = sink
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, db_name, sample):
+        """Queue a sample without ever blocking, dropping the oldest one if the queue is full"""
+        self._start()
+        item = (db_name, sample, time.time())
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.metrics.record_export('dropped')
+                except queue.Empty:
+                    pass
+    
+    def _start(self):
+        # Started on first use, so gunicorn workers each get their own thread after forking
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="exporter", daemon=True)
+                self._thread.start()
+    
+    def _run(self):
+        while True:
+            # Wait for the first sample, then collect more until the batch is full or the interval ends
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            
+            try:
+                self.sink.send(batch)
+                self.metrics.record_export('sent', len(batch))
+            except Exception:
+                # The collector may be restarting; the next batch tries again
+                self.metrics.record_export('failed', len(batch))
+
+def create_exporter(settings, metrics):
+    """Return an Exporter for the EXPORT_* settings, or None when EXPORT_SINK is not set"""
+    kind = settings['export_sink']
+    if not kind or kind == 'none':
+        return None
+    if kind not in SINKS:
+        raise ValueError(f"Unknown EXPORT_SINK {kind!r}; expected one of {', '.join(SINKS)}")
+    
+    target = settings['export_target']
+    if kind == 'file':
+        sink = JsonLinesSink(target, settings['export_file_max_bytes'], settings['export_file_backups'])
+    else:
+        sink = SINKS[kind](target)
+    return Exporter(sink, metrics, settings['export_batch_size'], settings['export_flush_interval'],
+                    settings['export_queue_size'])
@@ -0,0 +1,704 @@
+"""
+In-process stand-in for the oracledb driver, for benchmarking and verifying the
+monitor apps without an Oracle database. Select it with DB_DRIVER=fake.
+
+It implements the subset of the python-oracledb API the monitor uses (connect,
+create_pool, cursors, ping, call_timeout, cancel and the connect_async /
+create_pool_async variants) and answers the probe queries with canned rows.
+Behaviour is configured through environment variables, or configure() in-process:
+
+    FAKE_DB_CONNECT_LATENCY_MS  session setup time (default 20)
+    FAKE_DB_QUERY_LATENCY_MS    time per statement or ping (default 2)
+    FAKE_DB_CONNECT_FAULTS      random connect faults, e.g. "refuse:0.05,ORA-01017:0.01"
+    FAKE_DB_QUERY_FAULTS        random statement faults, e.g. "hang:0.01,ORA-03113:0.02"
+    FAKE_DB_FAILURE_RATE        shorthand for an ORA-03113 query fault rate (default 0)
+    FAKE_DB_CONNECT_SCRIPT      steps applied to the next connects, in order
+    FAKE_DB_QUERY_SCRIPT        steps applied to the next statements, in order
+    FAKE_DB_SEED                seed for reproducible random faults and latencies
+    FAKE_DB_SESSION_LOG         file that receives one byte per session opened, so
+                                sessions can be counted across worker processes
+
+Latencies are milliseconds, either a number or a distribution: "fixed:5",
+"uniform:1,10", "normal:5,1", "lognormal:5,0.5" (median, sigma) or
+"exponential:5" (mean). Script steps are "ok", a latency in milliseconds,
+"hang" (never returns; ends with call_timeout, tcp_connect_timeout or cancel()),
+"refuse" (connect only: listener refused the connection) or an ORA- code.
+Once a script is used up the random faults apply again.
+"""
+import asyncio
+import collections
+import datetime
+import math
+import os
+import random
+import threading
+import time
+
+__version__ = "fake"
+
+POOL_GETMODE_WAIT = 1
+POOL_GETMODE_NOWAIT = 2
+POOL_GETMODE_FORCEGET = 3
+POOL_GETMODE_TIMEDWAIT = 4
+
+PURITY_DEFAULT = 0
+PURITY_NEW = 1
+PURITY_SELF = 2
+
+class _Error:
+    """Error details carried in exception.args[0], like oracledb's _Error"""
+    
+    def __init__(self, full_code, message, isrecoverable=False):
+        self.full_code = full_code
+        self.code = int(full_code.split('-')[1]) if full_code.startswith('ORA-') else 0
+        self.message = f"{full_code}: {message}"
+        self.isrecoverable = isrecoverable
+    
+    def __str__(self):
+        return self.message
+
+class Error(Exception):
+    """Base class of the driver's exceptions"""
+
+class DatabaseError(Error):
+    """Raised for errors reported by the (fake) database"""
+
+class OperationalError(DatabaseError):
+    """Raised when the (fake) database cannot be reached or the connection is lost"""
+
+# Messages of the ORA- codes most useful for exercising the monitor; any other
+# code can be scripted too and gets a generic message
+ORA_MESSAGES = {
+    'ORA-00060': "deadlock detected while waiting for resource",
+    'ORA-00942': "table or view does not exist",
+    'ORA-01013': "user requested cancel of current operation",
+    'ORA-01017': "invalid username/password; logon denied",
+    'ORA-01034': "ORACLE not available",
+    'ORA-01089': "immediate shutdown or close in progress - no operations are permitted",
+    'ORA-03113': "end-of-file on communication channel",
+    'ORA-03114': "not connected to ORACLE",
+    'ORA-12514': "TNS:listener does not currently know of service requested in connect descriptor",
+    'ORA-12516': "TNS:listener could not find available handler with matching protocol stack",
+    'ORA-12541': "TNS:no listener",
+}
+
+# Codes meaning the database is unreachable or the session is gone
+OPERATIONAL_CODES = {'ORA-01034', 'ORA-01089', 'ORA-03113', 'ORA-03114', 'ORA-12514', 'ORA-12516', 'ORA-12541'}
+
+def database_error(full_code):
+    """Build the exception the real driver raises for an ORA- code"""
+    error = _Error(full_code, ORA_MESSAGES.get(full_code, "scripted error"),
+                   isrecoverable=full_code in OPERATIONAL_CODES)
+    return (OperationalError if full_code in OPERATIONAL_CODES else DatabaseError)(error)
+
+STARTUP_TIME = datetime.datetime(2025, 1, 1, 6, 0, 0)
+
+# (name, increase per second) of the cumulative V$SYSSTAT counters, which grow with the clock
+SYSSTAT_RATES = [
+    ('session logical reads', 52000), ('physical reads', 310), ('redo size', 1850000),
+    ('execute count', 4100), ('parse count (total)', 950), ('parse count (hard)', 3),
+    ('user commits', 35), ('user rollbacks', 1),
+]
+
+def _sysstat_rows():
+    elapsed = time.time() - STARTUP_TIME.timestamp()
+    return [(name, int(rate * elapsed)) for name, rate in SYSSTAT_RATES]
+
+# (text marker, column names, rows or a function returning them) answering the monitor's probe queries
+CANNED_RESULTS = [
+    # Data Guard: the standby query also reads V$DATAGUARD_STATS, so it is matched first
+    ("V$DATAGUARD_STATS", ["DATABASE_ROLE", "DB_UNIQUE_NAME", "CURRENT_SCN", "OPEN_MODE", "TRANSPORT_LAG",
+                           "APPLY_LAG"],
+     [("PHYSICAL STANDBY", "ORCLCDB_STBY", 48210690, "READ ONLY WITH APPLY", "+00 00:00:01", "+00 00:00:04")]),
+    ("V$DATABASE", ["DATABASE_ROLE", "DB_UNIQUE_NAME", "CURRENT_SCN", "OPEN_MODE"],
+     [("PRIMARY", "ORCLCDB", 48210733, "READ WRITE")]),
+    ("V$VERSION", ["BANNER"],
+     [("Oracle Database 19c Enterprise Edition Release 19.0.0.0.0 - Production",)]),
+    ("V$INSTANCE", ["INSTANCE_NAME", "STATUS", "DATABASE_STATUS", "STARTUP_TIME"],
+     [("ORCLCDB", "OPEN", "ACTIVE", STARTUP_TIME)]),
+    ("DBA_FREE_SPACE", ["Tablespace", "Size (MB)", "Free (MB)", "Used (MB)", "Used %"],
+     [("SYSAUX", 600, 40, 560, 93.33), ("SYSTEM", 900, 10, 890, 98.89), ("USERS", 5, 4, 1, 20.0)]),
+    # Lock tree: session 88 (idle in transaction) blocks 131 and 152, and 131 blocks 140
+    ("V$LOCK", ["SID", "SERIAL#", "USERNAME", "PROGRAM", "MACHINE", "STATUS", "SQL_ID", "EVENT", "BLOCKING_SESSION",
+                "WAIT_SECONDS", "LAST_CALL_ET", "TYPE", "LMODE", "REQUEST", "WAITING_ON"],
+     [(88, 1201, "BATCH", "sqlplus", "app02", "INACTIVE", None, "SQL*Net message from client", None, None, 95,
+       "TX", 6, 0, None),
+      (131, 77, "APP", "JDBC Thin Client", "app01", "ACTIVE", "0w26sk6t6gq98", "enq: TX - row lock contention", 88,
+       41.2, 41, "TX", 0, 6, "APP.INVENTORY"),
+      (131, 77, "APP", "JDBC Thin Client", "app01", "ACTIVE", "0w26sk6t6gq98", "enq: TX - row lock contention", 88,
+       41.2, 41, "TX", 6, 0, "APP.INVENTORY"),
+      (140, 310, "APP", "JDBC Thin Client", "app01", "ACTIVE", "0w26sk6t6gq98", "enq: TX - row lock contention", 131,
+       12.5, 12, "TX", 0, 6, "APP.INVENTORY"),
+      (152, 904, "APP", "JDBC Thin Client", "app02", "ACTIVE", "9babjv8yq8ru3", "enq: TX - row lock contention", 88,
+       3.0, 3, "TX", 0, 6, "APP.ORDERS")]),
+    # Session summary: per username/program, per machine and overall, then the blocked sessions
+    ("GROUPING SETS", ["GROUPING_ID", "USERNAME", "PROGRAM", "MACHINE", "TOTAL", "ACTIVE", "MAX_ACTIVE_SECONDS"],
+     [(1, "APP", "JDBC Thin Client", None, 84, 9, 12), (1, "MONITOR", "python", None, 1, 1, 0),
+      (1, "BATCH", "sqlplus", None, 2, 2, 41), (6, None, None, "app01", 60, 6, None),
+      (6, None, None, "app02", 24, 3, None), (6, None, None, "bench", 3, 3, None), (7, None, None, None, 87, 12, 41)]),
+    ("BLOCKING_SESSION IS NOT NULL", ["SID", "BLOCKING_SESSION", "WAIT_SECONDS"],
+     [(131, 88, 41.2), (140, 131, 12.5), (152, 88, 3.0)]),
+    ("V$SESSION", ["SID", "SERIAL#", "USERNAME", "STATUS", "MACHINE", "PROGRAM", "LOGON_TIME",
+                   "Seconds Since Last Call"],
+     [(27, 4021, "MONITOR", "ACTIVE", "bench", "python", STARTUP_TIME, 0),
+      (131, 77, "APP", "INACTIVE", "app01", "JDBC Thin Client", STARTUP_TIME, 42)]),
+    ("V$CPOOL_STATS", ["NUM_OPEN_SERVERS", "NUM_BUSY_SERVERS", "NUM_REQUESTS", "NUM_HITS", "NUM_MISSES",
+                       "NUM_WAITS"],
+     [(4, 1, 1200, 1180, 20, 0)]),
+    ("V$CPOOL_CC_STATS", ["CCLASS_NAME", "NUM_REQUESTS", "NUM_HITS", "NUM_MISSES", "NUM_WAITS"],
+     [("SYSTEM.ORACLE_DB_MONITOR", 1200, 1180, 20, 0)]),
+    ("V$SYSSTAT", ["NAME", "VALUE"], _sysstat_rows),
+    ("V$WAITCLASSMETRIC", ["Wait Class", "Average Active Sessions", "Waits", "% DB Time"],
+     [("User I/O", 0.42, 1830, 21.5), ("Commit", 0.11, 960, 5.6), ("Network", 0.02, 4100, 1.0)]),
+    ("V$SYSMETRIC", ["METRIC_NAME", "VALUE"],
+     [("Average Active Sessions", 1.96), ("Database Time Per Sec", 195.8), ("CPU Usage Per Sec", 138.2),
+      ("Executions Per Sec", 412.7), ("User Transaction Per Sec", 35.1)]),
+    ("V$SQLSTATS", ["SQL ID", "Plan Hash", "Executions", "Elapsed (s)", "CPU (s)", "Elapsed per Execution (ms)",
+                    "Buffer Gets", "SQL Text"],
+     [("9babjv8yq8ru3", 1388734953, 5120, 84.112, 61.05, 16.428, 2210344,
+       "SELECT o.order_id, o.status FROM orders o WHERE o.customer_id = :1"),
+      ("0w26sk6t6gq98", 2946701254, 310, 12.804, 2.117, 41.303, 98310,
+       "UPDATE inventory SET quantity = quantity - :1 WHERE item_id = :2")]),
+]
+
+def parse_latency(spec, rng):
+    """Turn a latency spec in milliseconds into a function returning seconds"""
+    kind, _, params = str(spec).partition(':')
+    if not params:
+        kind, params = 'fixed', kind
+    values = [float(value) for value in params.split(',')]
+    
+    distributions = {
+        'fixed': lambda value: value,
+        'uniform': lambda low, high: rng.uniform(low, high),
+        'normal': lambda mean, stddev: rng.gauss(mean, stddev),
+        'lognormal': lambda median, sigma: rng.lognormvariate(math.log(median), sigma),
+        'exponential': lambda mean: rng.expovariate(1 / mean),
+    }
+    if kind not in distributions:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    
+    sample = distributions[kind]
+    return lambda: max(0.0, sample(*values)) / 1000
+
+def parse_faults(spec):
+    """Parse "outcome:rate,..." into a list of (outcome, rate) pairs"""
+    faults = []
+    for item in filter(None, (item.strip() for item in (spec or '').split(','))):
+        outcome, _, rate = item.rpartition(':')
+        faults.append((outcome.strip(), float(rate)))
+    return faults
+
+class Script:
+    """Thread-safe queue of scripted outcomes, consumed one per call"""
+    
+    def __init__(self, spec):
+        self._steps = collections.deque(filter(None, (step.strip() for step in (spec or '').split(','))))
+        self._lock = threading.Lock()
+    
+    def next_step(self):
+        with self._lock:
+            return self._steps.popleft() if self._steps else None
+
+class Settings:
+    """Latencies, faults and scripts, read from the environment and configure()"""
+    
+    def __init__(self, **overrides):
+        def get(name, default):
+            return overrides.get(name, os.environ.get(f"FAKE_DB_{name.upper()}", default))
+        
+        seed = get('seed', None)
+        self.rng = random.Random(int(seed) if seed is not None else None)
+        self.connect_latency = parse_latency(get('connect_latency_ms', 20), self.rng)
+        self.query_latency = parse_latency(get('query_latency_ms', 2), self.rng)
+        self.connect_faults = parse_faults(get('connect_faults', ''))
+        self.query_faults = parse_faults(get('query_faults', ''))
+        failure_rate = float(get('failure_rate', 0))
+        if failure_rate:
+            self.query_faults.append(('ORA-03113', failure_rate))
+        self.connect_script = Script(get('connect_script', ''))
+        self.query_script = Script(get('query_script', ''))
+        self.session_log = get('session_log', None)
+    
+    def plan(self, call):
+        """Decide the outcome of the next connect or query call: (delay seconds or None for a hang, error)"""
+        script, faults, latency = {
+            'connect': (self.connect_script, self.connect_faults, self.connect_latency),
+            'query': (self.query_script, self.query_faults, self.query_latency),
+        }[call]
+        
+        step = script.next_step()
+        if step is None:
+            # Draw a random fault, or a normal call when none fires
+            draw = self.rng.random()
+            step = 'ok'
+            for outcome, rate in faults:
+                if draw < rate:
+                    step = outcome
+                    break
+                draw -= rate
+        
+        if step == 'ok':
+            return latency(), None
+        if step == 'hang':
+            return None, None
+        if step == 'refuse':
+            if call != 'connect':
+                raise ValueError("'refuse' only applies to connects")
+            return 0.0, OperationalError(_Error(
+                'DPY-6005', "cannot connect to database. [Errno 111] Connection refused", isrecoverable=True))
+        if step.upper().startswith('ORA-'):
+            return latency(), database_error(step.upper())
+        return parse_latency(step, self.rng)(), None
+
+settings = Settings()
+
+def configure(**overrides):
+    """Replace the fake's settings, e.g. configure(query_script="ok,hang", seed=1); unset keys come from the environment"""
+    global settings
+    settings = Settings(**overrides)
+
+def _log_session():
+    if settings.session_log:
+        # O_APPEND writes from several worker processes never overlap
+        fd = os.open(settings.session_log, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, b".")
+        finally:
+            os.close(fd)
+
+def _timeout_error(call_timeout):
+    return DatabaseError(_Error('DPY-4024', f"call timeout of {call_timeout} ms exceeded"))
+
+def _connect_timeout_error():
+    return OperationalError(_Error('DPY-6005', "cannot connect to database. timed out", isrecoverable=True))
+
+def _cancelled_error():
+    return database_error('ORA-01013')
+
+_thin_mode = True
+
+def init_oracle_client(lib_dir=None, config_dir=None, **kwargs):
+    """Switch to (simulated) thick mode; the fake behaves the same in both modes"""
+    global _thin_mode
+    _thin_mode = False
+
+def is_thin_mode():
+    return _thin_mode
+
+def clientversion():
+    if _thin_mode:
+        raise Error(_Error('DPY-2021', "Oracle Client library has not been initialized"))
+    return (19, 0, 0, 0, 0)
+
+def makedsn(host, port, service_name=None, sid=None):
+    """Return an Easy Connect string, like oracledb.makedsn()"""
+    return f"{host}:{port}/{service_name or sid}"
+
+def _select_rows(statement):
+    """Return (description, rows) answering a statement"""
+    normalized = statement.upper()
+    if not normalized.lstrip().startswith(("SELECT", "WITH")):
+        return None, []
+    
+    for marker, columns, rows in CANNED_RESULTS:
+        if marker in normalized:
+            break
+    else:
+        columns, rows = ["VALUE"], [(1,)]
+    
+    return [(name, None, None, None, None, None, True) for name in columns], list(rows() if callable(rows) else rows)
+
+class Cursor:
+    """Cursor returning canned rows for the monitor's queries"""
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.arraysize = 100
+        self._rows = iter(())
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __iter__(self):
+        return self._rows
+    
+    def execute(self, statement, parameters=None):
+        self.connection._round_trip()
+        self.description, rows = _select_rows(statement)
+        self._rows = iter(rows)
+    
+    def fetchone(self):
+        return next(self._rows, None)
+    
+    def fetchmany(self, size=None):
+        return [row for _, row in zip(range(size or self.arraysize), self._rows)]
+    
+    def fetchall(self):
+        return list(self._rows)
+    
+    def close(self):
+        self._rows = iter(())
+
+class Connection:
+    """A fake database session"""
+    
+    version = "19.0.0.0.0"
+    
+    def __init__(self, pool=None, tcp_connect_timeout=20.0):
+        self.call_timeout = 0
+        self._pool = pool
+        self._cancelled = threading.Event()
+        self._open = True
+        
+        delay, error = settings.plan('connect')
+        if delay is None or delay > tcp_connect_timeout:
+            time.sleep(tcp_connect_timeout)
+            raise _connect_timeout_error()
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        _log_session()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _round_trip(self):
+        """Simulate one call to the database, honouring call_timeout and cancel()"""
+        if not self._open:
+            raise Error(_Error('DPY-1001', "not connected to database"))
+        
+        delay, error = settings.plan('query')
+        self._cancelled.clear()
+        timeout = self.call_timeout / 1000 if self.call_timeout else None
+        
+        if timeout is not None and (delay is None or delay > timeout):
+            if self._cancelled.wait(timeout):
+                raise _cancelled_error()
+            # The real driver drops the session after a call timeout
+            self._open = False
+            raise _timeout_error(self.call_timeout)
+        if self._cancelled.wait(delay):
+            raise _cancelled_error()
+        
+        if error is not None:
+            if isinstance(error, OperationalError):
+                self._open = False
+            raise error
+    
+    def cursor(self):
+        return Cursor(self)
+    
+    def ping(self):
+        self._round_trip()
+    
+    def is_healthy(self):
+        return self._open
+    
+    def cancel(self):
+        self._cancelled.set()
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            self._open = False
+
+def connect(user=None, password=None, dsn=None, tcp_connect_timeout=20.0, **kwargs):
+    """Open a standalone session"""
+    return Connection(tcp_connect_timeout=tcp_connect_timeout)
+
+class ConnectionPool:
+    """Session pool with the getmode and wait_timeout semantics of oracledb"""
+    
+    def __init__(self, min=1, max=2, increment=1, getmode=POOL_GETMODE_WAIT, wait_timeout=0,
+                 session_callback=None, tcp_connect_timeout=20.0, **kwargs):
+        self.min = min
+        self.max = max
+        self.getmode = getmode
+        self.wait_timeout = wait_timeout
+        self.session_callback = session_callback
+        self.tcp_connect_timeout = tcp_connect_timeout
+        self._idle = []
+        self._busy = 0
+        self._condition = threading.Condition()
+    
+    @property
+    def opened(self):
+        return len(self._idle) + self._busy
+    
+    @property
+    def busy(self):
+        return self._busy
+    
+    def _reserve(self):
+        """Wait for an idle session or room to grow; return the idle session, if any"""
+        with self._condition:
+            deadline = time.monotonic() + self.wait_timeout / 1000
+            while not self._idle and self.opened >= self.max:
+                remaining = deadline - time.monotonic()
+                if self.getmode == POOL_GETMODE_NOWAIT or (
+                        self.getmode == POOL_GETMODE_TIMEDWAIT and remaining <= 0):
+                    raise DatabaseError(_Error(
+                        'DPY-4005', "timed out waiting for the connection pool to return a connection"))
+                self._condition.wait(remaining if self.getmode == POOL_GETMODE_TIMEDWAIT else None)
+            
+            self._busy += 1
+            return self._idle.pop() if self._idle else None
+    
+    def _unreserve(self):
+        with self._condition:
+            self._busy -= 1
+            self._condition.notify()
+    
+    def acquire(self):
+        connection = self._reserve()
+        if connection is not None:
+            return connection
+        
+        # Grow the pool outside the lock so other callers are not held up by the logon
+        try:
+            connection = Connection(self, self.tcp_connect_timeout)
+        except BaseException:
+            self._unreserve()
+            raise
+        
+        # The session callback runs once for every newly created session
+        if self.session_callback is not None:
+            self.session_callback(connection, None)
+        return connection
+    
+    def release(self, connection):
+        with self._condition:
+            self._busy -= 1
+            # Sessions broken by a timeout or lost connection are dropped
+            if connection._open:
+                self._idle.append(connection)
+            self._condition.notify()
+    
+    def close(self, force=False):
+        with self._condition:
+            for connection in self._idle:
+                connection._open = False
+            self._idle.clear()
+
+def create_pool(user=None, password=None, dsn=None, **kwargs):
+    """Create a session pool"""
+    return ConnectionPool(**kwargs)
+
+class AsyncCursor(Cursor):
+    """Cursor of an AsyncConnection"""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        row = next(self._rows, None)
+        if row is None:
+            raise StopAsyncIteration
+        return row
+    
+    async def execute(self, statement, parameters=None):
+        await self.connection._round_trip()
+        self.description, rows = _select_rows(statement)
+        self._rows = iter(rows)
+    
+    async def fetchone(self):
+        return next(self._rows, None)
+    
+    async def fetchmany(self, size=None):
+        return [row for _, row in zip(range(size or self.arraysize), self._rows)]
+    
+    async def fetchall(self):
+        return list(self._rows)
+
+class AsyncConnection:
+    """A fake database session for asyncio code"""
+    
+    version = Connection.version
+    
+    def __init__(self, pool=None):
+        self.call_timeout = 0
+        self._pool = pool
+        self._open = True
+        self._cancelled = asyncio.Event()
+    
+    async def _connect(self, tcp_connect_timeout):
+        delay, error = settings.plan('connect')
+        if delay is None or delay > tcp_connect_timeout:
+            await asyncio.sleep(tcp_connect_timeout)
+            raise _connect_timeout_error()
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        _log_session()
+        return self
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def _round_trip(self):
+        if not self._open:
+            raise Error(_Error('DPY-1001', "not connected to database"))
+        
+        delay, error = settings.plan('query')
+        self._cancelled.clear()
+        timeout = self.call_timeout / 1000 if self.call_timeout else None
+        timed_out = timeout is not None and (delay is None or delay > timeout)
+        
+        try:
+            await asyncio.wait_for(self._cancelled.wait(), timeout if timed_out else delay)
+            raise _cancelled_error()
+        except asyncio.TimeoutError:
+            pass
+        
+        if timed_out:
+            self._open = False
+            raise _timeout_error(self.call_timeout)
+        if error is not None:
+            if isinstance(error, OperationalError):
+                self._open = False
+            raise error
+    
+    def cursor(self):
+        return AsyncCursor(self)
+    
+    async def ping(self):
+        await self._round_trip()
+    
+    def is_healthy(self):
+        return self._open
+    
+    def cancel(self):
+        self._cancelled.set()
+    
+    async def commit(self):
+        pass
+    
+    async def rollback(self):
+        pass
+    
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.release(self)
+        else:
+            self._open = False
+
+class _AsyncAcquire:
+    """Awaitable that also works as `async with pool.acquire() as connection`"""
+    
+    def __init__(self, pool):
+        self._pool = pool
+        self._connection = None
+    
+    def __await__(self):
+        return self._pool._acquire().__await__()
+    
+    async def __aenter__(self):
+        self._connection = await self._pool._acquire()
+        return self._connection
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._connection.close()
+
+class AsyncConnectionPool:
+    """Session pool for asyncio code"""
+    
+    def __init__(self, min=1, max=2, increment=1, getmode=POOL_GETMODE_WAIT, wait_timeout=0,
+                 session_callback=None, tcp_connect_timeout=20.0, **kwargs):
+        self.min = min
+        self.max = max
+        self.getmode = getmode
+        self.wait_timeout = wait_timeout
+        self.session_callback = session_callback
+        self.tcp_connect_timeout = tcp_connect_timeout
+        self._idle = []
+        self._busy = 0
+        self._condition = None
+    
+    @property
+    def opened(self):
+        return len(self._idle) + self._busy
+    
+    @property
+    def busy(self):
+        return self._busy
+    
+    def acquire(self):
+        return _AsyncAcquire(self)
+    
+    async def _acquire(self):
+        # Created lazily so the pool can be built outside a running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        
+        async with self._condition:
+            if not self._idle and self.opened >= self.max:
+                if self.getmode == POOL_GETMODE_NOWAIT:
+                    raise DatabaseError(_Error(
+                        'DPY-4005', "timed out waiting for the connection pool to return a connection"))
+                timeout = self.wait_timeout / 1000 if self.getmode == POOL_GETMODE_TIMEDWAIT else None
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self._idle or self.opened < self.max), timeout)
+                except asyncio.TimeoutError:
+                    raise DatabaseError(_Error(
+                        'DPY-4005', "timed out waiting for the connection pool to return a connection")) from None
+            
+            self._busy += 1
+            if self._idle:
+                return self._idle.pop()
+        
+        try:
+            connection = await AsyncConnection(self)._connect(self.tcp_connect_timeout)
+        except BaseException:
+            async with self._condition:
+                self._busy -= 1
+                self._condition.notify()
+            raise
+        
+        if self.session_callback is not None:
+            await self.session_callback(connection, None)
+        return connection
+    
+    async def release(self, connection):
+        async with self._condition:
+            self._busy -= 1
+            if connection._open:
+                self._idle.append(connection)
+            self._condition.notify()
+    
+    async def close(self, force=False):
+        for connection in self._idle:
+            connection._open = False
+        self._idle.clear()
+
+async def connect_async(user=None, password=None, dsn=None, tcp_connect_timeout=20.0, **kwargs):
+    """Open a standalone session from asyncio code"""
+    return await AsyncConnection()._connect(tcp_connect_timeout)
+
+def create_pool_async(user=None, password=None, dsn=None, **kwargs):
+    """Create a session pool for asyncio code"""
+    return AsyncConnectionPool(**kwargs)
@@ -0,0 +1,165 @@
+"""
+FastAPI adapter: turns Monitor results into Starlette responses and registers
+the standard monitor routes on an app.
+
+Probes use the blocking oracledb API, so they run in Starlette's thread pool
+instead of on the event loop.
+"""
+import anyio.to_thread
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+from .config import DEFAULT_DATABASE
+from .httputil import etag_matches
+from .requestlog import RequestLog
+from .sampler import HealthSampler
+
+def make_response(request: Request, result) -> Response:
+    """Turn a ProbeResult into a response, answering 304 when the client's ETag is current"""
+    headers = result.headers or {}
+    etag = headers.get('ETag')
+    
+    if etag and result.status_code == 200 and etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse(status_code=result.status_code, content=jsonable_encoder(result.payload), headers=headers)
+
+def register_compression(app, min_bytes):
+    """Compress large responses for clients that send Accept-Encoding: gzip"""
+    app.add_middleware(GZipMiddleware, minimum_size=min_bytes)
+
+def register_warm_up(app, monitor):
+    """Warm up the monitor's pools when the worker starts (see Monitor.start_warm_up)"""
+    @app.on_event("startup")
+    async def start_warm_up():
+        monitor.start_warm_up()
+
+def register_export(app, monitor, db_names=None):
+    """Push background health samples of the databases to EXPORT_SINK; returns the sampler, or None when not set"""
+    sampler = HealthSampler.from_settings(monitor, db_names or monitor.configs)
+    if sampler.exporter is None:
+        return None
+    
+    @app.on_event("startup")
+    async def start_export():
+        sampler.start()
+    
+    app.state.health_sampler = sampler
+    return sampler
+
+def register_thread_limit(app, threads):
+    """Size the thread pool the probes run in (40 threads by default) to the server profile"""
+    @app.on_event("startup")
+    async def set_thread_limit():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = threads
+
+def register_request_logging(app, settings):
+    """Log every request as a JSON line with its X-Request-ID and probe timings (unless LOG_REQUESTS is off)"""
+    request_log = RequestLog.from_settings(settings)
+    if request_log is None:
+        return None
+    
+    @app.middleware("http")
+    async def log_request(request: Request, call_next):
+        # Route handlers and their thread pool calls inherit the context set here
+        context = request_log.start(request.method, request.url.path, request.headers.get('x-request-id'))
+        try:
+            response = await call_next(request)
+        except Exception as e:
+            request_log.finish(context, 500, e)
+            raise
+        response.headers['X-Request-ID'] = context['request_id']
+        request_log.finish(context, response.status_code)
+        return response
+    
+    return request_log
+
+def register_monitor_routes(app, monitor, db_name=DEFAULT_DATABASE):
+    """Register /, /health, /health/live, /health/ready, /metrics, /tablespace, /sessions, /sessions/summary, /locks,
+    /performance, /sysstat, /drcp and /stats"""
+    
+    @app.get("/", response_class=JSONResponse)
+    async def index():
+        """Root endpoint with basic information"""
+        return {
+            "service": "Oracle Database Monitor",
+            "version": "1.0.0",
+            "endpoints": {
+                "/health": "Basic database connectivity check",
+                "/health/live": "Liveness of the monitor process (never queries the database)",
+                "/health/ready": "Readiness: 503 until the connection pool has warmed up",
+                "/metrics": "Detailed database metrics",
+                "/tablespace": "Tablespace usage information",
+                "/sessions": "Active session information",
+                "/sessions/summary": "Session counts by user, program and machine, and blocking chains",
+                "/locks": "Blocker/waiter tree of sessions waiting on locks",
+                "/performance": "Top wait classes, average active sessions and top SQL by elapsed time",
+                "/sysstat": "Per-second rates of system statistics (logical reads, redo, executes, parses, commits)",
+                "/stats": "Monitor self-instrumentation (probe latencies, sessions opened, cache hits)",
+                "/drcp": "DRCP pool statistics (when DRCP is enabled)"
+            }
+        }
+    
+    @app.get("/health", response_class=JSONResponse)
+    async def health_check(request: Request):
+        """Check if Oracle database is up and return status for Dynatrace to monitor"""
+        return make_response(request, await run_in_threadpool(monitor.health, db_name))
+    
+    @app.get("/health/live", response_class=JSONResponse)
+    async def liveness_check(request: Request):
+        """Check that the monitor process is alive, without querying the database"""
+        # Answered on the event loop, so it stays responsive while every probe thread is busy
+        return make_response(request, monitor.liveness())
+    
+    @app.get("/health/ready", response_class=JSONResponse)
+    async def readiness_check(request: Request):
+        """Check that the connection pool has warmed up"""
+        return make_response(request, monitor.readiness())
+    
+    @app.get("/metrics", response_class=JSONResponse)
+    async def database_metrics(request: Request):
+        """Get detailed database metrics"""
+        return make_response(request, await run_in_threadpool(monitor.database_metrics, db_name))
+    
+    @app.get("/tablespace", response_class=JSONResponse)
+    async def tablespace_usage(request: Request):
+        """Get tablespace usage information"""
+        return make_response(request, await run_in_threadpool(monitor.tablespace_usage, db_name))
+    
+    @app.get("/sessions", response_class=JSONResponse)
+    async def active_sessions(request: Request):
+        """Get active session information"""
+        return make_response(request, await run_in_threadpool(monitor.active_sessions, db_name))
+    
+    @app.get("/sessions/summary", response_class=JSONResponse)
+    async def session_summary(request: Request):
+        """Get aggregated session counts and blocking chains"""
+        return make_response(request, await run_in_threadpool(monitor.session_summary, db_name))
+    
+    @app.get("/locks", response_class=JSONResponse)
+    async def lock_tree(request: Request):
+        """Get the blocker/waiter tree"""
+        return make_response(request, await run_in_threadpool(monitor.lock_tree, db_name))
+    
+    @app.get("/performance", response_class=JSONResponse)
+    async def performance(request: Request):
+        """Get wait class, load and top SQL statistics"""
+        return make_response(request, await run_in_threadpool(monitor.performance, db_name))
+    
+    @app.get("/sysstat", response_class=JSONResponse)
+    async def sysstat(request: Request):
+        """Get per-second rates of system statistics"""
+        return make_response(request, await run_in_threadpool(monitor.sysstat, db_name))
+    
+    @app.get("/drcp", response_class=JSONResponse)
+    async def drcp_stats(request: Request):
+        """Get DRCP pooled server statistics"""
+        return make_response(request, await run_in_threadpool(monitor.drcp_stats, db_name))
+    
+    @app.get("/stats", response_class=JSONResponse)
+    async def monitor_stats(request: Request):
+        """Get monitor self-instrumentation counters"""
+        return make_response(request, monitor.stats())
@@ -0,0 +1,240 @@
+"""
+Flask adapter: turns Monitor results into Flask responses and registers the
+standard monitor routes on an app.
+
+The apps' development servers (`python app.py`) run without debug mode: its
+auto-reloader, debugger and unbuffered logging are slow. FLASK_DEBUG=1 turns
+it on.
+"""
+import contextlib
+import select
+import socket
+import threading
+
+from flask import abort, current_app, g, jsonify, request
+
+from .config import DEFAULT_DATABASE
+from .httputil import compress, etag_matches, negotiate_encoding
+from .requestlog import RequestLog
+from .sampler import HealthSampler
+
+def make_response(result):
+    """Turn a ProbeResult into a Flask response, answering 304 when the client's ETag is current"""
+    headers = result.headers or {}
+    etag = headers.get('ETag')
+    
+    if etag and result.status_code == 200 and etag_matches(request.headers.get('If-None-Match'), etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(result.payload)
+        response.status_code = result.status_code
+    
+    response.headers.update(headers)
+    return response
+
+def register_compression(app, min_bytes):
+    """Compress large responses with brotli or gzip, as negotiated through Accept-Encoding"""
+    @app.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.status_code != 200
+                or 'Content-Encoding' in response.headers):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+        if encoding and len(data) >= min_bytes:
+            response.set_data(compress(data, encoding))
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+def register_request_logging(app, settings):
+    """Log every request as a JSON line with its X-Request-ID and probe timings (unless LOG_REQUESTS is off)"""
+    request_log = RequestLog.from_settings(settings)
+    if request_log is None:
+        return None
+    
+    @app.before_request
+    def start_request_log():
+        g.request_log = request_log.start(request.method, request.path, request.headers.get('X-Request-ID'))
+    
+    @app.after_request
+    def tag_response(response):
+        context = g.get('request_log')
+        if context is not None:
+            response.headers['X-Request-ID'] = context['request_id']
+            g.request_log_status = response.status_code
+        return response
+    
+    @app.teardown_request
+    def finish_request_log(error=None):
+        # Teardown also runs for unhandled exceptions, which after_request never sees
+        context = g.pop('request_log', None)
+        if context is not None:
+            request_log.finish(context, g.pop('request_log_status', 500), error)
+    
+    return request_log
+
+def cancel_on_disconnect(poll_interval):
+    """Return a guard that cancels the statement running on a connection if the HTTP client disconnects"""
+    # gunicorn and the Werkzeug development server expose the client socket
+    client_socket = request.environ.get('gunicorn.socket') or request.environ.get('werkzeug.socket')
+    
+    @contextlib.contextmanager
+    def guard(connection):
+        if client_socket is None:
+            yield
+            return
+        
+        done = threading.Event()
+        
+        def watch():
+            while not done.wait(poll_interval):
+                try:
+                    # The request body has already been read, so a readable socket
+                    # with no data left means the client closed the connection
+                    readable, _, _ = select.select([client_socket], [], [], 0)
+                    if readable and client_socket.recv(1, socket.MSG_PEEK) == b'':
+                        connection.cancel()
+                        return
+                except (OSError, ValueError):
+                    return
+        
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        try:
+            yield
+        finally:
+            done.set()
+            watcher.join()
+    
+    return guard
+
+def register_monitor_routes(app, monitor, db_name=DEFAULT_DATABASE, custom=True):
+    """Register /, /health, /health/live, /health/ready, /metrics, /tablespace, /sessions, /sessions/summary, /locks,
+    /performance, /sysstat, /drcp, /stats and optionally /custom"""
+    endpoints = {
+        "/health": "Basic database connectivity check",
+        "/health/live": "Liveness of the monitor process (never queries the database)",
+        "/health/ready": "Readiness: 503 until the connection pool has warmed up",
+        "/metrics": "Detailed database metrics",
+        "/tablespace": "Tablespace usage information",
+        "/sessions": "Active session information",
+        "/sessions/summary": "Session counts by user, program and machine, and blocking chains",
+        "/locks": "Blocker/waiter tree of sessions waiting on locks",
+        "/performance": "Top wait classes, average active sessions and top SQL by elapsed time",
+        "/sysstat": "Per-second rates of system statistics (logical reads, redo, executes, parses, commits)",
+        "/stats": "Monitor self-instrumentation (probe latencies, sessions opened, cache hits)",
+        "/drcp": "DRCP pool statistics (when DRCP is enabled)",
+    }
+    if custom:
+        endpoints["/custom"] = "Run custom SQL query (POST with 'query' parameter)"
+    
+    @app.route('/', methods=['GET'])
+    def index():
+        """Root endpoint with basic information"""
+        return jsonify({
+            "service": "Oracle Database Monitor",
+            "version": "1.0.0",
+            "endpoints": endpoints
+        })
+    
+    @app.route('/health', methods=['GET'])
+    def health_check():
+        """Check if Oracle database is up and return status for Dynatrace to monitor"""
+        return make_response(monitor.health(db_name))
+    
+    register_liveness_routes(app, monitor)
+    
+    @app.route('/metrics', methods=['GET'])
+    def database_metrics():
+        """Get detailed database metrics"""
+        return make_response(monitor.database_metrics(db_name))
+    
+    @app.route('/tablespace', methods=['GET'])
+    def tablespace_usage():
+        """Get tablespace usage information"""
+        return make_response(monitor.tablespace_usage(db_name))
+    
+    @app.route('/sessions', methods=['GET'])
+    def active_sessions():
+        """Get active session information"""
+        return make_response(monitor.active_sessions(db_name))
+    
+    @app.route('/sessions/summary', methods=['GET'])
+    def session_summary():
+        """Get aggregated session counts and blocking chains"""
+        return make_response(monitor.session_summary(db_name))
+    
+    @app.route('/locks', methods=['GET'])
+    def lock_tree():
+        """Get the blocker/waiter tree"""
+        return make_response(monitor.lock_tree(db_name))
+    
+    @app.route('/performance', methods=['GET'])
+    def performance():
+        """Get wait class, load and top SQL statistics"""
+        return make_response(monitor.performance(db_name))
+    
+    @app.route('/sysstat', methods=['GET'])
+    def sysstat():
+        """Get per-second rates of system statistics"""
+        return make_response(monitor.sysstat(db_name))
+    
+    @app.route('/drcp', methods=['GET'])
+    def drcp_stats():
+        """Get DRCP pooled server statistics"""
+        return make_response(monitor.drcp_stats(db_name))
+    
+    @app.route('/stats', methods=['GET'])
+    def monitor_stats():
+        """Get monitor self-instrumentation counters"""
+        return make_response(monitor.stats())
+    
+    if custom:
+        @app.route('/custom', methods=['POST'])
+        def custom_query():
+            """Run a custom SQL query (read-only)"""
+            body = request.get_json(silent=True)
+            if not isinstance(body, dict):
+                # Invalid JSON, or JSON that is not an object ([] or "select 1"): no query was provided
+                body = {}
+            return make_response(monitor.custom_query(
+                body.get('query'),
+                db_name=db_name,
+                binds=body.get('binds'),
+                timeout_ms=body.get('timeout_ms'),
+                max_age=body.get('cache_max_age', 0),
+                cancel_guard=cancel_on_disconnect(monitor.settings['custom_disconnect_poll_interval'])
+            ))
+
+def register_export(app, monitor, db_names=None):
+    """Push background health samples of the databases to EXPORT_SINK; returns the sampler, or None when not set"""
+    sampler = HealthSampler.from_settings(monitor, db_names or monitor.configs)
+    if sampler.exporter is None:
+        return None
+    # Apps are imported in each gunicorn worker after it forks, so the threads belong to the worker
+    sampler.start()
+    app.extensions['health_sampler'] = sampler
+    return sampler
+
+def register_liveness_routes(app, monitor):
+    """Register /health/live for restarts and /health/ready for load balancer routing"""
+    app.add_url_rule('/health/live', 'liveness_check', lambda: make_response(monitor.liveness()), methods=['GET'])
+    app.add_url_rule('/health/ready', 'readiness_check', lambda: make_response(monitor.readiness()), methods=['GET'])
+
+def register_health_routes(app, monitor, db_names):
+    """Register /<db_name>_health for the given databases as one URL rule, however many there are"""
+    db_names = frozenset(db_names)
+    
+    def database_health_check(db_name):
+        if db_name not in db_names:
+            abort(404)
+        return make_response(monitor.health(db_name))
+    
+    app.add_url_rule('/<db_name>_health', 'database_health_check', database_health_check, methods=['GET'])
+
+def register_replication_route(app, monitor, primary, standby, rule='/replication'):
+    """Register a Data Guard lag check of a primary/standby pair"""
+    app.add_url_rule(rule, 'replication_check', lambda: make_response(monitor.replication(primary, standby)),
+                     methods=['GET'])
@@ -0,0 +1,60 @@
+"""
+Framework-neutral HTTP helpers: ETags over response payloads and content
+negotiation for compression. Used by the Flask and FastAPI adapters.
+"""
+import gzip
+import hashlib
+import json
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, responses fall back to gzip
+    brotli = None
+
+# Fields that change on every call and are left out of ETag computation
+VOLATILE_RESPONSE_FIELDS = ('timestamp', 'response_time_ms', 'anomaly_score', 'baseline_ms')
+
+def payload_etag(payload):
+    """Return a weak ETag value over the non-volatile fields of a response payload"""
+    stable = {key: value for key, value in payload.items() if key not in VOLATILE_RESPONSE_FIELDS}
+    digest = hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an ETag against an If-None-Match header value"""
+    if not if_none_match:
+        return False
+    
+    bare = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or (candidate[2:] if candidate.startswith('W/') else candidate) == bare:
+            return True
+    return False
+
+def negotiate_encoding(accept_encoding):
+    """Pick the best supported content coding from an Accept-Encoding header, or None"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+    
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+def compress(data, encoding):
+    """Compress a response body with the negotiated content coding"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
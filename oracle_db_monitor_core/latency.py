@@ -0,0 +1,61 @@
+"""
+Online latency statistics: an exponentially weighted moving mean and variance,
+updated in O(1) per sample without storing the series, and an anomaly detector
+that scores each sample against that baseline.
+"""
+import math
+
+class EwmaStats:
+    """Exponentially weighted mean and variance of a stream of latencies"""
+    
+    def __init__(self, alpha=0.2):
+        # Weight of the newest sample; 0.2 roughly averages the last 9 samples
+        self.alpha = alpha
+        self.mean = None
+        self.variance = 0.0
+        self.count = 0
+    
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+    
+    def update(self, value):
+        """Fold a new sample into the mean and variance"""
+        if self.mean is None:
+            self.mean = float(value)
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+class AnomalyDetector:
+    """Scores latencies against an EWMA baseline and flags those far above it"""
+    
+    def __init__(self, threshold=3.0, min_ms=10, alpha=0.2, warmup=3):
+        # Anomalous means more than threshold deviations and at least min_ms above the mean
+        self.threshold = threshold
+        self.min_ms = min_ms
+        self.warmup = warmup
+        self.stats = EwmaStats(alpha)
+    
+    def score(self, value):
+        """Deviations between value and the baseline mean, positive when slower"""
+        if self.stats.mean is None:
+            return 0.0
+        # Flooring the deviation keeps sub-millisecond jitter from scoring huge
+        scale = max(self.stats.stddev, self.min_ms / self.threshold)
+        return (value - self.stats.mean) / scale
+    
+    def observe(self, value):
+        """Score a sample, fold it into the baseline and return (score, anomalous)"""
+        stats = self.stats
+        score = self.score(value)
+        anomalous = stats.count >= self.warmup and score > self.threshold
+        if anomalous:
+            # Clip anomalies so one outlier does not inflate the variance for minutes;
+            # a lasting slowdown still moves the mean up a step per sample
+            value = stats.mean + self.threshold * max(stats.stddev, self.min_ms / self.threshold)
+        stats.update(value)
+        return score, anomalous
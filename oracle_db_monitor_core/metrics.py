@@ -0,0 +1,85 @@
+"""
+Self-instrumentation of the monitor: probe counts and latencies, sessions opened
+and cache efficiency, exposed by the apps on /stats.
+"""
+import collections
+import threading
+import time
+
+class MonitorMetrics:
+    """Thread-safe counters and latency summaries for probes, connections and caches"""
+    
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._probes = collections.defaultdict(lambda: {
+            'count': 0, 'failures': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': None,
+        })
+        self._sessions_opened = collections.Counter()
+        self._connections_acquired = collections.Counter()
+        self._cache = collections.defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self._exports = collections.Counter()
+    
+    def record_probe(self, db_name, probe, elapsed_ms, ok):
+        """Count one probe execution and its latency"""
+        with self._lock:
+            stats = self._probes[(db_name, probe)]
+            stats['count'] += 1
+            stats['failures'] += 0 if ok else 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['last_ms'] = elapsed_ms
+    
+    def record_session_opened(self, db_name):
+        """Count a new database session (a pool growing or an unpooled connect)"""
+        with self._lock:
+            self._sessions_opened[db_name] += 1
+    
+    def record_connection_acquired(self, db_name):
+        """Count a connection handed to a probe, whether new or reused from a pool"""
+        with self._lock:
+            self._connections_acquired[db_name] += 1
+    
+    def record_cache(self, name, hit):
+        """Count a cache lookup"""
+        with self._lock:
+            self._cache[name]['hits' if hit else 'misses'] += 1
+    
+    def record_export(self, outcome, count=1):
+        """Count samples pushed to the export sink: sent, dropped (queue full) or failed"""
+        with self._lock:
+            self._exports[outcome] += count
+    
+    def sessions_opened(self, db_name=None):
+        """Return the number of sessions opened for one database, or for all of them"""
+        with self._lock:
+            if db_name is None:
+                return sum(self._sessions_opened.values())
+            return self._sessions_opened[db_name]
+    
+    def snapshot(self):
+        """Return all counters as a JSON-serializable dictionary"""
+        with self._lock:
+            probes = {}
+            for (db_name, probe), stats in self._probes.items():
+                probes.setdefault(db_name, {})[probe] = {
+                    'count': stats['count'],
+                    'failures': stats['failures'],
+                    'avg_ms': round(stats['total_ms'] / stats['count'], 1) if stats['count'] else None,
+                    'max_ms': round(stats['max_ms'], 1),
+                    'last_ms': stats['last_ms'],
+                }
+            
+            return {
+                'uptime_seconds': round(time.time() - self.started_at),
+                'probes': probes,
+                'sessions_opened': dict(self._sessions_opened),
+                'connections_acquired': dict(self._connections_acquired),
+                # Share of acquisitions served by an existing session instead of a new logon
+                'session_reuse_rate': {
+                    db_name: round(1 - self._sessions_opened[db_name] / acquired, 4)
+                    for db_name, acquired in self._connections_acquired.items()
+                },
+                'caches': {name: dict(counts) for name, counts in self._cache.items()},
+                'exports': dict(self._exports),
+            }
@@ -0,0 +1,451 @@
+"""
+The Monitor ties configuration, pools, probes, caches and metrics together.
+
+Its methods return framework-neutral ProbeResult tuples; the Flask and FastAPI
+adapters only turn them into HTTP responses.
+"""
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import datetime
+import os
+import threading
+import time
+
+from . import probes, requestlog
+from .cache import CounterSnapshots, QueryResultCache, TTLCache
+from .config import DEFAULT_DATABASE, database_identifier, load_settings
+from .connection import READ_ONLY_CLASS_SUFFIX, ConnectionManager
+from .driver import driver_info
+from .httputil import payload_etag
+from .latency import AnomalyDetector
+from .metrics import MonitorMetrics
+from .sqlguard import validate_read_only_query
+
+# JSON payload, HTTP status code and extra response headers
+ProbeResult = collections.namedtuple('ProbeResult', ['payload', 'status_code', 'headers'], defaults=(None,))
+
+# Health checks folded into a database's latency baseline before it can report DEGRADED
+ANOMALY_WARMUP_SAMPLES = 10
+
+class Monitor:
+    """Runs probes against the configured databases with pooling, caching and instrumentation"""
+    
+    def __init__(self, configs, settings=None):
+        self.configs = configs
+        self.settings = settings or load_settings()
+        self.metrics = MonitorMetrics()
+        self.connections = ConnectionManager(configs, self.settings, self.metrics)
+        self.probe_cache = TTLCache()
+        self.result_cache = QueryResultCache(self.settings['custom_result_cache_max_bytes'])
+        self.counter_snapshots = CounterSnapshots()
+        # Per-database health latency baselines; HEALTH_ANOMALY_ZSCORE=0 disables them
+        self.latency_baselines = {}
+        if self.settings['anomaly_zscore'] > 0:
+            self.latency_baselines = {
+                db_name: AnomalyDetector(self.settings['anomaly_zscore'], self.settings['anomaly_min_ms'],
+                                         self.settings['anomaly_alpha'], ANOMALY_WARMUP_SAMPLES)
+                for db_name in configs
+            }
+        self._baseline_lock = threading.Lock()
+        # Last observed Data Guard role per database, so each side runs only its own query
+        self._roles = {}
+        # Warm-up state per database, filled by start_warm_up()
+        self._warm_up = {}
+        self._warm_up_lock = threading.Lock()
+    
+    def identifier(self, db_name):
+        """Return the host:port/service string of a database"""
+        return database_identifier(self.configs[db_name])
+    
+    def envelope(self, db_name, status, start_time, error=None, **fields):
+        """Build the response envelope shared by all endpoints"""
+        payload = {"status": status, "database": self.identifier(db_name)}
+        if db_name != DEFAULT_DATABASE:
+            payload["database_name"] = db_name
+        if error is not None:
+            payload["error"] = error
+        payload["response_time_ms"] = round((time.time() - start_time) * 1000)
+        payload["timestamp"] = datetime.datetime.now().isoformat()
+        payload.update(fields)
+        return payload
+    
+    def _timed(self, db_name, probe_name, probe, **connection_args):
+        """Run a probe on a pooled connection, recording its latency and outcome"""
+        start = time.perf_counter()
+        acquired = None
+        error = None
+        try:
+            with self.connections.connection(db_name, **connection_args) as connection:
+                acquired = time.perf_counter()
+                return probe(connection)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            end = time.perf_counter()
+            self.metrics.record_probe(db_name, probe_name, (end - start) * 1000, error is None)
+            # Session acquisition and the probe itself are logged separately, so slow pools stand out
+            acquire_ms = round(((acquired or end) - start) * 1000, 2)
+            probe_ms = round((end - acquired) * 1000, 2) if acquired else None
+            requestlog.record_probe(db_name, probe_name, acquire_ms, probe_ms, error)
+    
+    def check_health(self, db_name=DEFAULT_DATABASE):
+        """Run the health check and return the sample (status is UP, DEGRADED or DOWN, error may be None)"""
+        start_time = time.time()
+        try:
+            self._timed(db_name, 'health', probes.probe_health)
+            sample = self.envelope(db_name, "UP", start_time)
+            self._score_latency(db_name, sample)
+            sample["error"] = None
+            return sample
+        except Exception as e:
+            # If any error occurs, the database is considered down
+            return self.envelope(db_name, "DOWN", start_time, error=str(e))
+    
+    def health(self, db_name=DEFAULT_DATABASE):
+        """Health check endpoint: 200 when the database is up, 503 otherwise"""
+        payload = self.check_health(db_name)
+        if payload["error"] is None:
+            del payload["error"]
+        # A degraded database still answers, so only DOWN fails the check
+        return self._result(payload, 503 if payload["status"] == "DOWN" else 200)
+    
+    def _score_latency(self, db_name, sample):
+        """Compare a successful check with the database's latency baseline, marking outliers DEGRADED"""
+        detector = self.latency_baselines.get(db_name)
+        if detector is None:
+            return
+        response_time = sample["response_time_ms"]
+        with self._baseline_lock:
+            baseline = detector.stats.mean
+            score, anomalous = detector.observe(response_time)
+        if anomalous:
+            sample["status"] = "DEGRADED"
+        sample["anomaly_score"] = round(score, 2)
+        sample["baseline_ms"] = round(response_time if baseline is None else baseline, 1)
+    
+    def _cached_probe(self, db_name, probe_name, probe, ttl=None):
+        """Run a detail probe, serving it from the probe cache when PROBE_CACHE_TTL (or ttl) allows"""
+        start_time = time.time()
+        ttl = self.settings['probe_cache_ttl'] if ttl is None else ttl
+        
+        try:
+            if ttl > 0:
+                # Single flight: concurrent misses share one database round trip
+                fields, hit = self.probe_cache.get_or_compute((db_name, probe_name), ttl,
+                                                              lambda: self._timed(db_name, probe_name, probe))
+                self.metrics.record_cache('probes', hit)
+            else:
+                fields = self._timed(db_name, probe_name, probe)
+            
+            return self._result(self.envelope(db_name, "SUCCESS", start_time, **fields), 200)
+        
+        except Exception as e:
+            return self._result(self.envelope(db_name, "ERROR", start_time, error=str(e)), 500)
+    
+    def database_metrics(self, db_name=DEFAULT_DATABASE):
+        return self._cached_probe(db_name, 'metrics', probes.probe_metrics)
+    
+    def tablespace_usage(self, db_name=DEFAULT_DATABASE):
+        return self._cached_probe(db_name, 'tablespace', probes.probe_tablespaces)
+    
+    def active_sessions(self, db_name=DEFAULT_DATABASE):
+        return self._cached_probe(db_name, 'sessions', probes.probe_sessions)
+    
+    def session_summary(self, db_name=DEFAULT_DATABASE):
+        """Aggregated session counts and blocking chains, for alert rules that do not need the full list"""
+        settings = self.settings
+        return self._cached_probe(
+            db_name, 'session_summary',
+            lambda connection: probes.probe_session_summary(connection, settings['session_blocked_threshold'],
+                                                            settings['session_summary_top_n'])
+        )
+    
+    def lock_tree(self, db_name=DEFAULT_DATABASE):
+        """Blocker/waiter tree, refreshed from the database at most once per LOCK_TREE_TTL"""
+        settings = self.settings
+        return self._cached_probe(db_name, 'locks', probes.probe_lock_tree,
+                                  ttl=max(settings['lock_tree_ttl'], settings['probe_cache_ttl']))
+    
+    def drcp_stats(self, db_name=DEFAULT_DATABASE):
+        """DRCP pool statistics; needs SELECT on V$CPOOL_STATS and V$CPOOL_CC_STATS"""
+        start_time = time.time()
+        config = self.configs[db_name]
+        if not config['drcp']:
+            return self._result(self.envelope(db_name, "ERROR", start_time,
+                                              error="DRCP is not enabled for this database"), 404)
+        cclass = config['drcp_connection_class']
+        return self._cached_probe(db_name, 'drcp',
+                                  lambda connection: probes.probe_drcp(connection, cclass, cclass + READ_ONLY_CLASS_SUFFIX))
+    
+    def performance(self, db_name=DEFAULT_DATABASE):
+        """Wait classes, load and top SQL, sampled from the database at most once per PERFORMANCE_MIN_INTERVAL"""
+        settings = self.settings
+        return self._cached_probe(
+            db_name, 'performance',
+            lambda connection: probes.probe_performance(connection, settings['performance_top_n'],
+                                                        settings['performance_window_minutes']),
+            ttl=max(settings['performance_min_interval'], settings['probe_cache_ttl'])
+        )
+    
+    def sysstat(self, db_name=DEFAULT_DATABASE):
+        """
+        Per-second rates of the SYSSTAT_COUNTERS between the last two snapshots. Snapshots
+        are taken by requests, so the window (interval_seconds) is at least SYSSTAT_INTERVAL
+        but grows when /sysstat is polled less often
+        """
+        start_time = time.time()
+        settings = self.settings
+        
+        def take_snapshot():
+            return self._timed(db_name, 'sysstat',
+                               lambda connection: probes.read_sysstat(connection, settings['sysstat_counters']))
+        
+        try:
+            previous, latest = self.counter_snapshots.get(db_name, settings['sysstat_interval'], take_snapshot)
+            age = time.monotonic() - latest['taken_at']
+            sysstat = {"counters": latest['values'], "snapshot_age_seconds": round(age, 1)}
+            # The first snapshot only sets the baseline for the next one
+            if previous is None:
+                sysstat.update(interval_seconds=None, rates_per_second=None)
+            else:
+                sysstat.update(interval_seconds=round(latest['taken_at'] - previous['taken_at'], 1),
+                               rates_per_second=CounterSnapshots.rates(previous, latest))
+            return self._result(self.envelope(db_name, "SUCCESS", start_time, sysstat=sysstat), 200)
+        
+        except Exception as e:
+            return self._result(self.envelope(db_name, "ERROR", start_time, error=str(e)), 500)
+    
+    def _replication_side(self, db_name, expected_role):
+        """Probe one side of a Data Guard pair, choosing the query by the role it had last time"""
+        standby = self._roles.get(db_name, expected_role) != 'PRIMARY'
+        try:
+            side = self._timed(db_name, 'replication', lambda connection: probes.probe_replication(connection, standby))
+        except Exception as e:
+            return {"status": "DOWN", "database": self.identifier(db_name), "error": str(e)}
+        
+        # After a switchover the role differs; the next check runs the other query
+        self._roles[db_name] = 'PRIMARY' if side["role"] == 'PRIMARY' else 'STANDBY'
+        return dict(status="UP", database=self.identifier(db_name), **side)
+    
+    def replication(self, primary, standby):
+        """Data Guard check of a primary/standby pair, probing both sides concurrently"""
+        start_time = time.time()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            # Each side runs in a copy of the request context, so its probe is logged with the request
+            first = executor.submit(contextvars.copy_context().run, self._replication_side, primary, 'PRIMARY')
+            second = executor.submit(contextvars.copy_context().run, self._replication_side, standby, 'STANDBY')
+            sides = [first.result(), second.result()]
+        
+        # Identify the sides by their current role rather than their configured one
+        up = [side for side in sides if side["status"] == "UP"]
+        primary_side = next((side for side in up if side["role"] == 'PRIMARY'), None)
+        standby_side = next((side for side in up if side is not primary_side), None)
+        max_lag = self.settings['replication_max_lag']
+        fields = {"primary": primary_side, "standby": standby_side, "max_lag_seconds": max_lag}
+        
+        if primary_side is None:
+            status, error = "DOWN", "No reachable database is in the PRIMARY role"
+        elif standby_side is None:
+            status, error = "DEGRADED", "The standby database is unreachable"
+        else:
+            status, error = "UP", None
+            fields["scn_gap"] = primary_side["current_scn"] - standby_side["current_scn"]
+            if "apply_lag_seconds" not in standby_side:
+                # Roles just changed, so the standby ran the primary query
+                fields["warning"] = "Roles changed since the last check; lag is reported from the next check on"
+            else:
+                fields["transport_lag_seconds"] = standby_side["transport_lag_seconds"]
+                fields["apply_lag_seconds"] = standby_side["apply_lag_seconds"]
+                lags = [fields["transport_lag_seconds"], fields["apply_lag_seconds"]]
+                if None in lags:
+                    status, error = "DEGRADED", "Lag is not being computed (redo transport or apply stopped?)"
+                elif max(lags) > max_lag:
+                    status, error = "DEGRADED", f"Standby lags {max(lags):.0f} seconds behind the primary"
+        
+        # Unreachable sides are reported with their error
+        down = [side for side in sides if side["status"] != "UP"]
+        if down:
+            fields["unreachable"] = down
+        payload = self.envelope(primary, status, start_time, error=error, **fields)
+        return self._result(payload, 503 if status == "DOWN" else 200)
+    
+    def custom_query(self, query, db_name=DEFAULT_DATABASE, binds=None, timeout_ms=None, max_age=0,
+                     cancel_guard=None):
+        """Run a validated read-only query, optionally served from the result cache"""
+        start_time = time.time()
+        settings = self.settings
+        
+        def request_error(message, status_code):
+            return ProbeResult({
+                "status": "ERROR",
+                "error": message,
+                "timestamp": datetime.datetime.now().isoformat()
+            }, status_code)
+        
+        if not query:
+            return request_error("No query provided", 400)
+        if not isinstance(query, str):
+            return request_error("query must be a string", 400)
+        
+        # Result caching is opt-in: clients pass the maximum acceptable age in seconds
+        try:
+            max_age = int(max_age or 0)
+            timeout_ms = int(timeout_ms or settings['custom_call_timeout_ms'])
+        except (TypeError, ValueError):
+            return request_error("cache_max_age and timeout_ms must be integers", 400)
+        timeout_ms = max(1, min(timeout_ms, settings['custom_max_call_timeout_ms']))
+        
+        # Bind variables are passed by name, e.g. {"status": "PENDING"} for :status
+        binds = binds or {}
+        if not isinstance(binds, dict) or not all(
+                value is None or isinstance(value, (str, int, float)) for value in binds.values()):
+            return request_error("binds must be an object mapping names to string, number or null values", 400)
+        
+        # Check if query is read-only; verdicts are cached per query text
+        query = query.strip()
+        rejection = validate_read_only_query(query)
+        if rejection:
+            return request_error(rejection, 403)
+        
+        try:
+            cache_entry = None
+            cache_hit = False
+            
+            if max_age > 0:
+                cache_key = QueryResultCache.make_key(self.identifier(db_name), query, binds)
+                cache_entry = self.result_cache.get(cache_key, max_age)
+                cache_hit = cache_entry is not None
+                self.metrics.record_cache('custom', cache_hit)
+            
+            if cache_entry is None:
+                def probe(connection):
+                    with (cancel_guard or _no_cancel_guard)(connection):
+                        return probes.run_read_only_query(connection, query, binds)
+                
+                results = self._timed(db_name, 'custom', probe, read_only=True, call_timeout_ms=timeout_ms)
+                if max_age > 0:
+                    cache_entry = self.result_cache.put(cache_key, results)
+            else:
+                results = cache_entry['results']
+            
+            if cache_entry is None:
+                payload = self.envelope(db_name, "SUCCESS", start_time, row_count=len(results), results=results)
+                return ProbeResult(payload, 200, {'Cache-Control': 'no-store'})
+            
+            # Let clients and downstream proxies reuse the result for the rest of its lifetime
+            age = int(time.monotonic() - cache_entry['stored_at'])
+            payload = self.envelope(db_name, "SUCCESS", start_time, row_count=len(results),
+                                    cache={"hit": cache_hit, "age_seconds": age}, results=results)
+            return ProbeResult(payload, 200, {
+                'ETag': f'W/"{cache_entry["etag"]}"',
+                'Cache-Control': f"max-age={max(max_age - age, 0)}",
+                'Age': str(age),
+            })
+        
+        except Exception as e:
+            return ProbeResult(self.envelope(db_name, "ERROR", start_time, error=str(e)), 500)
+    
+    def start_warm_up(self, db_names=None):
+        """Open each database's pool to its minimum size and run a first probe, in background threads.
+        
+        New workers otherwise answer their first requests with cold sessions and
+        inflated latency. Databases already warming up are skipped; WARM_UP=false
+        and connect-per-check mode (nothing to keep warm) turn this off.
+        """
+        if not self.warm_up_enabled():
+            return
+        for db_name in db_names or self.configs:
+            with self._warm_up_lock:
+                if db_name in self._warm_up:
+                    continue
+                self._warm_up[db_name] = {"ready": False}
+            threading.Thread(target=self._warm_up_database, args=(db_name,), name=f"warm-up-{db_name}",
+                             daemon=True).start()
+    
+    def _warm_up_database(self, db_name):
+        start = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                with contextlib.ExitStack() as sessions:
+                    # Holding DB_POOL_MIN sessions at once makes the pool open all of them
+                    for _ in range(self.settings['pool_min'] - 1):
+                        sessions.enter_context(self.connections.connection(db_name))
+                    self._timed(db_name, 'warm_up', probes.probe_health)
+                break
+            except Exception as e:
+                # The first attempt ends the warm-up either way; an unreachable database
+                # is reported by /health, and its pool is opened once it can be reached
+                state = {
+                    "ready": True,
+                    "attempts": attempts,
+                    "error": str(e),
+                    "warm_up_ms": round((time.perf_counter() - start) * 1000, 1),
+                }
+                with self._warm_up_lock:
+                    self._warm_up[db_name] = state
+                time.sleep(self.settings['warm_up_retry_interval'])
+        
+        state = {
+            "ready": True,
+            "attempts": attempts,
+            "sessions": self.connections.pool(db_name).opened,
+            "warm_up_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        with self._warm_up_lock:
+            self._warm_up[db_name] = state
+    
+    def warm_up_enabled(self):
+        return self.settings['warm_up'] and self.settings['pool_enabled']
+    
+    def warm_up_status(self):
+        """Warm-up state per database: ready, attempts, warm_up_ms and the error of the last failed attempt"""
+        with self._warm_up_lock:
+            return {db_name: dict(state) for db_name, state in self._warm_up.items()}
+    
+    def liveness(self):
+        """Whether this process can serve requests; O(1) and never touches a database"""
+        payload = {
+            "status": "ALIVE",
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.metrics.started_at),
+        }
+        return ProbeResult(payload, 200, {'Cache-Control': 'no-store'})
+    
+    def readiness(self):
+        """Whether this worker has warmed up: 503 until every pool is open and has run a first check.
+        
+        A database that is down does not make the worker unready: its first attempt
+        ends the warm-up with an error, /health reports it, and the pool is opened
+        in the background once it can be reached. No database is queried here.
+        """
+        if not self.warm_up_enabled():
+            databases = {}
+        else:
+            status = self.warm_up_status()
+            databases = {db_name: status.get(db_name, {"ready": False}) for db_name in self.configs}
+        
+        ready = all(state["ready"] for state in databases.values())
+        payload = {"status": "READY" if ready else "WARMING_UP", "databases": databases}
+        return ProbeResult(payload, 200 if ready else 503, {'Cache-Control': 'no-store'})
+    
+    def stats(self):
+        """Monitor self-instrumentation for the /stats endpoint"""
+        payload = self.metrics.snapshot()
+        payload['driver'] = driver_info()
+        payload['warm_up'] = self.warm_up_status()
+        return ProbeResult(payload, 200, {'Cache-Control': 'no-store'})
+    
+    def _result(self, payload, status_code):
+        """Wrap a probe payload, adding a content ETag to successful responses"""
+        if status_code != 200:
+            return ProbeResult(payload, status_code)
+        # Pollers must revalidate every time, otherwise browsers show stale timestamps
+        return ProbeResult(payload, status_code, {'ETag': payload_etag(payload), 'Cache-Control': 'no-cache'})
+
+def _no_cancel_guard(connection):
+    return contextlib.nullcontext()
@@ -0,0 +1,502 @@
+"""
+Probe queries run against a monitored database.
+
+Each probe takes an open connection and returns the fields it contributes to
+the response envelope; timing, error handling and caching live in Monitor.
+"""
+import datetime
+import re
+
+HEALTH_QUERY = "SELECT 1 FROM DUAL"
+
+VERSION_QUERY = "SELECT BANNER FROM V$VERSION WHERE ROWNUM = 1"
+
+INSTANCE_QUERY = "SELECT INSTANCE_NAME, STATUS, DATABASE_STATUS, STARTUP_TIME FROM V$INSTANCE"
+
+TABLESPACE_QUERY = """
+SELECT
+    df.tablespace_name "Tablespace",
+    df.bytes / (1024 * 1024) "Size (MB)",
+    SUM(fs.bytes) / (1024 * 1024) "Free (MB)",
+    df.bytes / (1024 * 1024) - SUM(fs.bytes) / (1024 * 1024) "Used (MB)",
+    ROUND((df.bytes - SUM(fs.bytes)) / df.bytes * 100, 2) "Used %"
+FROM
+    dba_free_space fs,
+    (SELECT tablespace_name, SUM(bytes) bytes FROM dba_data_files GROUP BY tablespace_name) df
+WHERE
+    fs.tablespace_name (+) = df.tablespace_name
+GROUP BY
+    df.tablespace_name, df.bytes
+ORDER BY
+    df.tablespace_name
+"""
+
+SESSIONS_QUERY = """
+SELECT
+    s.sid,
+    s.serial#,
+    s.username,
+    s.status,
+    s.machine,
+    s.program,
+    s.logon_time,
+    s.last_call_et "Seconds Since Last Call"
+FROM
+    v$session s
+WHERE
+    s.type = 'USER'
+ORDER BY
+    s.status, s.last_call_et DESC
+"""
+
+# Session counts aggregated server-side in one pass: per username/program (GROUPING_ID 1),
+# per machine (6) and overall (7)
+SESSION_SUMMARY_QUERY = """
+SELECT
+    GROUPING_ID(username, program, machine),
+    username,
+    program,
+    machine,
+    COUNT(*),
+    COUNT(CASE WHEN status = 'ACTIVE' THEN 1 END),
+    MAX(CASE WHEN status = 'ACTIVE' THEN last_call_et END)
+FROM
+    v$session
+WHERE
+    type = 'USER'
+GROUP BY
+    GROUPING SETS ((username, program), (machine), ())
+"""
+
+# Only blocked sessions, usually few; chains are resolved in Python
+BLOCKED_SESSIONS_QUERY = """
+SELECT
+    sid,
+    blocking_session,
+    ROUND(wait_time_micro / 1e6, 1)
+FROM
+    v$session
+WHERE
+    blocking_session IS NOT NULL
+"""
+
+# Every blocked session and every session blocking one, with the locks it waits for or
+# holds that block others, and the object a waiter is stuck on
+LOCK_TREE_QUERY = """
+SELECT
+    s.sid,
+    s.serial#,
+    s.username,
+    s.program,
+    s.machine,
+    s.status,
+    s.sql_id,
+    s.event,
+    s.blocking_session,
+    ROUND(s.wait_time_micro / 1e6, 1),
+    s.last_call_et,
+    l.type,
+    l.lmode,
+    l.request,
+    CASE WHEN o.object_id IS NOT NULL THEN o.owner || '.' || o.object_name END
+FROM
+    v$session s
+    LEFT JOIN v$lock l ON l.sid = s.sid AND (l.block = 1 OR l.request > 0)
+    LEFT JOIN dba_objects o ON o.object_id = s.row_wait_obj# AND s.blocking_session IS NOT NULL
+WHERE
+    s.blocking_session IS NOT NULL
+    OR s.sid IN (SELECT blocking_session FROM v$session WHERE blocking_session IS NOT NULL)
+"""
+
+# V$LOCK LMODE / REQUEST values
+LOCK_MODES = {0: None, 1: 'null', 2: 'row share', 3: 'row exclusive', 4: 'share',
+              5: 'share row exclusive', 6: 'exclusive'}
+
+DRCP_POOL_QUERY = """
+SELECT
+    num_open_servers,
+    num_busy_servers,
+    num_requests,
+    num_hits,
+    num_misses,
+    num_waits
+FROM
+    v$cpool_stats
+"""
+
+# Connection class names are reported as <user>.<cclass>
+DRCP_CLASS_QUERY = """
+SELECT
+    cclass_name,
+    num_requests,
+    num_hits,
+    num_misses,
+    num_waits
+FROM
+    v$cpool_cc_stats
+WHERE
+    SUBSTR(cclass_name, INSTR(cclass_name, '.') + 1) IN (:cclass, :read_only_cclass)
+"""
+
+# Non-idle wait classes over the last 60-second metric interval, busiest first;
+# time waited / interval length is the average number of sessions waiting
+WAIT_CLASS_QUERY = """
+SELECT
+    n.wait_class "Wait Class",
+    ROUND(m.time_waited / m.intsize_csec, 3) "Average Active Sessions",
+    m.wait_count "Waits",
+    ROUND(m.dbtime_in_wait, 2) "% DB Time"
+FROM
+    v$waitclassmetric m
+    JOIN v$system_wait_class n ON n.wait_class_id = m.wait_class_id
+WHERE
+    n.wait_class <> 'Idle'
+ORDER BY
+    m.time_waited DESC
+FETCH FIRST :top_n ROWS ONLY
+"""
+
+# Load metrics of the last 60-second interval (group 2) from the in-memory metric history
+LOAD_QUERY = """
+SELECT
+    metric_name,
+    value
+FROM
+    v$sysmetric
+WHERE
+    group_id = 2
+    AND metric_name IN ('Average Active Sessions', 'Database Time Per Sec', 'CPU Usage Per Sec',
+                        'Executions Per Sec', 'User Transaction Per Sec')
+"""
+
+LOAD_METRICS = {
+    'Average Active Sessions': 'average_active_sessions',
+    'Database Time Per Sec': 'db_time_cs_per_sec',
+    'CPU Usage Per Sec': 'cpu_cs_per_sec',
+    'Executions Per Sec': 'executions_per_sec',
+    'User Transaction Per Sec': 'transactions_per_sec',
+}
+
+# V$SQLSTATS is the latch-free copy of V$SQL's statistics; only statements active in
+# the window are considered, ranked by their cumulative elapsed time
+TOP_SQL_QUERY = """
+SELECT
+    sql_id "SQL ID",
+    plan_hash_value "Plan Hash",
+    executions "Executions",
+    ROUND(elapsed_time / 1e6, 3) "Elapsed (s)",
+    ROUND(cpu_time / 1e6, 3) "CPU (s)",
+    ROUND(elapsed_time / 1e3 / NULLIF(executions, 0), 3) "Elapsed per Execution (ms)",
+    buffer_gets "Buffer Gets",
+    SUBSTR(sql_text, 1, 200) "SQL Text"
+FROM
+    v$sqlstats
+WHERE
+    last_active_time >= SYSDATE - :window_minutes / 1440
+ORDER BY
+    elapsed_time DESC
+FETCH FIRST :top_n ROWS ONLY
+"""
+
+# Cumulative counters since instance startup; one bind per counter name
+SYSSTAT_QUERY = """
+SELECT
+    name,
+    value
+FROM
+    v$sysstat
+WHERE
+    name IN ({names})
+"""
+
+# Data Guard: both sides report role, SCN and open mode; a standby adds its lags
+# (intervals like '+00 00:00:05'), so each side costs one round trip
+PRIMARY_REPLICATION_QUERY = """
+SELECT
+    database_role,
+    db_unique_name,
+    current_scn,
+    open_mode
+FROM
+    v$database
+"""
+
+STANDBY_REPLICATION_QUERY = """
+SELECT
+    d.database_role,
+    d.db_unique_name,
+    d.current_scn,
+    d.open_mode,
+    (SELECT value FROM v$dataguard_stats WHERE name = 'transport lag'),
+    (SELECT value FROM v$dataguard_stats WHERE name = 'apply lag')
+FROM
+    v$database d
+"""
+
+INTERVAL_PATTERN = re.compile(r'([+-])?(\d+) (\d+):(\d+):(\d+(?:\.\d+)?)')
+
+def rows_as_dicts(cursor):
+    """Fetch the remaining rows of an executed cursor as dictionaries keyed by column name"""
+    columns = [col[0] for col in cursor.description]
+    rows = []
+    
+    for row in cursor:
+        # Convert datetime objects to strings for JSON serialization
+        row_data = list(row)
+        for i, val in enumerate(row_data):
+            if isinstance(val, datetime.datetime):
+                row_data[i] = val.isoformat()
+        
+        rows.append(dict(zip(columns, row_data)))
+    
+    return rows
+
+def probe_health(connection):
+    """Verify the connection works with a trivial query"""
+    with connection.cursor() as cursor:
+        cursor.execute(HEALTH_QUERY)
+        cursor.fetchone()
+    return {}
+
+def probe_metrics(connection):
+    """Database version, instance status and uptime"""
+    metrics = {}
+    
+    with connection.cursor() as cursor:
+        # Get database version
+        cursor.execute(VERSION_QUERY)
+        version = cursor.fetchone()
+        metrics["version"] = version[0] if version else "Unknown"
+        
+        # Get instance status and startup time in a single round trip
+        cursor.execute(INSTANCE_QUERY)
+        instance = cursor.fetchone()
+        if instance:
+            metrics["instance_name"] = instance[0]
+            metrics["instance_status"] = instance[1]
+            metrics["database_status"] = instance[2]
+            metrics["startup_time"] = instance[3].strftime("%Y-%m-%d %H:%M:%S")
+    
+    return {"metrics": metrics}
+
+def probe_tablespaces(connection):
+    """Size, free and used space per tablespace"""
+    with connection.cursor() as cursor:
+        cursor.execute(TABLESPACE_QUERY)
+        return {"tablespaces": rows_as_dicts(cursor)}
+
+def probe_sessions(connection):
+    """User sessions, most recently active first within each status"""
+    with connection.cursor() as cursor:
+        cursor.execute(SESSIONS_QUERY)
+        sessions = rows_as_dicts(cursor)
+    return {"active_sessions_count": len(sessions), "sessions": sessions}
+
+def blocking_chains(blocked):
+    """Group (sid, blocking_session, wait_seconds) rows by the root blocker at the head of each chain"""
+    blocker_of = {sid: blocker for sid, blocker, _ in blocked}
+    roots = {}
+    
+    def root_of(sid):
+        # Walk up to the first blocker that is not blocked itself, remembering every
+        # session on the way; a deadlock cycle ends at the session seen twice
+        path = []
+        while sid in blocker_of and sid not in roots and sid not in path:
+            path.append(sid)
+            sid = blocker_of[sid]
+        root, depth = roots.get(sid, (sid, 0))
+        for offset, member in enumerate(reversed(path), start=1):
+            roots[member] = (root, depth + offset)
+        return roots[path[0]] if path else (root, depth)
+    
+    chains = {}
+    for sid, _, wait_seconds in blocked:
+        root, depth = root_of(sid)
+        chain = chains.setdefault(root, {"root_sid": root, "blocked": 0, "depth": 0, "max_wait_seconds": 0})
+        chain["blocked"] += 1
+        chain["depth"] = max(chain["depth"], depth)
+        chain["max_wait_seconds"] = max(chain["max_wait_seconds"], wait_seconds or 0)
+    return sorted(chains.values(), key=lambda chain: (-chain["blocked"], -chain["max_wait_seconds"]))
+
+def probe_session_summary(connection, blocked_threshold_seconds, top_n):
+    """Session counts by username/program and machine, and blocking chains, without the session list"""
+    with connection.cursor() as cursor:
+        cursor.execute(SESSION_SUMMARY_QUERY)
+        groups = cursor.fetchall()
+        cursor.execute(BLOCKED_SESSIONS_QUERY)
+        blocked = cursor.fetchall()
+    
+    summary = {"total": 0, "active": 0, "max_active_seconds": None}
+    by_user_program = []
+    by_machine = []
+    for grouping, username, program, machine, total, active, max_active_seconds in groups:
+        if grouping == 1:
+            by_user_program.append({"username": username, "program": program, "total": total,
+                                    "active": active, "max_active_seconds": max_active_seconds})
+        elif grouping == 6:
+            by_machine.append({"machine": machine, "total": total, "active": active})
+        else:
+            summary.update(total=total, active=active, max_active_seconds=max_active_seconds)
+    
+    def busiest(rows):
+        return sorted(rows, key=lambda row: (-row["active"], -row["total"]))[:top_n]
+    
+    chains = blocking_chains(blocked)
+    summary.update(
+        blocked=len(blocked),
+        blocked_threshold_seconds=blocked_threshold_seconds,
+        blocked_over_threshold=sum(1 for _, _, wait in blocked if (wait or 0) > blocked_threshold_seconds),
+        max_blocked_seconds=max((wait or 0 for _, _, wait in blocked), default=None),
+        blocking_chains=chains[:top_n],
+        by_user_program=busiest(by_user_program),
+        by_machine=busiest(by_machine),
+    )
+    return {"summary": summary}
+
+def build_lock_tree(rows):
+    """Nest lock tree rows (one per session and lock) under their root blockers"""
+    nodes = {}
+    for (sid, serial, username, program, machine, status, sql_id, event, blocker, wait_seconds, last_call_et,
+         lock_type, held, requested, waiting_on) in rows:
+        node = nodes.get(sid)
+        if node is None:
+            node = nodes[sid] = {
+                "sid": sid, "serial#": serial, "username": username, "program": program, "machine": machine,
+                "status": status, "sql_id": sql_id, "event": event, "blocking_session": blocker,
+                "wait_seconds": wait_seconds, "seconds_since_last_call": last_call_et,
+                "waiting_on": waiting_on, "locks": [], "blocked": [],
+            }
+        if lock_type is not None:
+            node["locks"].append({"type": lock_type, "held": LOCK_MODES.get(held, held),
+                                  "requested": LOCK_MODES.get(requested, requested)})
+    
+    # Parent index: attach each waiter to its blocker in one pass
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["blocking_session"])
+        if parent is None:
+            roots.append(node)
+        else:
+            parent["blocked"].append(node)
+    
+    def walk(node):
+        # Chains are short, but iterate anyway so a long one cannot hit the recursion limit
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node["blocked"])
+    
+    reachable = {node["sid"] for root in roots for node in walk(root)}
+    
+    # Sessions not reachable from a root wait on each other (a deadlock Oracle has not
+    # resolved yet), or on a session that does; cut each cycle at one session so the tree
+    # stays finite, and count only the sessions on the cycle as deadlocked
+    deadlocked = 0
+    for node in nodes.values():
+        if node["sid"] in reachable:
+            continue
+        # Every blocker of an unreachable session is unreachable too, so following them
+        # must repeat a session: the path from its first visit is the cycle
+        path, sid = [], node["sid"]
+        while sid not in path:
+            path.append(sid)
+            sid = nodes[sid]["blocking_session"]
+        deadlocked += len(path) - path.index(sid)
+        
+        head = nodes[sid]
+        siblings = nodes[head["blocking_session"]]["blocked"]
+        siblings[:] = [sibling for sibling in siblings if sibling is not head]
+        head["deadlock"] = True
+        roots.append(head)
+        reachable |= {member["sid"] for member in walk(head)}
+    
+    for root in roots:
+        root["total_blocked"] = sum(1 for _ in walk(root)) - 1
+    roots.sort(key=lambda root: -root["total_blocked"])
+    
+    waiters = sum(1 for node in nodes.values() if node["blocking_session"] is not None)
+    return roots, waiters, deadlocked
+
+def probe_lock_tree(connection):
+    """Blocker/waiter tree from V$SESSION and V$LOCK, in one query"""
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_TREE_QUERY)
+        rows = cursor.fetchall()
+    roots, waiters, deadlocked = build_lock_tree(rows)
+    return {"blocked_sessions": waiters, "deadlocked_sessions": deadlocked, "lock_tree": roots}
+
+def interval_seconds(value):
+    """Seconds in a V$DATAGUARD_STATS interval such as '+00 00:01:30', or None if not computed"""
+    match = INTERVAL_PATTERN.fullmatch((value or '').strip())
+    if not match:
+        return None
+    sign, days, hours, minutes, seconds = match.groups()
+    total = int(days) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return -total if sign == '-' else total
+
+def probe_replication(connection, standby):
+    """Data Guard role, SCN and, with standby=True, transport and apply lag of one side"""
+    with connection.cursor() as cursor:
+        cursor.execute(STANDBY_REPLICATION_QUERY if standby else PRIMARY_REPLICATION_QUERY)
+        role, unique_name, scn, open_mode, *lags = cursor.fetchone()
+    
+    side = {"role": role, "db_unique_name": unique_name, "current_scn": scn, "open_mode": open_mode}
+    if lags:
+        side["transport_lag_seconds"] = interval_seconds(lags[0])
+        side["apply_lag_seconds"] = interval_seconds(lags[1])
+    return side
+
+def run_read_only_query(connection, query, binds=None):
+    """Execute a validated ad-hoc query inside a read-only transaction"""
+    try:
+        with connection.cursor() as cursor:
+            # Second line of defence for releases without read-only sessions
+            cursor.execute("SET TRANSACTION READ ONLY")
+            # Bind variables keep the SQL text stable so Oracle can reuse the cursor
+            cursor.execute(query, binds or {})
+            return rows_as_dicts(cursor)
+    finally:
+        # End the read-only transaction before the session returns to the pool
+        connection.rollback()
+
+def probe_drcp(connection, connection_class, read_only_class):
+    """Server-side DRCP usage: pooled servers and how often the probe and /custom classes reused a session"""
+    with connection.cursor() as cursor:
+        cursor.execute(DRCP_POOL_QUERY)
+        pools = rows_as_dicts(cursor)
+        cursor.execute(DRCP_CLASS_QUERY, {"cclass": connection_class, "read_only_cclass": read_only_class})
+        classes = rows_as_dicts(cursor)
+    
+    for stats in pools + classes:
+        requests = stats["NUM_REQUESTS"]
+        stats["HIT_RATE"] = round(stats["NUM_HITS"] / requests, 4) if requests else None
+    
+    return {"drcp": {"pool": pools[0] if pools else None, "connection_classes": classes}}
+
+def probe_performance(connection, top_n, window_minutes):
+    """Top wait classes, load (AAS) and top SQL by elapsed time; needs SELECT_CATALOG_ROLE"""
+    with connection.cursor() as cursor:
+        cursor.execute(WAIT_CLASS_QUERY, {"top_n": top_n})
+        wait_classes = rows_as_dicts(cursor)
+        cursor.execute(LOAD_QUERY)
+        load = {LOAD_METRICS[name]: round(value, 3) for name, value in cursor}
+        cursor.execute(TOP_SQL_QUERY, {"window_minutes": window_minutes, "top_n": top_n})
+        top_sql = rows_as_dicts(cursor)
+    
+    return {"performance": {
+        "load": load,
+        "wait_classes": wait_classes,
+        "top_sql_window_minutes": window_minutes,
+        "top_sql": top_sql,
+    }}
+
+def read_sysstat(connection, names):
+    """Current values of the named V$SYSSTAT counters, in one round trip"""
+    if not names:
+        # "name IN ()" is not valid SQL (ORA-00936)
+        return {}
+    binds = {f"name{i}": name for i, name in enumerate(names)}
+    with connection.cursor() as cursor:
+        cursor.execute(SYSSTAT_QUERY.format(names=", ".join(f":{bind}" for bind in binds)), binds)
+        return {name: value for name, value in cursor}
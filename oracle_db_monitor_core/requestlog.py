@@ -0,0 +1,163 @@
+"""
+Structured JSON request logging that stays off the probe path.
+
+Each request gets an ID (the client's X-Request-ID or a new one) and a context
+that Monitor fills while it works: the databases and probes involved, the time
+spent acquiring a session and running each probe, and the ORA-/DPY- code of a
+failure. When the request ends one JSON line is queued; a listener thread does
+the formatting and writing, so a slow disk or pipe never delays a response.
+Successful requests are sampled with LOG_SAMPLE_RATE, failures are always logged.
+"""
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+LOGGER_NAME = 'oracle_db_monitor.requests'
+
+ERROR_CODE_PATTERN = re.compile(r'\b(ORA|DPY|DPI|TNS)-\d{4,5}\b')
+
+# Request context of the current request, shared with the threads that work on it
+_current = contextvars.ContextVar('oracle_db_monitor_request', default=None)
+
+# The RequestLog writing the shared logger's lines; a new one replaces it
+_active = None
+_active_lock = threading.Lock()
+
+def error_code(error):
+    """The ORA-/DPY- code of a driver exception, or None"""
+    details = error.args[0] if error.args else None
+    code = getattr(details, 'full_code', None)
+    if code:
+        return code
+    match = ERROR_CODE_PATTERN.search(str(error))
+    return match.group(0) if match else None
+
+def record_probe(db_name, probe, acquire_ms, probe_ms, error=None):
+    """Add a probe's timings to the current request's log line (no-op outside a logged request)"""
+    context = _current.get()
+    if context is None:
+        return
+    entry = {"database": db_name, "probe": probe, "acquire_ms": acquire_ms, "probe_ms": probe_ms}
+    if error is not None:
+        entry["error_code"] = error_code(error)
+        entry["error"] = str(error)
+        context["failed"] = True
+    # list.append is atomic, so concurrent probes of one request need no lock
+    context["probes"].append(entry)
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level and the record's fields"""
+    
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+        }
+        entry.update(getattr(record, 'fields', None) or {"message": record.getMessage()})
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking or raising when the queue is full"""
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record):
+        # Formatting happens in the listener thread, not on the request path
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class RequestLog:
+    """Starts and finishes request contexts and queues their log lines"""
+    
+    def __init__(self, sample_rate=1.0, log_file=None, queue_size=10000):
+        self.sample_rate = sample_rate
+        self.logger = logging.getLogger(LOGGER_NAME)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        
+        target = logging.FileHandler(log_file) if log_file else logging.StreamHandler(sys.stderr)
+        target.setFormatter(JsonFormatter())
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.listener = logging.handlers.QueueListener(self.handler.queue, target)
+        
+        global _active
+        with _active_lock:
+            # Apps loaded into one interpreter share the logger: stacking a handler
+            # per RequestLog would write every request once for each of them
+            if _active is not None:
+                _active._detach()
+            self.logger.addHandler(self.handler)
+            self.listener.start()
+            _active = self
+    
+    @classmethod
+    def from_settings(cls, settings):
+        """Create the request log for the LOG_* settings, or return None when LOG_REQUESTS is off"""
+        if not settings['log_requests']:
+            return None
+        return cls(settings['log_sample_rate'], settings['log_file'] or None, settings['log_queue_size'])
+    
+    def close(self):
+        """Stop logging requests and write the lines still queued"""
+        global _active
+        with _active_lock:
+            if _active is self:
+                self._detach()
+                _active = None
+    
+    def _detach(self):
+        self.logger.removeHandler(self.handler)
+        self.listener.stop()
+    
+    def start(self, method, path, request_id=None):
+        """Begin a request: return its context and make it current"""
+        context = {
+            "request_id": request_id or uuid.uuid4().hex,
+            "method": method,
+            "path": path,
+            "started": time.perf_counter(),
+            "probes": [],
+            "failed": False,
+        }
+        context["token"] = _current.set(context)
+        return context
+    
+    def finish(self, context, status_code, error=None):
+        """End a request and queue its log line, sampling successful requests"""
+        try:
+            _current.reset(context.pop("token"))
+        except (KeyError, ValueError):
+            # Already finished, or finished from another context (streamed responses)
+            pass
+        
+        failed = context["failed"] or error is not None or status_code >= 500
+        if not failed and self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        
+        fields = {
+            "type": "error" if failed else "access",
+            "request_id": context["request_id"],
+            "method": context["method"],
+            "path": context["path"],
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - context["started"]) * 1000, 2),
+            "probes": context["probes"],
+        }
+        if error is not None:
+            fields["error"] = repr(error)
+        self.logger.log(logging.ERROR if failed else logging.INFO, fields["type"], extra={"fields": fields})
@@ -0,0 +1,181 @@
+"""
+Background health sampler shared by all viewers of a monitor process.
+
+One scheduler thread decides which databases are due and hands their health
+checks to a small thread pool, so a slow database never delays the others.
+Viewers subscribe to a queue and receive only the fields that changed.
+
+Given a minimum and maximum interval, each database is checked on its own
+adaptive schedule: the interval backs off geometrically while the database is
+consistently UP with steady latency, and drops to the minimum as soon as a
+check fails or latency spikes. With an exporter, every sample is also pushed to
+a collector (see export.py).
+"""
+import concurrent.futures
+import queue
+import threading
+import time
+
+from .export import create_exporter
+from .latency import AnomalyDetector
+
+# Pending updates per viewer before a slow viewer is dropped (it can resubscribe)
+SUBSCRIBER_QUEUE_SIZE = 32
+
+# Consecutive steady UP samples required before the interval backs off
+STABLE_SAMPLES = 3
+
+# Latency spread (stddev / mean) above which a database does not count as steady
+MAX_LATENCY_VARIATION = 0.5
+
+# A sample is a spike when it is this many standard deviations above the mean
+# and at least SPIKE_MIN_MS slower, so jitter on a sub-millisecond mean is ignored
+SPIKE_ZSCORE = 3.0
+SPIKE_MIN_MS = 10
+
+class AdaptiveInterval:
+    """Per-database check interval that adapts to observed stability"""
+    
+    def __init__(self, initial, minimum, maximum, backoff=2.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.interval = max(minimum, min(initial, maximum))
+        self.latency = AnomalyDetector(SPIKE_ZSCORE, SPIKE_MIN_MS, warmup=STABLE_SAMPLES)
+        self._streak = 0
+    
+    def update(self, sample):
+        """Adjust the interval after a health sample and return it"""
+        # DOWN, or DEGRADED against the monitor's latency baseline
+        if sample["status"] != "UP":
+            self._streak = 0
+            self.interval = self.minimum
+            return self.interval
+        
+        _, spike = self.latency.observe(sample["response_time_ms"])
+        
+        if spike:
+            self._streak = 0
+            self.interval = self.minimum
+        else:
+            self._streak += 1
+            stats = self.latency.stats
+            steady = stats.stddev <= MAX_LATENCY_VARIATION * max(stats.mean, SPIKE_MIN_MS)
+            if self._streak >= STABLE_SAMPLES and steady:
+                self.interval = min(self.interval * self.backoff, self.maximum)
+        return self.interval
+
+class HealthSampler:
+    """Probes every database on its schedule and pushes changes to all subscribers"""
+    
+    def __init__(self, monitor, db_names, interval, max_workers=8, min_interval=None, max_interval=None,
+                 backoff=2.0, exporter=None):
+        self.monitor = monitor
+        self.exporter = exporter
+        self.db_names = list(db_names)
+        self.interval = interval
+        # Without bounds every database keeps the fixed interval
+        self._schedules = {
+            db_name: AdaptiveInterval(interval, min_interval or interval, max_interval or interval, backoff)
+            for db_name in self.db_names
+        }
+        self.max_workers = max(1, min(max_workers, len(self.db_names)))
+        self._latest = {}
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._sampled = {db_name: threading.Event() for db_name in self.db_names}
+        self._thread = None
+    
+    @classmethod
+    def from_settings(cls, monitor, db_names, max_workers=8):
+        """Create a sampler with the HEALTH_SAMPLE_* and EXPORT_* settings of the monitor"""
+        settings = monitor.settings
+        return cls(monitor, db_names, settings['sample_interval'], max_workers,
+                   min_interval=settings['sample_interval_min'],
+                   max_interval=settings['sample_interval_max'],
+                   backoff=settings['sample_backoff'],
+                   exporter=create_exporter(settings, monitor.metrics))
+    
+    def start(self):
+        """Start the sampler thread if it is not running yet (called lazily, after gunicorn forks)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="health-sampler", daemon=True)
+                self._thread.start()
+    
+    def latest(self, db_name):
+        """Return the most recent sample of a database, or None before the first one"""
+        return self._latest.get(db_name)
+    
+    def wait_for_sample(self, db_name, timeout):
+        """Return the latest sample of a database, waiting up to timeout seconds for the first one"""
+        self._sampled[db_name].wait(timeout)
+        return self._latest.get(db_name)
+    
+    def current_interval(self, db_name):
+        """Return the seconds until a database's next check after the latest one"""
+        return self._schedules[db_name].interval
+    
+    def subscribe(self):
+        """Register a viewer and return the queue its (db_name, diff) updates are delivered to"""
+        subscription = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+    
+    def is_subscribed(self, subscription):
+        with self._lock:
+            return subscription in self._subscribers
+    
+    def _run(self):
+        next_due = {db_name: time.monotonic() for db_name in self.db_names}
+        in_flight = {}
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                   thread_name_prefix="health-probe") as executor:
+            while True:
+                now = time.monotonic()
+                for db_name, due in next_due.items():
+                    # Never queue a second check while the previous one is still running
+                    if due <= now and db_name not in in_flight:
+                        in_flight[db_name] = executor.submit(self._sample, db_name)
+                
+                # Sleep until the next check is due or a running check finishes
+                waiting = [due for db_name, due in next_due.items() if db_name not in in_flight]
+                timeout = max(0.0, min(waiting) - time.monotonic()) if waiting else None
+                if in_flight:
+                    concurrent.futures.wait(list(in_flight.values()), timeout=timeout,
+                                            return_when=concurrent.futures.FIRST_COMPLETED)
+                else:
+                    time.sleep(timeout)
+                
+                for db_name, future in list(in_flight.items()):
+                    if future.done():
+                        del in_flight[db_name]
+                        next_due[db_name] = time.monotonic() + self._schedules[db_name].interval
+    
+    def _sample(self, db_name):
+        sample = self.monitor.check_health(db_name)
+        self._schedules[db_name].update(sample)
+        if self.exporter:
+            self.exporter.submit(db_name, sample)
+        previous = self._latest.get(db_name)
+        self._latest[db_name] = sample
+        self._sampled[db_name].set()
+        
+        # Only fields that changed since the previous sample go over the wire
+        diff = {key: value for key, value in sample.items()
+                if previous is None or previous.get(key) != value}
+        self._broadcast(db_name, diff)
+    
+    def _broadcast(self, db_name, diff):
+        with self._lock:
+            for subscription in list(self._subscribers):
+                try:
+                    subscription.put_nowait((db_name, diff))
+                except queue.Full:
+                    self._subscribers.discard(subscription)
@@ -0,0 +1,70 @@
+"""
+Production server profiles: the worker class, processes and threads the apps
+are served with, sized from the CPU count and the expected database latency.
+
+A probe spends most of its time waiting on the database, so a process needs
+about (latency + CPU time) / CPU time requests in flight to keep one core busy.
+The profiles differ in what a waiting request holds on to:
+
+    sync     a whole process; 2 x CPUs + 1 processes, so a few slow probes pin them all
+    gthread  a thread; one process per CPU with a thread per request in flight
+    gevent   a greenlet; one process per CPU (thin mode only, thick mode blocks the loop)
+    uvicorn  a thread of the pool probes run in; one uvloop/httptools event loop per CPU
+
+gthread serves its requests in flight with `threads`, gevent with
+`worker_connections` greenlets; sync has a single one. Each process gets one
+pooled session per request in flight, so requests do not queue for a session;
+an explicit DB_POOL_MAX takes precedence.
+"""
+import math
+import os
+
+# Profile name -> gunicorn worker class
+PROFILES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'gevent': 'gevent',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+DEFAULT_PROFILES = {'flask': 'gthread', 'fastapi': 'uvicorn'}
+
+def server_profile(settings, framework, cpu_count=None):
+    """
+    Return the SERVER_* profile of a 'flask' or 'fastapi' app: name, worker_class,
+    workers, concurrency (requests in flight per process) and the gunicorn setting
+    that provides it, threads (gthread, and the probe threads of uvicorn) or
+    worker_connections (gevent)
+    """
+    name = settings['server_profile'] or DEFAULT_PROFILES[framework]
+    if name not in PROFILES:
+        raise ValueError(f"Unknown SERVER_PROFILE {name!r}; expected one of {', '.join(PROFILES)}")
+    if (name == 'uvicorn') != (framework == 'fastapi'):
+        raise ValueError(f"SERVER_PROFILE {name!r} cannot serve the {framework} app")
+    
+    cpus = cpu_count or os.cpu_count() or 1
+    # Requests in flight that keep one CPU busy while the others wait on the database
+    in_flight = math.ceil((settings['server_db_latency_ms'] + settings['server_cpu_ms']) / settings['server_cpu_ms'])
+    concurrency = settings['server_threads'] or max(2, min(in_flight, settings['server_max_threads']))
+    
+    if name == 'sync':
+        workers, concurrency = 2 * cpus + 1, 1
+    else:
+        workers = cpus
+    
+    profile = {
+        'name': name,
+        'worker_class': PROFILES[name],
+        'workers': settings['server_workers'] or workers,
+        'concurrency': concurrency,
+    }
+    # gunicorn ignores threads with gevent workers and worker_connections with the others
+    if name == 'gevent':
+        profile['worker_connections'] = concurrency
+    elif name != 'sync':
+        profile['threads'] = concurrency
+    return profile
+
+def apply_pool_size(profile):
+    """Give each process one pooled session per request in flight, unless DB_POOL_MAX is set"""
+    os.environ.setdefault('DB_POOL_MAX', str(profile['concurrency']))
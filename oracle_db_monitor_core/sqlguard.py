@@ -0,0 +1,123 @@
+"""
+Read-only validation of ad-hoc SQL submitted to /custom.
+
+Queries are tokenized rather than substring-matched, so keywords inside string
+literals, comments, quoted identifiers or longer names (LAST_UPDATE) are ignored.
+"""
+import functools
+import os
+import re
+
+# Number of normalized query texts and verdicts kept in the LRU caches
+VALIDATION_CACHE_SIZE = int(os.environ.get('CUSTOM_VALIDATION_CACHE_SIZE', 1024))
+
+# Reserved words that can never appear in a single read-only SELECT statement
+# (e.g. SELECT ... FOR UPDATE takes row locks, SELECT ... INTO is PL/SQL)
+FORBIDDEN_QUERY_KEYWORDS = frozenset([
+    'INSERT', 'UPDATE', 'DELETE', 'DROP', 'CREATE', 'ALTER', 'GRANT', 'REVOKE', 'LOCK', 'INTO',
+])
+
+_WORD_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_$#]*|[0-9]+(?:\.[0-9]*)?')
+_Q_QUOTE_CLOSERS = {'[': ']', '{': '}', '(': ')', '<': '>'}
+
+def tokenize_sql(query):
+    """Split SQL text into upper-cased words, punctuation and verbatim literals, skipping comments"""
+    tokens = []
+    i = 0
+    length = len(query)
+    
+    while i < length:
+        char = query[i]
+        
+        if char.isspace():
+            i += 1
+        elif query.startswith('--', i):
+            end = query.find('\n', i)
+            i = length if end == -1 else end + 1
+        elif query.startswith('/*', i):
+            end = query.find('*/', i + 2)
+            if end == -1:
+                raise ValueError("Unterminated comment")
+            i = end + 2
+        elif char in 'nNqQ' and re.match(r"[nN]?[qQ]'", query[i:i + 3]):
+            # Alternative quoting: q'[...]', q'{...}', q'!...!' etc.
+            start = query.index("'", i) + 1
+            if start >= length:
+                raise ValueError("Unterminated quoted string")
+            delimiter = query[start]
+            closing = _Q_QUOTE_CLOSERS.get(delimiter, delimiter) + "'"
+            end = query.find(closing, start + 1)
+            if end == -1:
+                raise ValueError("Unterminated quoted string")
+            tokens.append(query[i:end + 2])
+            i = end + 2
+        elif char == "'" or (char in 'nN' and query.startswith("'", i + 1)):
+            # Regular string literal, '' is an escaped quote
+            start = i
+            i = query.index("'", i) + 1
+            while True:
+                end = query.find("'", i)
+                if end == -1:
+                    raise ValueError("Unterminated string literal")
+                if query.startswith("''", end):
+                    i = end + 2
+                    continue
+                i = end + 1
+                break
+            tokens.append(query[start:i])
+        elif char == '"':
+            end = query.find('"', i + 1)
+            if end == -1:
+                raise ValueError("Unterminated quoted identifier")
+            tokens.append(query[i:end + 1])
+            i = end + 1
+        else:
+            match = _WORD_RE.match(query, i)
+            if match:
+                tokens.append(match.group(0).upper())
+                i = match.end()
+            else:
+                tokens.append(char)
+                i += 1
+    
+    return tokens
+
+def validate_read_only_query(query):
+    """Return None if the query is a single read-only SELECT, otherwise the reason it is rejected"""
+    try:
+        normalized = normalize_sql(query)
+    except ValueError as e:
+        return str(e)
+    # Verdicts are cached per normalized text, so variants in case, whitespace or
+    # comments share one entry
+    return _validate_normalized(normalized)
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_normalized(normalized):
+    # Literals and quoted identifiers are kept verbatim, so the normalized text tokenizes the same
+    tokens = tokenize_sql(normalized)
+    
+    if not tokens:
+        return "No query provided"
+    
+    # Skip leading parentheses, e.g. (SELECT ...) UNION (SELECT ...)
+    first = next((token for token in tokens if token != '('), None)
+    if first not in ('SELECT', 'WITH'):
+        return "Only SELECT queries are allowed"
+    
+    if ';' in tokens:
+        return "Only a single statement without a trailing semicolon is allowed"
+    
+    for position, token in enumerate(tokens):
+        if token in FORBIDDEN_QUERY_KEYWORDS:
+            return f"Keyword {token} is not allowed in read-only queries"
+        # Inline PL/SQL declarations (WITH FUNCTION ...) can run autonomous transactions
+        if token == 'WITH' and position + 1 < len(tokens) and tokens[position + 1] in ('FUNCTION', 'PROCEDURE'):
+            return "PL/SQL declarations are not allowed in read-only queries"
+    
+    return None
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def normalize_sql(query):
+    """Return a canonical form of the query for use in cache keys (case, whitespace and comments removed)"""
+    return ' '.join(tokenize_sql(query))
@@ -42,9 +42,10 @@ if [ $? -ne 0 ]; then
     exit 1
 fi
 
-# Start the API server with gunicorn and uvicorn workers
+# Start the API server with gunicorn and uvicorn workers; gunicorn.conf.py sizes
+# them from the CPU count and SERVER_* settings (see README)
 echo "Starting the FastAPI server with gunicorn..."
-gunicorn -w 4 -k uvicorn.workers.UvicornWorker -b 0.0.0.0:5000 app:app --daemon
+gunicorn -b 0.0.0.0:5000 app:app --daemon
 
 echo "API server started on port 5000"
 echo "To check if the server is running: ps aux | grep gunicorn"
@@ -0,0 +1,24 @@
+"""
+gunicorn settings, read automatically when gunicorn starts in this directory:
+the SERVER_PROFILE production profile of oracle_db_monitor_core/serving.py.
+Command-line options such as -w still take precedence.
+"""
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# The shared monitor core lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oracle_db_monitor_core import load_settings
+from oracle_db_monitor_core.serving import apply_pool_size, server_profile
+
+profile = server_profile(load_settings(), 'fastapi')
+# Workers inherit the environment, so their pools are sized before the app is loaded
+apply_pool_size(profile)
+
+worker_class = profile['worker_class']
+workers = profile['workers']
+# The probe threads of each uvicorn worker are sized by the app (register_thread_limit)
@@ -1,23 +1,37 @@
-from flask import Flask, jsonify, render_template_string
-import oracledb
+from flask import Flask, Response, redirect, request, url_for
 import os
-import time
-import datetime
+import sys
+import json
+import queue
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
 load_dotenv()
 
+# The shared monitor core lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oracle_db_monitor_core import DEFAULT_DATABASE, HealthSampler, Monitor, load_database_config, load_settings
+from oracle_db_monitor_core.flask_adapter import make_response, register_liveness_routes, register_request_logging
+
 app = Flask(__name__)
 
-# Database connection parameters
-DB_CONFIG = {
-    'host': os.environ.get('DB_HOST', 'localhost'),
-    'port': int(os.environ.get('DB_PORT', 1521)),
-    'service_name': os.environ.get('DB_SERVICE_NAME', 'ORCLPDB1'),
-    'user': os.environ.get('DB_USER', 'system'),
-    'password': os.environ.get('DB_PASSWORD', 'oracle'),
-}
+# Database connection parameters (5 second timeout for connection attempts)
+DB_CONFIG = load_database_config(connect_timeout=5)
+
+# This app keeps no persistent sessions unless DB_POOL_ENABLED is set
+monitor = Monitor({DEFAULT_DATABASE: DB_CONFIG}, load_settings(pool_enabled=False))
+register_request_logging(app, monitor.settings)
+# Only warms up when DB_POOL_ENABLED is set; /health/ready gates on it
+monitor.start_warm_up()
+register_liveness_routes(app, monitor)
+
+# Bounds of the adaptive interval between background health samples pushed to open pages
+SAMPLE_INTERVAL_MIN = monitor.settings['sample_interval_min']
+SAMPLE_INTERVAL_MAX = monitor.settings['sample_interval_max']
+
+# Seconds between keep-alive comments on idle event streams
+STREAM_HEARTBEAT_INTERVAL = 15
 
 # HTML template with auto-refresh functionality
 HEALTH_PAGE_TEMPLATE = '''
@@ -25,7 +39,6 @@ HEALTH_PAGE_TEMPLATE = '''
 <html>
 <head>
     <title>Oracle Database Health Monitor</title>
-    <meta http-equiv="refresh" content="{{ refresh_interval }}">
     <style>
         body {
             font-family: Arial, sans-serif;
@@ -58,6 +71,11 @@ HEALTH_PAGE_TEMPLATE = '''
             color: #721c24;
             border: 1px solid #f5c6cb;
         }
+        .degraded {
+            background-color: #fff3cd;
+            color: #856404;
+            border: 1px solid #ffeeba;
+        }
         .info {
             margin-top: 20px;
             background-color: #e2e3e5;
@@ -92,6 +110,8 @@ HEALTH_PAGE_TEMPLATE = '''
         }
     </style>
     <script>
+        var refreshInterval = {{ refresh_interval }};
+        
         // Function to update refresh interval
         function updateRefreshInterval() {
             var interval = document.getElementById('refresh-interval').value;
@@ -102,23 +122,54 @@ HEALTH_PAGE_TEMPLATE = '''
         function refreshNow() {
             window.location.reload();
         }
+        
+        // Apply a full sample or a diff pushed by the server
+        function applyUpdate(fields) {
+            if ('status' in fields) {
+                document.getElementById('status').textContent = fields.status;
+                document.getElementById('status-box').className = 'status ' + fields.status.toLowerCase();
+            }
+            if ('database' in fields) {
+                document.getElementById('database').textContent = fields.database;
+            }
+            if ('response_time_ms' in fields) {
+                document.getElementById('response-time').textContent = fields.response_time_ms;
+            }
+            if ('error' in fields) {
+                document.getElementById('error').textContent = fields.error || '';
+                document.getElementById('error-row').style.display = fields.error ? '' : 'none';
+            }
+            if ('timestamp' in fields) {
+                document.getElementById('timestamp').textContent = fields.timestamp;
+            }
+        }
+        
+        window.addEventListener('load', function() {
+            if (window.EventSource && refreshInterval > 0) {
+                // Live updates from the shared background sampler
+                var source = new EventSource('{{ url_for('health_stream') }}');
+                source.addEventListener('snapshot', function(event) { applyUpdate(JSON.parse(event.data)); });
+                source.addEventListener('diff', function(event) { applyUpdate(JSON.parse(event.data)); });
+            } else if (refreshInterval > 0) {
+                // Browsers without Server-Sent Events reload the page instead
+                setTimeout(refreshNow, refreshInterval * 1000);
+            }
+        });
     </script>
 </head>
 <body>
     <div class="container">
         <h1>Oracle Database Health Monitor</h1>
         
-        <div class="status {{ 'up' if status == 'UP' else 'down' }}">
-            <h2>Status: {{ status }}</h2>
-            <p><strong>Database:</strong> {{ database }}</p>
-            <p><strong>Response Time:</strong> {{ response_time_ms }} ms</p>
-            {% if error %}
-            <p><strong>Error:</strong> {{ error }}</p>
-            {% endif %}
+        <div id="status-box" class="status {{ status|lower }}">
+            <h2>Status: <span id="status">{{ status }}</span></h2>
+            <p><strong>Database:</strong> <span id="database">{{ database }}</span></p>
+            <p><strong>Response Time:</strong> <span id="response-time">{{ response_time_ms }}</span> ms</p>
+            <p id="error-row" {{ 'style="display: none"'|safe if not error }}><strong>Error:</strong> <span id="error">{{ error or '' }}</span></p>
         </div>
         
         <div class="refresh-control">
-            <p>Auto-refresh interval: 
+            <p>Live updates: 
                 <select id="refresh-interval" onchange="updateRefreshInterval()">
                     <option value="60" {{ 'selected' if refresh_interval == 60 }}>1 minute</option>
                     <option value="300" {{ 'selected' if refresh_interval == 300 }}>5 minutes</option>
@@ -132,33 +183,54 @@ HEALTH_PAGE_TEMPLATE = '''
         </div>
         
         <div class="info">
-            <p>This page automatically checks the health of your Oracle database at the specified interval.</p>
+            <p>A single background sampler checks the health of your Oracle database every {{ sample_interval_min }} to {{ sample_interval_max }} seconds, more often while problems are detected, and pushes changes to every open page.</p>
             <p>Each check establishes a new connection to the database and closes it immediately after the check.</p>
-            <p>No persistent connections are maintained between checks.</p>
+            <p>No persistent connections are maintained between checks, no matter how many pages are open.</p>
         </div>
         
-        <p class="timestamp">Last checked: {{ timestamp }}</p>
+        <p class="timestamp">Last checked: <span id="timestamp">{{ timestamp }}</span></p>
     </div>
 </body>
 </html>
 '''
 
-def get_connection():
-    """Create and return a database connection with timeout"""
-    dsn = oracledb.makedsn(
-        host=DB_CONFIG['host'],
-        port=DB_CONFIG['port'],
-        service_name=DB_CONFIG['service_name']
-    )
+# Compile the health page once instead of on every request
+health_page_template = app.jinja_env.from_string(HEALTH_PAGE_TEMPLATE)
+
+# Refresh intervals offered by the page; only these are kept in the rendered page cache
+REFRESH_OPTIONS = (60, 300, 600, 1800, 3600, 0)
+
+# Refresh interval -> (sample, rendered HTML), reused until the sampler produces a new sample
+_rendered_pages = {}
+
+def render_health_page(sample, refresh_interval):
+    """Render the HTML health page for a sample, reusing the last rendering of the same sample"""
+    cached = _rendered_pages.get(refresh_interval)
+    if cached and cached[0] is sample:
+        return cached[1]
     
-    # Set timeout to 5 seconds for connection attempt
-    connection = oracledb.connect(
-        user=DB_CONFIG['user'],
-        password=DB_CONFIG['password'],
-        dsn=dsn,
-        timeout=5  # 5 second timeout for connection attempt
+    html = health_page_template.render(
+        status=sample["status"],
+        database=sample["database"],
+        response_time_ms=sample["response_time_ms"],
+        error=sample["error"],
+        timestamp=sample["timestamp"],
+        refresh_interval=refresh_interval,
+        sample_interval_min=SAMPLE_INTERVAL_MIN,
+        sample_interval_max=SAMPLE_INTERVAL_MAX
     )
-    return connection
+    
+    if refresh_interval in REFRESH_OPTIONS:
+        _rendered_pages[refresh_interval] = (sample, html)
+    return html
+
+# One sampler per process shared by all viewers of the health page
+health_sampler = HealthSampler.from_settings(monitor, [DEFAULT_DATABASE])
+
+# With EXPORT_SINK set the samples are pushed, so sample from startup instead of waiting
+# for a page view (the module is imported in each worker, after gunicorn forks)
+if health_sampler.exporter:
+    health_sampler.start()
 
 @app.route('/', methods=['GET'])
 def index():
@@ -169,64 +241,49 @@ def index():
 @app.route('/health', methods=['GET'])
 def health_check():
     """Check if Oracle database is up and return status for Dynatrace to monitor"""
-    from flask import request
-    
     # Get refresh interval from query parameter, default to 5 minutes (300 seconds)
     refresh_interval = request.args.get('refresh', default=300, type=int)
     
-    start_time = time.time()
-    status = "DOWN"
-    error_message = None
-    database_info = f"{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['service_name']}"
+    # Check if the request wants JSON or HTML
+    if request.headers.get('Accept') == 'application/json' or request.args.get('format') == 'json':
+        # Return JSON response for API clients (like Dynatrace), always from a live check
+        return make_response(monitor.health())
     
-    try:
-        # Create a new connection for each health check
-        connection = get_connection()
-        
-        with connection:
-            # Execute a simple query to verify the connection is working
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1 FROM DUAL")
-                cursor.fetchone()
-        
-        # If we get here, the database is up
-        status = "UP"
-        
-    except Exception as e:
-        # If any error occurs, the database is considered down
-        error_message = str(e)
+    # Human viewers share the background sampler instead of probing per page view
+    health_sampler.start()
+    sample = health_sampler.wait_for_sample(DEFAULT_DATABASE, timeout=10) or monitor.check_health()
     
-    finally:
-        # Calculate response time
-        response_time = round((time.time() - start_time) * 1000)
-        current_time = datetime.datetime.now().isoformat()
-        
-        # Check if the request wants JSON or HTML
-        if request.headers.get('Accept') == 'application/json' or request.args.get('format') == 'json':
-            # Return JSON response for API clients (like Dynatrace)
-            response_data = {
-                "status": status,
-                "database": database_info,
-                "response_time_ms": response_time,
-                "timestamp": current_time
-            }
+    # Return HTML page with live updates for human viewers
+    return render_health_page(sample, max(refresh_interval, 0))
+
+@app.route('/health/stream', methods=['GET'])
+def health_stream():
+    """Server-Sent Events stream of health samples: a full snapshot, then only changed fields"""
+    health_sampler.start()
+    subscription = health_sampler.subscribe()
+    
+    def events():
+        try:
+            sample = health_sampler.wait_for_sample(DEFAULT_DATABASE, timeout=10)
+            if sample:
+                yield f"event: snapshot\ndata: {json.dumps(sample)}\n\n"
             
-            if error_message:
-                response_data["error"] = error_message
-                
-            return jsonify(response_data), 200 if status == "UP" else 503
-        else:
-            # Return HTML page with auto-refresh for human viewers
-            return render_template_string(
-                HEALTH_PAGE_TEMPLATE,
-                status=status,
-                database=database_info,
-                response_time_ms=response_time,
-                error=error_message,
-                timestamp=current_time,
-                refresh_interval=refresh_interval if refresh_interval > 0 else ""
-            )
+            while health_sampler.is_subscribed(subscription):
+                try:
+                    _, diff = subscription.get(timeout=STREAM_HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    # Keeps proxies from closing the idle connection and detects gone clients
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: diff\ndata: {json.dumps(diff)}\n\n"
+        finally:
+            health_sampler.unsubscribe(subscription)
+    
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Disable response buffering in nginx
+    })
 
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5000))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    app.run(host="0.0.0.0", port=port)
@@ -43,8 +43,10 @@ if [ $? -ne 0 ]; then
 fi
 
 # Start the API server with gunicorn
+# A single process keeps one background health sampler; threads serve the
+# long-lived /health/stream connections of open health pages (see gunicorn.conf.py)
 echo "Starting the Flask server with gunicorn..."
-gunicorn -w 4 -b 0.0.0.0:5000 app:app --daemon
+gunicorn -b 0.0.0.0:5000 app:app --daemon
 
 echo "API server started on port 5000"
 echo "The health check page is available at: http://localhost:5000/health"
@@ -0,0 +1,27 @@
+"""
+gunicorn settings, read automatically when gunicorn starts in this directory:
+the SERVER_PROFILE production profile of oracle_db_monitor_core/serving.py,
+limited to a single process. Command-line options still take precedence.
+"""
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# The shared monitor core lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oracle_db_monitor_core import load_settings
+from oracle_db_monitor_core.serving import server_profile
+
+profile = server_profile(load_settings(), 'flask')
+
+# A single process keeps one background health sampler, and every open health page
+# holds a /health/stream connection, so at least 32 threads (or greenlets with gevent)
+worker_class = profile['worker_class']
+workers = 1
+if profile['name'] == 'gevent':
+    worker_connections = max(profile['concurrency'], 32)
+else:
+    threads = max(profile['concurrency'], 32)
@@ -1,43 +1,29 @@
-import oracledb
 from flask import Flask, Response
-import time
+
+from oracle_db_monitor_core import DEFAULT_DATABASE, Monitor, load_database_config
 
 app = Flask(__name__)
 
-# Oracle connection details
-DB_USER = "scott"  # Replace with your username
-DB_PASSWORD = "tiger"  # Replace with your password
-DB_HOST = "localhost"  # Replace with your host
-DB_PORT = "1521"  # Replace with your port
-DB_SERVICE = "orclpdb"  # Replace with your service name or SID
+# Oracle connection details, overridable through DB_* environment variables
+DB_CONFIG = load_database_config(
+    user="scott",  # Replace with your username
+    password="tiger",  # Replace with your password
+    host="localhost",  # Replace with your host
+    port=1521,  # Replace with your port
+    service_name="orclpdb"  # Replace with your service name or SID
+)
+DB_HOST = DB_CONFIG['host']
+DB_SERVICE = DB_CONFIG['service_name']
 
-# DSN for oracledb
-DSN = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
+monitor = Monitor({DEFAULT_DATABASE: DB_CONFIG})
 
 @app.route("/health")
 def health_check():
-    start_time = time.time_ns()
-    status = "UP"
-    error = ""
+    sample = monitor.check_health()
+    status = sample["status"]
+    error = sample["error"] or ""
+    response_time = sample["response_time_ms"]
     
-    try:
-        # Connect to Oracle
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=DSN) as connection:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1 FROM dual")
-                result = cursor.fetchone()
-                if result and result[0] == 1:
-                    status = "UP"
-                else:
-                    status = "DOWN"
-                    error = "Query did not return expected result"
-    except oracledb.Error as e:
-        status = "DOWN"
-        error = str(e)
-
-    # Calculate response time in milliseconds
-    response_time = (time.time_ns() - start_time) // 1_000_000
-
     # Generate HTML
     html = f"""
     <!DOCTYPE html>
@@ -50,6 +36,7 @@ def health_check():
             body {{ font-family: Arial, sans-serif; text-align: center; margin-top: 50px; }}
             .status-up {{ color: green; font-size: 24px; }}
             .status-down {{ color: red; font-size: 24px; }}
+            .status-degraded {{ color: darkorange; font-size: 24px; }}
         </style>
     </head>
     <body>
@@ -0,0 +1,27 @@
+"""
+Shared test setup: every test runs against the in-process fake driver, so no
+Oracle database (or python-oracledb) is needed.
+"""
+import os
+import sys
+
+# The core picks its driver when it is first imported
+os.environ['DB_DRIVER'] = 'fake'
+os.environ.setdefault('FAKE_DB_CONNECT_LATENCY_MS', '1')
+os.environ.setdefault('FAKE_DB_QUERY_LATENCY_MS', '0')
+os.environ.setdefault('LOG_REQUESTS', 'false')
+os.environ.setdefault('WARM_UP', 'false')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pytest
+
+from oracle_db_monitor_core import fake_oracledb
+
+@pytest.fixture(autouse=True)
+def fake_driver():
+    """Reset the fake driver's faults and scripts around every test"""
+    fake_oracledb.configure()
+    yield fake_oracledb
+    fake_oracledb.configure()
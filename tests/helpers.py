@@ -0,0 +1,13 @@
+"""Helpers shared by the tests"""
+import importlib.util
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_app(relative_path, module_name):
+    """Import an app module from its file under a unique name (every app directory has its own app.py)"""
+    path = os.path.join(REPO_ROOT, relative_path)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,89 @@
+"""Every app's routes, served by the framework test clients against the fake driver"""
+import gzip
+import json
+
+import pytest
+
+from tests.helpers import load_app
+
+DETAIL_PATHS = ['/metrics', '/tablespace', '/sessions', '/sessions/summary', '/locks', '/performance',
+                '/sysstat', '/stats']
+
+@pytest.fixture(scope='module')
+def flask_app():
+    return load_app('oracle_db_monitor/app.py', 'flask_app_routes')
+
+@pytest.fixture(scope='module')
+def flask_client(flask_app):
+    return flask_app.app.test_client()
+
+@pytest.fixture(scope='module')
+def fastapi_client():
+    from fastapi.testclient import TestClient
+    app = load_app('oracle_db_monitor_fastapi/app.py', 'fastapi_app_routes')
+    with TestClient(app.app) as client:
+        yield client
+
+@pytest.fixture(scope='module')
+def simplified_client():
+    return load_app('oracle_db_monitor_flask_simplified/app.py', 'simplified_app_routes').app.test_client()
+
+@pytest.mark.parametrize('path', ['/', '/health', '/health/live', '/health/ready'] + DETAIL_PATHS)
+def test_flask_routes(flask_client, path):
+    response = flask_client.get(path)
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+@pytest.mark.parametrize('path', ['/', '/health', '/health/live', '/health/ready'] + DETAIL_PATHS)
+def test_fastapi_routes(fastapi_client, path):
+    response = fastapi_client.get(path)
+    assert response.status_code == 200, response.text
+
+def test_flask_answers_304_for_a_current_etag(flask_client):
+    response = flask_client.get('/tablespace')
+    etag = response.headers['ETag']
+    revalidated = flask_client.get('/tablespace', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+    assert flask_client.get('/tablespace', headers={'If-None-Match': 'W/"stale"'}).status_code == 200
+
+def test_fastapi_answers_304_for_a_current_etag(fastapi_client):
+    etag = fastapi_client.get('/tablespace').headers['ETag']
+    assert fastapi_client.get('/tablespace', headers={'If-None-Match': etag}).status_code == 304
+
+def test_flask_compresses_large_responses(flask_client):
+    # The lock tree is over COMPRESSION_MIN_BYTES (1 KB); the liveness answer is not
+    response = flask_client.get('/locks', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] in ('gzip', 'br')
+    assert 'Accept-Encoding' in response.headers['Vary']
+    if response.headers['Content-Encoding'] == 'gzip':
+        assert json.loads(gzip.decompress(response.get_data()))['status'] == 'SUCCESS'
+    
+    small = flask_client.get('/health/live', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+def test_liveness_is_not_cached(flask_client):
+    response = flask_client.get('/health/live')
+    assert response.get_json()['status'] == 'ALIVE'
+    assert response.headers['Cache-Control'] == 'no-store'
+
+def test_simplified_app_serves_json_and_html(simplified_client):
+    assert simplified_client.get('/health?format=json').get_json()['status'] == 'UP'
+    page = simplified_client.get('/health')
+    assert page.status_code == 200
+    assert b'status up' in page.get_data()
+
+def test_simplified_app_reuses_the_rendered_page(simplified_client):
+    first = simplified_client.get('/health?refresh=30').get_data()
+    second = simplified_client.get('/health?refresh=30').get_data()
+    # Same sample, same rendering, until the sampler produces a new one
+    assert first == second
+
+@pytest.mark.parametrize('path, module, routes', [
+    ('modified_app.py', 'modified_app_routes', ['/', '/primary_health', '/replication', '/health/ready']),
+    ('dynamic_app.py', 'dynamic_app_routes', ['/', '/dev_health', '/ftp_health', '/health/live']),
+])
+def test_multi_database_apps(path, module, routes):
+    client = load_app(path, module).app.test_client()
+    for route in routes:
+        assert client.get(route).status_code == 200, route
+    assert client.get('/unknown_health').status_code == 404
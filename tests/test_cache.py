@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from oracle_db_monitor_core.cache import QueryResultCache, TTLCache
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache()
+    cache.put('key', 1)
+    assert cache.get('key', ttl=60) == 1
+    assert cache.get('key', ttl=0) is None
+    assert cache.get('other', ttl=60) is None
+
+def test_get_or_compute_reports_hits():
+    cache = TTLCache()
+    assert cache.get_or_compute('key', 60, lambda: 'value') == ('value', False)
+    assert cache.get_or_compute('key', 60, lambda: 'other') == ('value', True)
+
+def test_concurrent_misses_compute_once():
+    cache = TTLCache()
+    calls = []
+    release = threading.Event()
+    
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'value'
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('key', 60, compute)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Let every caller reach the cache before the leader finishes
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(calls) == 1
+    assert sorted(results) == [('value', False)] + [('value', True)] * 7
+
+def test_concurrent_callers_share_the_leaders_exception():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+    
+    def compute():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("ORA-03113")
+    
+    errors = []
+    
+    def call():
+        try:
+            cache.get_or_compute('key', 60, compute)
+        except RuntimeError as e:
+            errors.append(e)
+    
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    
+    assert len(errors) == 2
+    # A failure is not cached: the next caller computes again
+    assert cache.get_or_compute('key', 60, lambda: 'value') == ('value', False)
+
+def result_of_size(size):
+    # json.dumps(["x" * n]) is n + 4 bytes
+    return ['x' * (size - 4)]
+
+def test_query_cache_is_bounded_by_bytes_and_evicts_least_recently_used():
+    cache = QueryResultCache(max_bytes=300)
+    for key in 'abc':
+        cache.put(key, result_of_size(100))
+    assert cache.total_bytes == 300
+    
+    # Reading a refreshes it, so b is the least recently used
+    assert cache.get('a', max_age=60) is not None
+    cache.put('d', result_of_size(100))
+    
+    assert cache.get('b', max_age=60) is None
+    assert all(cache.get(key, max_age=60) for key in 'acd')
+    assert cache.total_bytes == 300
+
+def test_query_cache_replaces_entries_and_skips_oversized_results():
+    cache = QueryResultCache(max_bytes=300)
+    cache.put('a', result_of_size(100))
+    cache.put('a', result_of_size(50))
+    assert cache.total_bytes == 50
+    
+    entry = cache.put('big', result_of_size(301))
+    assert entry['results'] == result_of_size(301)
+    assert cache.get('big', max_age=60) is None
+    assert cache.total_bytes == 50
+
+def test_query_cache_respects_max_age():
+    cache = QueryResultCache(max_bytes=1000)
+    cache.put('a', [1])
+    assert cache.get('a', max_age=60)['results'] == [1]
+    assert cache.get('a', max_age=-1) is None
+
+def test_query_cache_etag_follows_the_results():
+    cache = QueryResultCache(max_bytes=1000)
+    assert cache.put('a', [1])['etag'] == cache.put('b', [1])['etag']
+    assert cache.put('a', [1])['etag'] != cache.put('a', [2])['etag']
+
+@pytest.mark.parametrize('variant', [
+    "select 1 from dual",
+    "SELECT   1\nFROM DUAL",
+    "SELECT 1 /* dashboard */ FROM dual -- panel 3",
+])
+def test_query_cache_keys_are_normalized(variant):
+    assert QueryResultCache.make_key('db', variant) == QueryResultCache.make_key('db', "SELECT 1 FROM dual")
+
+def test_query_cache_keys_separate_databases_binds_and_literals():
+    key = QueryResultCache.make_key('db', "SELECT :a FROM dual", {'a': 1})
+    assert key != QueryResultCache.make_key('other', "SELECT :a FROM dual", {'a': 1})
+    assert key != QueryResultCache.make_key('db', "SELECT :a FROM dual", {'a': 2})
+    assert QueryResultCache.make_key('db', "SELECT 'A' FROM dual") != QueryResultCache.make_key('db', "SELECT 'a' FROM dual")
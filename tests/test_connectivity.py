@@ -0,0 +1,45 @@
+from oracle_db_monitor_core import connection, connectivity, fake_oracledb, load_database_config
+
+def capture_connects(monkeypatch):
+    calls = []
+    connect = fake_oracledb.connect
+    
+    def recording_connect(*args, **kwargs):
+        calls.append(kwargs)
+        return connect(*args, **kwargs)
+    
+    monkeypatch.setattr(fake_oracledb, 'connect', recording_connect)
+    return calls
+
+def test_connects_through_drcp_like_the_apps(monkeypatch):
+    calls = capture_connects(monkeypatch)
+    config = load_database_config(drcp='true', drcp_class='DASHBOARD', drcp_purity='new')
+    
+    result = connectivity.test_target('dev', config, repeat=1, call_timeout_ms=1000)
+    
+    assert result['ok']
+    assert calls[0]['server_type'] == 'pooled'
+    assert calls[0]['cclass'] == 'DASHBOARD'
+    assert calls[0]['purity'] == fake_oracledb.PURITY_NEW
+
+def test_dedicated_connect_without_drcp(monkeypatch):
+    calls = capture_connects(monkeypatch)
+    connectivity.test_target('dev', load_database_config(), repeat=1, call_timeout_ms=1000)
+    assert 'cclass' not in calls[0] and 'server_type' not in calls[0]
+
+def test_failed_attempts_are_reported(fake_driver):
+    fake_driver.configure(connect_script='refuse,ok')
+    result = connectivity.test_target('dev', load_database_config(), repeat=2, call_timeout_ms=1000)
+    assert not result['ok']
+    assert result['failures'] == 1
+    assert result['auth_ms'] is not None
+
+def test_exit_status(fake_driver, capsys):
+    assert connectivity.main(['--json']) == 0
+    fake_driver.configure(connect_script='refuse')
+    assert connectivity.main(['--json']) == 1
+
+def test_read_only_pool_has_its_own_drcp_class():
+    config = load_database_config(drcp='true', drcp_class='DASHBOARD')
+    assert connection.drcp_params(config)['cclass'] == 'DASHBOARD'
+    assert connection.drcp_params(config, read_only=True)['cclass'] == 'DASHBOARD_RO'
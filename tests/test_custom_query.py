@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from oracle_db_monitor_core import DEFAULT_DATABASE, Monitor, load_database_config, load_settings
+from tests.helpers import load_app
+
+@pytest.fixture(scope='module')
+def client():
+    app = load_app('oracle_db_monitor/app.py', 'flask_app_custom')
+    return app.app.test_client()
+
+@pytest.mark.parametrize('body', ['[]', '"select 1 from dual"', '42', 'null', 'not json', ''])
+def test_body_that_is_not_an_object_is_a_bad_request(client, body):
+    response = client.post('/custom', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'ERROR'
+    assert response.get_json()['error'] == 'No query provided'
+
+@pytest.mark.parametrize('query', [['select 1 from dual'], {'sql': 'select 1'}, 5])
+def test_query_that_is_not_a_string_is_a_bad_request(client, query):
+    response = client.post('/custom', json={'query': query})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'query must be a string'
+
+def test_invalid_binds_are_a_bad_request(client):
+    response = client.post('/custom', json={'query': 'select :a from dual', 'binds': [1]})
+    assert response.status_code == 400
+
+def test_write_is_forbidden(client):
+    response = client.post('/custom', json={'query': 'delete from employees'})
+    assert response.status_code == 403
+
+def test_read_only_query_runs(client):
+    response = client.post('/custom', json={'query': 'select 1 from dual'})
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'SUCCESS'
+
+def make_monitor(configs=None, **settings):
+    return Monitor(configs or {DEFAULT_DATABASE: load_database_config()}, load_settings(**settings))
+
+def test_custom_query_results_are_cached_on_request():
+    monitor = make_monitor()
+    first = monitor.custom_query('select 1 from dual', max_age=60)
+    second = monitor.custom_query('SELECT 1\nFROM dual -- same query', max_age=60)
+    assert first.payload['cache']['hit'] is False
+    assert second.payload['cache']['hit'] is True
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert second.headers['Cache-Control'].startswith('max-age=')
+    
+    # Without cache_max_age the query always runs
+    assert 'cache' not in monitor.custom_query('select 1 from dual').payload
+
+def test_custom_query_binds_are_part_of_the_cache_key():
+    monitor = make_monitor()
+    monitor.custom_query('select :n from dual', binds={'n': 1}, max_age=60)
+    assert monitor.custom_query('select :n from dual', binds={'n': 2}, max_age=60).payload['cache']['hit'] is False
+
+@pytest.mark.parametrize('kwargs', [
+    {'binds': {'n': [1, 2]}},
+    {'timeout_ms': 'soon'},
+    {'max_age': 'forever'},
+])
+def test_invalid_custom_query_fields_are_rejected(kwargs):
+    assert make_monitor().custom_query('select :n from dual', **kwargs).status_code == 400
+
+def test_custom_query_timeout(fake_driver):
+    monitor = make_monitor()
+    # The read-only session setup runs first; the query itself hangs
+    fake_driver.configure(query_script='ok,ok,hang')
+    start = time.monotonic()
+    result = monitor.custom_query('select 1 from dual', timeout_ms=100)
+    assert time.monotonic() - start < 2
+    assert result.status_code == 500
+    assert 'DPY-4024' in result.payload['error']
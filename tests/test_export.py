@@ -0,0 +1,154 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from oracle_db_monitor_core import export, load_settings
+from oracle_db_monitor_core.metrics import MonitorMetrics
+from tests.helpers import load_app
+
+def wait_for_lines(path, timeout=10.0):
+    """Poll an export file until it has at least one line"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists() and path.read_text().strip():
+            return path.read_text().splitlines()
+        time.sleep(0.05)
+    return []
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def test_simplified_app_exports_without_a_page_view(monkeypatch, tmp_path):
+    target = tmp_path / 'samples.jsonl'
+    monkeypatch.setenv('EXPORT_SINK', 'file')
+    monkeypatch.setenv('EXPORT_TARGET', str(target))
+    monkeypatch.setenv('EXPORT_FLUSH_INTERVAL', '0.1')
+    monkeypatch.setenv('HEALTH_SAMPLE_INTERVAL', '1')
+    
+    app = load_app('oracle_db_monitor_flask_simplified/app.py', 'simplified_app_export')
+    
+    lines = wait_for_lines(target)
+    assert lines, "no sample was exported"
+    sample = json.loads(lines[0])
+    assert sample['status'] == 'UP'
+    assert sample['database_name'] == app.DEFAULT_DATABASE
+
+def test_simplified_app_samples_lazily_without_export(monkeypatch):
+    monkeypatch.setenv('EXPORT_SINK', 'none')
+    app = load_app('oracle_db_monitor_flask_simplified/app.py', 'simplified_app_no_export')
+    assert app.health_sampler.exporter is None
+    assert app.health_sampler._thread is None
+
+def test_flask_app_exports_without_a_request(monkeypatch, tmp_path):
+    target = tmp_path / 'samples.jsonl'
+    monkeypatch.setenv('EXPORT_SINK', 'file')
+    monkeypatch.setenv('EXPORT_TARGET', str(target))
+    monkeypatch.setenv('EXPORT_FLUSH_INTERVAL', '0.1')
+    
+    app = load_app('dynamic_app.py', 'dynamic_app_export')
+    
+    assert app.app.extensions['health_sampler'].db_names == list(app.DB_CONFIGS)
+    lines = wait_for_lines(target)
+    assert lines, "no sample was exported"
+    assert json.loads(lines[0])['database_name'] in app.DB_CONFIGS
+
+def test_flask_app_has_no_sampler_without_export(monkeypatch):
+    monkeypatch.setenv('EXPORT_SINK', 'none')
+    app = load_app('oracle_db_monitor/app.py', 'flask_app_no_export')
+    assert 'health_sampler' not in app.app.extensions
+
+def test_fastapi_app_exports_after_startup(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+    
+    target = tmp_path / 'samples.jsonl'
+    monkeypatch.setenv('EXPORT_SINK', 'file')
+    monkeypatch.setenv('EXPORT_TARGET', str(target))
+    monkeypatch.setenv('EXPORT_FLUSH_INTERVAL', '0.1')
+    
+    app = load_app('oracle_db_monitor_fastapi/app.py', 'fastapi_app_export')
+    # Entering the client runs the startup handlers; no request is sent
+    with TestClient(app.app):
+        lines = wait_for_lines(target)
+    assert lines, "no sample was exported"
+    assert json.loads(lines[0])['database_name'] == app.DEFAULT_DATABASE
+
+def health_sample(status='UP', response_time_ms=5):
+    return {'status': status, 'database': 'localhost:1521/ORCLPDB1', 'response_time_ms': response_time_ms,
+            'timestamp': '2024-01-01T00:00:00', 'error': None, 'anomaly_score': 0.5}
+
+def test_sample_gauges():
+    gauges = {name: value for name, _, value in export.sample_gauges(health_sample('DEGRADED', 12))}
+    assert gauges == {'up': 1, 'degraded': 1, 'response_time': 12, 'anomaly_score': 0.5}
+    assert {name: value for name, _, value in export.sample_gauges(health_sample('DOWN'))}['up'] == 0
+
+def test_statsd_packs_lines_into_datagrams():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(2)
+    sink = export.StatsdSink(f"127.0.0.1:{receiver.getsockname()[1]}")
+    
+    sink.send([(f"db{i}", health_sample(), 0) for i in range(100)])
+    
+    lines = []
+    while len(lines) < 400:
+        datagram = receiver.recv(65535)
+        assert len(datagram) <= export.STATSD_MAX_DATAGRAM
+        lines.extend(datagram.decode().split('\n'))
+    assert 'oracle_db_monitor.db0.up:1|g' in lines
+    assert 'oracle_db_monitor.db99.response_time:5|g' in lines
+
+def test_json_lines_sink_rotates(tmp_path):
+    path = tmp_path / 'samples.jsonl'
+    sink = export.JsonLinesSink(str(path), max_bytes=500, backups=2)
+    for _ in range(10):
+        sink.send([('db', health_sample(), 0)] * 2)
+    assert (tmp_path / 'samples.jsonl.1').exists()
+    assert (tmp_path / 'samples.jsonl.2').exists()
+    assert not (tmp_path / 'samples.jsonl.3').exists()
+    assert json.loads((tmp_path / 'samples.jsonl.1').read_text().splitlines()[0])['database_name'] == 'db'
+
+class BlockedSink:
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+    
+    def send(self, batch):
+        self.release.wait(5)
+        self.batches.append(batch)
+
+def test_exporter_drops_the_oldest_samples_when_the_sink_falls_behind():
+    metrics = MonitorMetrics()
+    sink = BlockedSink()
+    exporter = export.Exporter(sink, metrics, batch_size=1, flush_interval=0.01, queue_size=3)
+    
+    exporter.submit('db', health_sample(response_time_ms=0))
+    # Wait until the sender holds the first sample, then overfill the queue
+    wait_until(lambda: exporter._queue.empty())
+    for i in range(1, 6):
+        exporter.submit('db', health_sample(response_time_ms=i))
+    sink.release.set()
+    wait_until(lambda: len(sink.batches) == 4)
+    
+    assert [batch[0][1]['response_time_ms'] for batch in sink.batches] == [0, 3, 4, 5]
+    assert metrics.snapshot()['exports'] == {'dropped': 2, 'sent': 4}
+
+class FailingSink:
+    def send(self, batch):
+        raise OSError("collector is down")
+
+def test_exporter_counts_failed_batches():
+    metrics = MonitorMetrics()
+    exporter = export.Exporter(FailingSink(), metrics, batch_size=10, flush_interval=0.01)
+    exporter.submit('db', health_sample())
+    wait_until(lambda: metrics.snapshot()['exports'].get('failed') == 1)
+
+def test_no_exporter_without_a_sink():
+    assert export.create_exporter(load_settings(export_sink='none'), MonitorMetrics()) is None
+    with pytest.raises(ValueError):
+        export.create_exporter(load_settings(export_sink='kafka'), MonitorMetrics())
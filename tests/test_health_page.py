@@ -0,0 +1,18 @@
+import pytest
+
+from tests.helpers import load_app
+
+@pytest.fixture(scope='module')
+def health_page():
+    return load_app('health_page.py', 'health_page')
+
+def sample(status='UP', response_time_ms=12, error=None):
+    return {'status': status, 'response_time_ms': response_time_ms, 'error': error}
+
+def test_page_key_ignores_response_times(health_page):
+    assert health_page.page_key(sample(response_time_ms=5)) == health_page.page_key(sample(response_time_ms=6))
+    assert health_page.page_key(sample(response_time_ms=12)) == health_page.page_key(sample(response_time_ms=1200))
+
+def test_page_key_follows_status_and_error(health_page):
+    assert health_page.page_key(sample()) != health_page.page_key(sample(status='DEGRADED'))
+    assert health_page.page_key(sample('DOWN', error='ORA-12541')) != health_page.page_key(sample('DOWN', error='ORA-01017'))
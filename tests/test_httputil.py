@@ -0,0 +1,47 @@
+import gzip
+
+import pytest
+
+from oracle_db_monitor_core import httputil
+from oracle_db_monitor_core.httputil import compress, etag_matches, negotiate_encoding, payload_etag
+
+def test_etag_ignores_volatile_fields():
+    first = {'status': 'UP', 'timestamp': '2024-01-01T00:00:00', 'response_time_ms': 3}
+    second = {'status': 'UP', 'timestamp': '2024-01-01T00:01:00', 'response_time_ms': 9}
+    assert payload_etag(first) == payload_etag(second)
+    assert payload_etag(first) != payload_etag(dict(first, status='DOWN'))
+    assert payload_etag(first).startswith('W/"')
+
+@pytest.mark.parametrize('header, matches', [
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ('*', True),
+    ('"xyz"', False),
+    ('', False),
+    (None, False),
+])
+def test_etag_matching_is_weak(header, matches):
+    assert etag_matches(header, 'W/"abc"') is matches
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate', 'gzip'),
+    ('gzip;q=0', None),
+    ('deflate', None),
+    ('', None),
+    (None, None),
+    ('GZIP;q=0.5', 'gzip'),
+    ('gzip;q=bogus', None),
+])
+def test_negotiate_encoding_without_brotli(monkeypatch, header, expected):
+    monkeypatch.setattr(httputil, 'brotli', None)
+    assert negotiate_encoding(header) == expected
+
+def test_brotli_is_preferred_when_installed(monkeypatch):
+    monkeypatch.setattr(httputil, 'brotli', object())
+    assert negotiate_encoding('gzip, br') == 'br'
+    assert negotiate_encoding('gzip, br;q=0') == 'gzip'
+
+def test_gzip_round_trip():
+    data = b'{"status": "UP"}' * 100
+    assert gzip.decompress(compress(data, 'gzip')) == data
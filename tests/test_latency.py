@@ -0,0 +1,60 @@
+from oracle_db_monitor_core import DEFAULT_DATABASE, Monitor, load_database_config, load_settings
+from oracle_db_monitor_core.latency import AnomalyDetector, EwmaStats
+
+def test_ewma_tracks_mean_and_spread():
+    stats = EwmaStats(alpha=0.5)
+    for value in (10, 10, 10):
+        stats.update(value)
+    assert stats.mean == 10 and stats.variance == 0
+    stats.update(20)
+    assert stats.mean == 15
+    assert stats.stddev > 0
+    assert stats.count == 4
+
+def test_no_anomalies_during_warmup():
+    detector = AnomalyDetector(threshold=3, min_ms=10, warmup=3)
+    assert detector.observe(5) == (0.0, False)
+    assert not detector.observe(500)[1]
+    assert not detector.observe(5)[1]
+
+def test_spike_is_anomalous_but_jitter_is_not():
+    detector = AnomalyDetector(threshold=3, min_ms=10, warmup=3)
+    for value in (5, 6, 5, 6, 5, 6, 5, 6):
+        detector.observe(value)
+    # Well within min_ms of the mean, even if many deviations away
+    assert not detector.observe(12)[1]
+    score, anomalous = detector.observe(200)
+    assert anomalous and score > 3
+
+def test_anomalies_are_clipped_before_they_enter_the_baseline():
+    detector = AnomalyDetector(threshold=3, min_ms=10, warmup=3)
+    for _ in range(10):
+        detector.observe(5)
+    detector.observe(10000)
+    assert detector.stats.mean < 20
+
+def test_lasting_slowdown_becomes_the_baseline():
+    detector = AnomalyDetector(threshold=3, min_ms=10, warmup=3)
+    for _ in range(10):
+        detector.observe(5)
+    results = [detector.observe(200)[1] for _ in range(60)]
+    assert results[0] and not results[-1]
+
+def test_monitor_reports_degraded_against_its_baseline(fake_driver):
+    monitor = Monitor({DEFAULT_DATABASE: load_database_config()},
+                      load_settings(anomaly_min_ms=10))
+    for _ in range(12):
+        sample = monitor.check_health()
+        assert sample['status'] == 'UP'
+        assert 'anomaly_score' in sample and 'baseline_ms' in sample
+    
+    fake_driver.configure(query_script='300')
+    result = monitor.health()
+    assert result.payload['status'] == 'DEGRADED'
+    # A degraded database still answers
+    assert result.status_code == 200
+
+def test_health_etag_is_stable_while_the_status_is():
+    monitor = Monitor({DEFAULT_DATABASE: load_database_config()}, load_settings())
+    etags = {monitor.health().headers['ETag'] for _ in range(5)}
+    assert len(etags) == 1
@@ -0,0 +1,56 @@
+from oracle_db_monitor_core.probes import build_lock_tree
+
+def row(sid, blocker=None, lock_type=None, held=None, requested=None):
+    """A LOCK_TREE_QUERY row of a session, optionally waiting on blocker"""
+    return (sid, sid * 10, f"USER{sid}", "sqlplus", "host", "ACTIVE", None,
+            "enq: TX - row lock contention" if blocker else None, blocker, 5, 5,
+            lock_type, held, requested, None)
+
+def find(roots, sid):
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        if node["sid"] == sid:
+            return node
+        stack.extend(node["blocked"])
+    return None
+
+def test_chain_has_one_root_and_no_deadlock():
+    roots, waiters, deadlocked = build_lock_tree([row(1), row(2, 1), row(3, 2), row(4, 3)])
+    assert [root["sid"] for root in roots] == [1]
+    assert roots[0]["total_blocked"] == 3
+    assert waiters == 3
+    assert deadlocked == 0
+    assert "deadlock" not in roots[0]
+
+def test_cycle_with_a_waiter_counts_only_the_cycle():
+    # 1 -> 2 -> 3 -> 1, and 4 waits on 2 without being part of the cycle
+    rows = [row(1, 3), row(2, 1), row(3, 2), row(4, 2)]
+    roots, waiters, deadlocked = build_lock_tree(rows)
+    assert deadlocked == 3
+    assert waiters == 4
+    assert len(roots) == 1 and roots[0]["deadlock"]
+    assert roots[0]["sid"] in (1, 2, 3)
+    assert roots[0]["total_blocked"] == 3
+    assert "deadlock" not in find(roots, 4)
+
+def test_waiter_listed_first_is_not_taken_for_the_cycle():
+    roots, _, deadlocked = build_lock_tree([row(4, 2), row(1, 3), row(2, 1), row(3, 2)])
+    assert deadlocked == 3
+    assert [root["sid"] for root in roots] == [2]
+    assert find(roots, 4) is not None
+
+def test_two_disjoint_cycles():
+    rows = [row(1, 2), row(2, 1), row(5, 6), row(6, 7), row(7, 5), row(8)]
+    roots, waiters, deadlocked = build_lock_tree(rows)
+    assert deadlocked == 5
+    assert waiters == 5
+    assert len([root for root in roots if root.get("deadlock")]) == 2
+    assert sum(root["total_blocked"] + 1 for root in roots) == 6
+
+def test_locks_are_grouped_per_session():
+    rows = [row(1, lock_type="TX", held=6, requested=0), row(1, lock_type="TM", held=3, requested=0),
+            row(2, 1, lock_type="TX", held=0, requested=6)]
+    roots, _, _ = build_lock_tree(rows)
+    assert [lock["type"] for lock in roots[0]["locks"]] == ["TX", "TM"]
+    assert roots[0]["blocked"][0]["locks"][0]["requested"] == "exclusive"
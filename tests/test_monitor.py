@@ -0,0 +1,100 @@
+"""Core probe logic of the monitor against the fake driver"""
+import time
+
+import pytest
+
+from oracle_db_monitor_core import DEFAULT_DATABASE, Monitor, load_database_config, load_settings
+
+def make_monitor(configs=None, **settings):
+    return Monitor(configs or {DEFAULT_DATABASE: load_database_config()}, load_settings(**settings))
+
+def test_health_is_up_and_reuses_pooled_sessions():
+    monitor = make_monitor()
+    for _ in range(5):
+        result = monitor.health()
+        assert result.status_code == 200
+        assert result.payload['status'] == 'UP'
+        assert 'error' not in result.payload
+    assert monitor.metrics.sessions_opened() == 1
+    assert monitor.stats().payload['session_reuse_rate'][DEFAULT_DATABASE] == 0.8
+
+def test_connect_per_check_mode_opens_a_session_per_check():
+    monitor = make_monitor(pool_enabled=False)
+    for _ in range(3):
+        monitor.health()
+    assert monitor.metrics.sessions_opened() == 3
+
+def test_unreachable_database_is_down(fake_driver):
+    fake_driver.configure(connect_faults='refuse:1')
+    result = make_monitor().health()
+    assert result.status_code == 503
+    assert result.payload['status'] == 'DOWN'
+    assert 'DPY-6005' in result.payload['error']
+
+def test_hung_statement_ends_with_the_call_timeout(fake_driver):
+    fake_driver.configure(query_script='hang')
+    start = time.monotonic()
+    result = make_monitor(call_timeout_ms=100).health()
+    assert time.monotonic() - start < 2
+    assert result.payload['status'] == 'DOWN'
+    assert 'DPY-4024' in result.payload['error']
+
+@pytest.mark.parametrize('probe, field', [
+    ('database_metrics', 'metrics'),
+    ('tablespace_usage', 'tablespaces'),
+    ('active_sessions', 'sessions'),
+    ('session_summary', 'summary'),
+    ('lock_tree', 'lock_tree'),
+    ('performance', 'performance'),
+    ('sysstat', 'sysstat'),
+])
+def test_detail_probes_succeed(probe, field):
+    result = getattr(make_monitor(), probe)()
+    assert result.status_code == 200
+    assert result.payload['status'] == 'SUCCESS'
+    assert field in result.payload
+    assert result.headers['ETag'].startswith('W/"')
+
+def test_failed_probe_is_a_500(fake_driver):
+    fake_driver.configure(query_faults='ORA-00942:1')
+    result = make_monitor().tablespace_usage()
+    assert result.status_code == 500
+    assert 'ORA-00942' in result.payload['error']
+
+def test_probe_cache_serves_repeated_requests():
+    monitor = make_monitor(probe_cache_ttl=60)
+    first = monitor.database_metrics()
+    second = monitor.database_metrics()
+    assert first.payload['metrics'] == second.payload['metrics']
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert monitor.stats().payload['probes'][DEFAULT_DATABASE]['metrics']['count'] == 1
+
+def test_drcp_statistics_need_drcp():
+    monitor = make_monitor({'dedicated': load_database_config(), 'pooled': load_database_config(drcp='true')})
+    assert monitor.drcp_stats('dedicated').status_code == 404
+    assert monitor.drcp_stats('pooled').status_code == 200
+
+def test_session_summary_fields():
+    summary = make_monitor().session_summary().payload['summary']
+    assert {'total', 'active', 'blocked', 'blocking_chains', 'by_user_program'} <= set(summary)
+
+def test_lock_tree_is_refreshed_at_most_once_per_ttl():
+    monitor = make_monitor(lock_tree_ttl=60)
+    for _ in range(3):
+        monitor.lock_tree()
+    assert monitor.stats().payload['probes'][DEFAULT_DATABASE]['locks']['count'] == 1
+
+def test_replication_reports_lag():
+    monitor = make_monitor({'primary': load_database_config(), 'standby': load_database_config()})
+    payload = monitor.replication('primary', 'standby').payload
+    assert payload['status'] == 'UP'
+    assert payload['primary']['role'] == 'PRIMARY'
+    assert payload['standby']['role'] == 'PHYSICAL STANDBY'
+    assert payload['scn_gap'] > 0
+
+def test_replication_lag_over_the_limit_is_degraded():
+    monitor = make_monitor({'primary': load_database_config(), 'standby': load_database_config()},
+                           replication_max_lag=2)
+    result = monitor.replication('primary', 'standby')
+    assert result.payload['status'] == 'DEGRADED'
+    assert 'behind the primary' in result.payload['error']
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from oracle_db_monitor_core import DEFAULT_DATABASE, Monitor, load_database_config, load_settings
+
+@pytest.fixture(autouse=True)
+def warm_up_setting(monkeypatch):
+    # conftest turns the warm-up off for every other test
+    monkeypatch.delenv('WARM_UP', raising=False)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def make_monitor(**settings):
+    settings = dict(dict(warm_up=True, pool_enabled=True, warm_up_retry_interval=0.05), **settings)
+    return Monitor({DEFAULT_DATABASE: load_database_config()}, load_settings(**settings))
+
+def test_liveness_never_touches_the_database(fake_driver):
+    fake_driver.configure(connect_faults='refuse:1')
+    assert make_monitor().liveness().status_code == 200
+
+def test_ready_after_warm_up():
+    monitor = make_monitor(pool_min=3)
+    assert monitor.readiness().payload['status'] == 'WARMING_UP'
+    monitor.start_warm_up()
+    wait_for(lambda: monitor.readiness().status_code == 200)
+    state = monitor.readiness().payload['databases'][DEFAULT_DATABASE]
+    assert state['ready'] and state['sessions'] == 3 and state['attempts'] == 1
+
+def test_unreachable_database_does_not_keep_the_worker_unready(fake_driver):
+    fake_driver.configure(connect_script='refuse,refuse')
+    monitor = make_monitor(warm_up_retry_interval=0.2)
+    monitor.start_warm_up()
+    
+    wait_for(lambda: monitor.readiness().status_code == 200)
+    state = monitor.readiness().payload['databases'][DEFAULT_DATABASE]
+    assert state['attempts'] == 1 and 'DPY-6005' in state['error']
+    assert monitor.health().payload['status'] == 'DOWN'
+    
+    # The warm-up keeps retrying in the background until the pool opens
+    wait_for(lambda: 'sessions' in monitor.warm_up_status()[DEFAULT_DATABASE])
+    state = monitor.readiness().payload['databases'][DEFAULT_DATABASE]
+    assert state['attempts'] > 1 and 'error' not in state
+
+def test_one_database_down_does_not_keep_the_worker_unready(fake_driver):
+    # Whichever database connects first is refused, the other one opens its pool
+    fake_driver.configure(connect_script='refuse')
+    configs = {'first': load_database_config(), 'second': load_database_config()}
+    monitor = Monitor(configs, load_settings(warm_up=True, pool_enabled=True, warm_up_retry_interval=60))
+    monitor.start_warm_up()
+    
+    wait_for(lambda: monitor.readiness().status_code == 200)
+    databases = monitor.readiness().payload['databases']
+    assert monitor.readiness().payload['status'] == 'READY'
+    assert sorted('error' in state for state in databases.values()) == [False, True]
+
+def test_ready_at_once_without_warm_up():
+    assert make_monitor(warm_up=False).readiness().status_code == 200
+    # Connect-per-check mode has no pool to keep warm
+    assert make_monitor(pool_enabled=False).readiness().status_code == 200
@@ -0,0 +1,129 @@
+import json
+import time
+
+import pytest
+
+from oracle_db_monitor_core import DEFAULT_DATABASE, Monitor, load_database_config, load_settings
+from oracle_db_monitor_core import requestlog
+from oracle_db_monitor_core.requestlog import RequestLog, error_code
+
+@pytest.fixture
+def log_file(tmp_path):
+    return tmp_path / 'requests.log'
+
+@pytest.fixture
+def request_log(log_file):
+    log = RequestLog(log_file=str(log_file))
+    yield log
+    log.close()
+
+def read_lines(log_file, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        lines = log_file.read_text().splitlines() if log_file.exists() else []
+        if len(lines) >= count:
+            return [json.loads(line) for line in lines]
+        time.sleep(0.01)
+    raise AssertionError(f"expected {count} log lines")
+
+class DriverError(Exception):
+    pass
+
+class Details:
+    full_code = 'ORA-00942'
+
+@pytest.mark.parametrize('error, code', [
+    (DriverError(Details()), 'ORA-00942'),
+    (DriverError("DPY-4024: call timeout of 100 ms exceeded"), 'DPY-4024'),
+    (DriverError("TNS-12541: no listener"), 'TNS-12541'),
+    (DriverError("something else"), None),
+    (DriverError(), None),
+])
+def test_error_code(error, code):
+    assert error_code(error) == code
+
+def test_probe_timings_are_logged_with_the_request(request_log, log_file):
+    monitor = Monitor({DEFAULT_DATABASE: load_database_config()}, load_settings())
+    context = request_log.start('GET', '/health', 'abc123')
+    monitor.health()
+    request_log.finish(context, 200)
+    
+    [line] = read_lines(log_file, 1)
+    assert line['type'] == 'access' and line['request_id'] == 'abc123' and line['status'] == 200
+    [probe] = line['probes']
+    assert probe['probe'] == 'health' and probe['database'] == DEFAULT_DATABASE
+    assert probe['acquire_ms'] >= 0 and probe['probe_ms'] >= 0
+
+def test_failed_probes_make_an_error_line(request_log, log_file, fake_driver):
+    fake_driver.configure(query_faults='ORA-00942:1')
+    monitor = Monitor({DEFAULT_DATABASE: load_database_config()}, load_settings())
+    context = request_log.start('GET', '/tablespace')
+    result = monitor.tablespace_usage()
+    request_log.finish(context, result.status_code)
+    
+    [line] = read_lines(log_file, 1)
+    assert line['type'] == 'error' and line['level'] == 'ERROR'
+    assert line['probes'][0]['error_code'] == 'ORA-00942'
+
+def test_replication_probes_from_other_threads_are_logged(request_log, log_file):
+    monitor = Monitor({'primary': load_database_config(), 'standby': load_database_config()}, load_settings())
+    context = request_log.start('GET', '/replication')
+    monitor.replication('primary', 'standby')
+    request_log.finish(context, 200)
+    
+    [line] = read_lines(log_file, 1)
+    assert sorted(probe['database'] for probe in line['probes']) == ['primary', 'standby']
+
+def test_successful_requests_are_sampled_but_failures_are_not(log_file):
+    log = RequestLog(sample_rate=0, log_file=str(log_file))
+    try:
+        log.finish(log.start('GET', '/health'), 200)
+        log.finish(log.start('GET', '/health'), 503)
+        log.finish(log.start('GET', '/health'), 500, RuntimeError("boom"))
+        lines = read_lines(log_file, 2)
+        time.sleep(0.05)
+        assert [line['status'] for line in read_lines(log_file, 2)] == [503, 500]
+        assert lines[1]['error'] == "RuntimeError('boom')"
+    finally:
+        log.close()
+
+def test_full_queue_drops_records():
+    handler = requestlog.DroppingQueueHandler(requestlog.queue.Queue(maxsize=1))
+    record = requestlog.logging.makeLogRecord({'msg': 'x'})
+    handler.enqueue(record)
+    handler.enqueue(record)
+    assert handler.dropped == 1
+
+def test_a_new_request_log_replaces_the_previous_one(tmp_path):
+    first_file, second_file = tmp_path / 'first.log', tmp_path / 'second.log'
+    first = RequestLog(log_file=str(first_file))
+    second = RequestLog(log_file=str(second_file))
+    try:
+        first.finish(first.start('GET', '/health'), 200)
+        assert len(read_lines(second_file, 1)) == 1
+        time.sleep(0.05)
+        assert len(read_lines(second_file, 1)) == 1
+        assert first_file.read_text() == ''
+        assert [type(handler) for handler in second.logger.handlers].count(requestlog.DroppingQueueHandler) == 1
+    finally:
+        first.close()
+        second.close()
+
+def test_request_logging_can_be_turned_off():
+    assert RequestLog.from_settings(load_settings(log_requests=False)) is None
+
+def test_flask_responses_carry_the_request_id(log_file, monkeypatch):
+    monkeypatch.setenv('LOG_REQUESTS', 'true')
+    from flask import Flask
+    from oracle_db_monitor_core.flask_adapter import register_monitor_routes, register_request_logging
+    
+    app = Flask(__name__)
+    monitor = Monitor({DEFAULT_DATABASE: load_database_config()}, load_settings())
+    register_monitor_routes(app, monitor)
+    request_log = register_request_logging(app, load_settings(log_file=str(log_file)))
+    try:
+        response = app.test_client().get('/health', headers={'X-Request-ID': 'req-1'})
+        assert response.headers['X-Request-ID'] == 'req-1'
+        assert read_lines(log_file, 1)[0]['path'] == '/health'
+    finally:
+        request_log.close()
@@ -0,0 +1,26 @@
+from oracle_db_monitor_core.sampler import AdaptiveInterval
+
+def up(response_time_ms=5):
+    return {'status': 'UP', 'response_time_ms': response_time_ms}
+
+def test_interval_backs_off_while_steady():
+    interval = AdaptiveInterval(initial=10, minimum=5, maximum=40, backoff=2)
+    values = [interval.update(up()) for _ in range(8)]
+    assert values[0] == 10
+    assert values[-1] == 40
+    assert values == sorted(values)
+
+def test_interval_drops_to_minimum_on_failure_or_spike():
+    interval = AdaptiveInterval(initial=10, minimum=5, maximum=40, backoff=2)
+    for _ in range(8):
+        interval.update(up())
+    assert interval.update({'status': 'DOWN', 'response_time_ms': 5000}) == 5
+    for _ in range(8):
+        interval.update(up())
+    assert interval.update(up(500)) == 5
+    assert interval.update({'status': 'DEGRADED', 'response_time_ms': 5}) == 5
+
+def test_fixed_interval_without_bounds():
+    interval = AdaptiveInterval(initial=30, minimum=30, maximum=30)
+    assert {interval.update(up()) for _ in range(10)} == {30}
+    assert interval.update({'status': 'DOWN', 'response_time_ms': 0}) == 30
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from oracle_db_monitor_core import load_settings
+from oracle_db_monitor_core.serving import apply_pool_size, server_profile
+
+def profile(framework='flask', cpu_count=4, **settings):
+    return server_profile(load_settings(**settings), framework, cpu_count=cpu_count)
+
+def test_gthread_sizes_threads_from_latency():
+    result = profile(server_profile='gthread', server_db_latency_ms=100, server_cpu_ms=5)
+    assert result['workers'] == 4
+    assert result['threads'] == result['concurrency'] == 21
+    assert 'worker_connections' not in result
+
+def test_gevent_sizes_worker_connections_not_threads():
+    result = profile(server_profile='gevent', server_db_latency_ms=100, server_cpu_ms=5)
+    assert result['worker_connections'] == result['concurrency'] == 21
+    assert 'threads' not in result
+
+def test_sync_serves_one_request_per_process():
+    result = profile(server_profile='sync')
+    assert result['workers'] == 9
+    assert result['concurrency'] == 1
+    assert 'threads' not in result and 'worker_connections' not in result
+
+def test_concurrency_is_capped_and_overridable():
+    assert profile(server_db_latency_ms=10000)['concurrency'] == 32
+    assert profile(server_profile='gevent', server_threads=50)['worker_connections'] == 50
+
+def test_fastapi_defaults_to_uvicorn():
+    result = profile('fastapi')
+    assert result['worker_class'] == 'uvicorn.workers.UvicornWorker'
+    assert result['threads'] == result['concurrency']
+
+@pytest.mark.parametrize('framework, name', [('flask', 'uvicorn'), ('fastapi', 'gthread'), ('flask', 'eventlet')])
+def test_rejects_profiles_the_app_cannot_use(framework, name):
+    with pytest.raises(ValueError):
+        profile(framework, server_profile=name)
+
+def test_pool_size_follows_gevent_connections(monkeypatch):
+    monkeypatch.delenv('DB_POOL_MAX', raising=False)
+    apply_pool_size(profile(server_profile='gevent', server_threads=12))
+    assert os.environ['DB_POOL_MAX'] == '12'
+
+def test_explicit_pool_size_wins(monkeypatch):
+    monkeypatch.setenv('DB_POOL_MAX', '3')
+    apply_pool_size(profile(server_profile='gevent', server_threads=12))
+    assert os.environ['DB_POOL_MAX'] == '3'
@@ -0,0 +1,76 @@
+import pytest
+
+from oracle_db_monitor_core import sqlguard
+from oracle_db_monitor_core.sqlguard import normalize_sql, tokenize_sql, validate_read_only_query
+
+@pytest.mark.parametrize('query', [
+    "SELECT 1 FROM dual",
+    "  select sysdate from dual  ",
+    "(SELECT 1 FROM dual) UNION (SELECT 2 FROM dual)",
+    "WITH t AS (SELECT 1 AS n FROM dual) SELECT n FROM t",
+    # Keywords inside literals, comments, quoted identifiers and longer names
+    "SELECT 'DELETE FROM t; DROP TABLE t' FROM dual",
+    "SELECT last_update, updated_by FROM audit_log",
+    "SELECT 1 FROM dual -- DELETE FROM t",
+    "SELECT /* UPDATE t SET x = 1 */ 1 FROM dual",
+    'SELECT "UPDATE", "INTO" FROM "DELETE"',
+    "SELECT q'[it's; DELETE]' FROM dual",
+    "SELECT q'{a}' || Q'!b!' || nq'<c>' FROM dual",
+    "SELECT 'it''s; DROP' FROM dual",
+    # Binds are placeholders, not text
+    "SELECT * FROM orders WHERE status = :status AND id > :1",
+])
+def test_read_only_queries_are_accepted(query):
+    assert validate_read_only_query(query) is None
+
+@pytest.mark.parametrize('query, reason', [
+    ("", "No query provided"),
+    ("-- only a comment", "No query provided"),
+    ("DELETE FROM t", "Only SELECT"),
+    ("SELECT * FROM t FOR UPDATE", "UPDATE"),
+    ("SELECT * FROM t FOR UPDATE NOWAIT", "UPDATE"),
+    ("WITH t AS (SELECT 1 FROM dual) DELETE FROM x", "DELETE"),
+    ("WITH t AS (SELECT 1 FROM dual) INSERT INTO x SELECT * FROM t", "INSERT"),
+    ("WITH FUNCTION f RETURN NUMBER IS BEGIN RETURN 1; END; SELECT f FROM dual", "single statement"),
+    ("SELECT 1 FROM dual; DROP TABLE t", "single statement"),
+    ("SELECT 1 FROM dual;", "single statement"),
+    ("SELECT id INTO v_id FROM t", "INTO"),
+    ("BEGIN DELETE FROM t; END;", "Only SELECT"),
+    ("DECLARE x NUMBER; BEGIN NULL; END;", "Only SELECT"),
+    ("CALL p()", "Only SELECT"),
+    # Comment smuggling: the keyword is hidden from naive matching, not from the tokenizer
+    ("SELECT 1 FROM dual/**/;/**/DELETE FROM t", "single statement"),
+    ("SEL/**/ECT 1 FROM dual", "Only SELECT"),
+    ("SELECT 1 FROM t FOR/* x */UPDATE", "UPDATE"),
+    ("SELECT 1 FROM t FOR\n-- x\nUPDATE", "UPDATE"),
+    ("/* SELECT */ DELETE FROM t", "Only SELECT"),
+    # Unterminated comments, literals and quotes must not hide what follows
+    ("SELECT 1 FROM dual /* DELETE", "Unterminated comment"),
+    ("SELECT 'abc FROM dual", "Unterminated string"),
+    ("SELECT q'[abc FROM dual", "Unterminated quoted string"),
+    ('SELECT "abc FROM dual', "Unterminated quoted identifier"),
+])
+def test_unsafe_queries_are_rejected(query, reason):
+    rejection = validate_read_only_query(query)
+    assert rejection is not None
+    assert reason in rejection
+
+def test_with_function_is_rejected_without_a_semicolon():
+    assert "PL/SQL" in validate_read_only_query("WITH FUNCTION f RETURN NUMBER IS BEGIN RETURN 1 END SELECT 1 FROM dual")
+
+def test_tokenizer_keeps_literals_and_drops_comments():
+    assert tokenize_sql("select 'a -- b', \"Col\" /* c */ from t -- d") == \
+        ['SELECT', "'a -- b'", ',', '"Col"', 'FROM', 'T']
+
+def test_normalized_text_tokenizes_the_same():
+    query = "select q'[x y]', n'it''s', \"A b\", 1.5, :b1 from t where a<>-1"
+    assert tokenize_sql(normalize_sql(query)) == tokenize_sql(query)
+
+def test_verdicts_are_cached_per_normalized_text():
+    sqlguard._validate_normalized.cache_clear()
+    validate_read_only_query("SELECT 1 FROM dual")
+    validate_read_only_query("select   1\nfrom DUAL -- dashboard")
+    validate_read_only_query("/* again */ SELECT 1 FROM dual")
+    info = sqlguard._validate_normalized.cache_info()
+    assert info.currsize == 1
+    assert info.hits == 2
@@ -0,0 +1,41 @@
+import time
+
+from oracle_db_monitor_core import DEFAULT_DATABASE, Monitor, load_database_config, load_settings
+from oracle_db_monitor_core.cache import CounterSnapshots
+from oracle_db_monitor_core.probes import read_sysstat
+
+class FailingConnection:
+    def cursor(self):
+        raise AssertionError("no statement expected")
+
+def test_empty_counter_list_runs_no_query():
+    assert read_sysstat(FailingConnection(), []) == {}
+
+def test_monitor_with_no_counters_succeeds():
+    monitor = Monitor({DEFAULT_DATABASE: load_database_config()}, load_settings(sysstat_counters=[]))
+    result = monitor.sysstat()
+    assert result.status_code == 200
+    assert result.payload['sysstat']['counters'] == {}
+
+def test_first_request_sets_the_baseline_and_reports_the_window():
+    monitor = Monitor({DEFAULT_DATABASE: load_database_config()}, load_settings(sysstat_interval=0))
+    first = monitor.sysstat().payload['sysstat']
+    assert first['rates_per_second'] is None and first['interval_seconds'] is None
+    second = monitor.sysstat().payload['sysstat']
+    assert second['interval_seconds'] is not None
+    assert second['counters'] and set(second['rates_per_second']) == set(second['counters'])
+
+def test_snapshots_are_reused_within_the_interval():
+    calls = []
+    snapshots = CounterSnapshots()
+    take = lambda: calls.append(1) or {'x': len(calls)}
+    snapshots.get('db', 60, take)
+    previous, latest = snapshots.get('db', 60, take)
+    assert len(calls) == 1
+    assert previous is None and latest['values'] == {'x': 1}
+
+def test_rates_per_second():
+    now = time.monotonic()
+    previous = {'taken_at': now - 10, 'values': {'reads': 100, 'commits': 50, 'gone': 1}}
+    latest = {'taken_at': now, 'values': {'reads': 600, 'commits': 40, 'new': 3}}
+    assert CounterSnapshots.rates(previous, latest) == {'reads': 50.0, 'commits': None, 'new': None}